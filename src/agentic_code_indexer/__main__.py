@@ -5,20 +5,59 @@ Provides comprehensive code analysis and indexing capabilities.
 """
 
 import asyncio
+import atexit
+import functools
 import os
+import queue
+import sys
 from pathlib import Path
+from typing import Optional
 import typer
 from rich.console import Console
 from rich.panel import Panel
 import logging
+from logging.handlers import QueueHandler, QueueListener
 
-from .main_pipeline import MainPipeline
-from .llm_integration import LLMEmbeddingIntegration
-from .summarization_orchestrator import HierarchicalSummarizationOrchestrator
-from .hybrid_search import HybridSearchEngine, HybridSearchConfig
-from .search_api import run_api
+# Pipeline, search, LLM and API modules pull in the Neo4j driver, torch,
+# FastAPI and the LLM SDKs, so commands import them locally to keep
+# startup (and --help) cheap.
 
 console = Console()
+logger = logging.getLogger(__name__)
+
+# Concurrent LLM requests when none is requested; bounded by API rate limits,
+# not by cores, so it does not scale with the CPU count
+DEFAULT_LLM_CONCURRENCY = 5
+
+def configure_logging(level: int):
+    """
+    Configure root logging for a command.
+    
+    Records are handed to a queue and written to stderr by a background
+    listener thread, so logging from async code never blocks the event loop
+    on terminal I/O. Like logging.basicConfig, this does nothing if the root
+    logger already has handlers.
+    """
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    listener = QueueListener(log_queue, stream_handler)
+    
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
+    listener.start()
+    # Drain anything still queued before the interpreter exits
+    atexit.register(listener.stop)
+
+@functools.lru_cache(maxsize=1)
+def _get_llm_credentials() -> Optional[str]:
+    """Read the Anthropic API key from the environment once per process."""
+    return os.getenv("ANTHROPIC_API_KEY") or None
+
 app = typer.Typer(
     name="agentic-code-indexer",
     help="🤖 Agentic Code Indexer - Intelligent code analysis and graph-based indexing system",
@@ -33,9 +72,15 @@ def index_command(
     neo4j_user: str = typer.Option("neo4j", "--neo4j-user", help="Neo4j username"),
     neo4j_password: str = typer.Option("password", "--neo4j-password", help="Neo4j password"),
     init_db: bool = typer.Option(False, "--init-db", help="Initialize database schema"),
-    max_concurrent: int = typer.Option(5, "--max-concurrent", help="Maximum concurrent file processing"),
+    chunker_concurrency: Optional[int] = typer.Option(None, "--chunker-concurrency", "--max-concurrent", help="Maximum concurrent chunker processes (default: 2x CPU count, or ACI_CHUNKER_CONCURRENCY)"),
+    llm_concurrency: int = typer.Option(DEFAULT_LLM_CONCURRENCY, "--llm-concurrency", help="Maximum concurrent LLM requests"),
     batch_size: int = typer.Option(1000, "--batch-size", help="Database batch size"),
     skip_llm: bool = typer.Option(False, "--skip-llm", help="Skip LLM summarization and embedding"),
+    write_batch_size: int = typer.Option(500, "--write-batch-size", help="Rows per batched summary/embedding write"),
+    rpm_limit: Optional[int] = typer.Option(None, "--rpm-limit", help="Maximum LLM requests per minute"),
+    skip_prewarm: bool = typer.Option(False, "--skip-prewarm", help="Do not open database and LLM connections before enrichment starts"),
+    sniff_shebangs: bool = typer.Option(False, "--sniff-shebangs", help="Also index extensionless scripts with a Python shebang"),
+    no_chunk_cache: bool = typer.Option(False, "--no-chunk-cache", help="Always run the chunkers instead of reusing cached output for unchanged file contents"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose logging")
 ):
     """
@@ -51,7 +96,9 @@ def index_command(
     
     # Setup logging
     log_level = logging.DEBUG if verbose else logging.INFO
-    logging.basicConfig(level=log_level, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    configure_logging(log_level)
+    
+    from .main_pipeline import MainPipeline
     
     async def run_pipeline():
         console.print(Panel.fit(
@@ -66,8 +113,10 @@ def index_command(
             neo4j_uri=neo4j_uri,
             neo4j_user=neo4j_user,
             neo4j_password=neo4j_password,
-            max_concurrent_files=max_concurrent,
-            batch_size=batch_size
+            max_concurrent_files=chunker_concurrency,
+            batch_size=batch_size,
+            sniff_shebangs=sniff_shebangs,
+            use_chunk_cache=not no_chunk_cache
         )
         
         try:
@@ -83,10 +132,16 @@ def index_command(
                 console.print("\n[yellow]🧠 Starting LLM enrichment process...[/yellow]")
                 
                 # Check for required environment variables
-                if not os.getenv("ANTHROPIC_API_KEY"):
+                if not _get_llm_credentials():
                     console.print("[yellow]⚠️ ANTHROPIC_API_KEY not set, skipping LLM features[/yellow]")
                 else:
-                    await run_llm_enrichment(neo4j_uri, neo4j_user, neo4j_password)
+                    await run_llm_enrichment(
+                        neo4j_uri, neo4j_user, neo4j_password,
+                        write_batch_size=write_batch_size,
+                        max_concurrent=llm_concurrency,
+                        rpm_limit=rpm_limit,
+                        prewarm=not skip_prewarm
+                    )
             
             console.print("\n[bold green]✅ Indexing pipeline completed successfully![/bold green]")
             
@@ -94,8 +149,8 @@ def index_command(
             console.print(f"[red]❌ Pipeline failed: {e}[/red]")
             raise typer.Exit(1)
         finally:
-            pipeline.file_traversal.close()
-            pipeline.graph_ingestion.close()
+            # Also closes the driver shared with the LLM enrichment step
+            pipeline.close()
     
     asyncio.run(run_pipeline())
 
@@ -105,6 +160,10 @@ def summarize_command(
     neo4j_user: str = typer.Option("neo4j", "--neo4j-user", help="Neo4j username"),
     neo4j_password: str = typer.Option("password", "--neo4j-password", help="Neo4j password"),
     batch_size: int = typer.Option(20, "--batch-size", help="Batch size for processing"),
+    write_batch_size: int = typer.Option(500, "--write-batch-size", help="Rows per batched summary/embedding write"),
+    llm_concurrency: int = typer.Option(DEFAULT_LLM_CONCURRENCY, "--llm-concurrency", "--max-concurrent", help="Maximum concurrent LLM requests"),
+    rpm_limit: Optional[int] = typer.Option(None, "--rpm-limit", help="Maximum LLM requests per minute"),
+    skip_prewarm: bool = typer.Option(False, "--skip-prewarm", help="Do not open database and LLM connections before enrichment starts"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose logging")
 ):
     """
@@ -115,9 +174,11 @@ def summarize_command(
     """
     
     log_level = logging.DEBUG if verbose else logging.INFO
-    logging.basicConfig(level=log_level, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    configure_logging(log_level)
     
     async def run_summarization():
+        from .neo4j_setup import get_driver, close_driver
+        
         console.print(Panel.fit(
             "[bold yellow]🧠 Hierarchical Code Summarization[/bold yellow]\n"
             "Generating intelligent summaries using LLM",
@@ -125,11 +186,17 @@ def summarize_command(
         ))
         
         # Check API key
-        if not os.getenv("ANTHROPIC_API_KEY"):
+        if not _get_llm_credentials():
             console.print("[red]❌ ANTHROPIC_API_KEY environment variable not set[/red]")
             raise typer.Exit(1)
         
-        await run_llm_enrichment(neo4j_uri, neo4j_user, neo4j_password, batch_size)
+        try:
+            await run_llm_enrichment(
+                neo4j_uri, neo4j_user, neo4j_password, batch_size, write_batch_size,
+                max_concurrent=llm_concurrency, rpm_limit=rpm_limit, prewarm=not skip_prewarm
+            )
+        finally:
+            close_driver(get_driver(neo4j_uri, neo4j_user, neo4j_password))
     
     asyncio.run(run_summarization())
 
@@ -143,7 +210,7 @@ def status_command(
     📊 Show current database status and statistics.
     """
     
-    from .graph_ingestion import GraphIngestion
+    from .main_pipeline import MainPipeline
     
     console.print(Panel.fit(
         "[bold cyan]📊 Database Status[/bold cyan]\n"
@@ -151,20 +218,21 @@ def status_command(
         border_style="cyan"
     ))
     
-    ingestion = GraphIngestion(neo4j_uri, neo4j_user, neo4j_password)
-    
-    try:
-        summary = ingestion.get_ingestion_summary()
-        
-        # Create a temporary pipeline for display
-        temp_pipeline = MainPipeline(".")
-        temp_pipeline.display_summary(summary)
+    async def run_status():
+        # The pipeline's ingestion component runs on the shared driver
+        pipeline = MainPipeline(".", neo4j_uri, neo4j_user, neo4j_password)
         
-    except Exception as e:
-        console.print(f"[red]❌ Failed to get status: {e}[/red]")
-        raise typer.Exit(1)
-    finally:
-        ingestion.close()
+        try:
+            summary = await pipeline.get_database_summary()
+            pipeline.display_summary(summary)
+            
+        except Exception as e:
+            console.print(f"[red]❌ Failed to get status: {e}[/red]")
+            raise typer.Exit(1)
+        finally:
+            pipeline.close()
+    
+    asyncio.run(run_status())
 
 @app.command("reset")
 def reset_command(
@@ -185,17 +253,45 @@ def reset_command(
             raise typer.Abort()
     
     from .summarization_orchestrator import HierarchicalSummarizationOrchestrator
+    from .neo4j_setup import get_driver, close_driver
+    
+    async def run_reset():
+        driver = get_driver(neo4j_uri, neo4j_user, neo4j_password)
+        orchestrator = HierarchicalSummarizationOrchestrator(neo4j_uri, neo4j_user, neo4j_password, driver=driver)
+        
+        try:
+            await orchestrator.reset_processing_status()
+            console.print("[green]✅ Processing status reset successfully[/green]")
+        except Exception as e:
+            console.print(f"[red]❌ Failed to reset status: {e}[/red]")
+            raise typer.Exit(1)
+        finally:
+            close_driver(driver)
     
-    orchestrator = HierarchicalSummarizationOrchestrator(neo4j_uri, neo4j_user, neo4j_password)
+    asyncio.run(run_reset())
+
+@app.command("clear-cache")
+def clear_cache_command():
+    """
+    🧹 Delete the on-disk chunker output and embedding caches.
     
-    try:
-        orchestrator.reset_processing_status()
-        console.print("[green]✅ Processing status reset successfully[/green]")
-    except Exception as e:
-        console.print(f"[red]❌ Failed to reset status: {e}[/red]")
-        raise typer.Exit(1)
-    finally:
-        orchestrator.close()
+    The caches evict least recently used entries on their own; this frees
+    the space immediately, e.g. after removing a large project.
+    """
+    from .chunker_cache import ChunkerOutputCache
+    from .embedding_cache import DEFAULT_CACHE_DIR, EmbeddingCache
+    
+    for cache_factory in (
+        ChunkerOutputCache,
+        EmbeddingCache,
+        functools.partial(EmbeddingCache, DEFAULT_CACHE_DIR / "embeddings.db")
+    ):
+        cache = cache_factory()
+        try:
+            cache.clear()
+        finally:
+            cache.close()
+        console.print(f"[green]✅ Cleared {cache.path}[/green]")
 
 @app.command("search")
 def search_command(
@@ -207,6 +303,8 @@ def search_command(
     include_context: bool = typer.Option(True, "--context/--no-context", help="Include graph context"),
     include_code: bool = typer.Option(False, "--code/--no-code", help="Include source code"),
     node_types: str = typer.Option(None, "--types", help="Comma-separated node types (Class,Method,Function)"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Embed the query afresh instead of using the on-disk query cache"),
+    use_daemon: bool = typer.Option(False, "--daemon", help="Search through a running search daemon when one is available"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Show detailed results")
 ):
     """
@@ -224,8 +322,12 @@ def search_command(
     """
     
     async def run_search():
+        from rich.live import Live
         from rich.table import Table
         from rich.text import Text
+        from .hybrid_search import HybridSearchEngine, HybridSearchConfig
+        from .embedding_cache import EmbeddingCache
+        from .neo4j_setup import get_driver, close_driver
         
         console.print(Panel.fit(
             f"[bold magenta]🔍 Searching: {query}[/bold magenta]\n"
@@ -233,31 +335,39 @@ def search_command(
             border_style="magenta"
         ))
         
-        # Initialize search engine
-        search_engine = HybridSearchEngine(neo4j_uri, neo4j_user, neo4j_password)
+        # Parse node types
+        parsed_node_types = None
+        if node_types:
+            parsed_node_types = [t.strip() for t in node_types.split(',')]
         
-        try:
-            # Parse node types
-            parsed_node_types = None
-            if node_types:
-                parsed_node_types = [t.strip() for t in node_types.split(',')]
-            
-            # Configure search
-            config = HybridSearchConfig(
-                max_total_results=max_results,
-                enable_context_expansion=include_context,
-                include_source_code=include_code
+        # Configure search
+        config = HybridSearchConfig(
+            max_total_results=max_results,
+            enable_context_expansion=include_context,
+            include_source_code=include_code
+        )
+        
+        # Prefer a warm daemon; fall back to an in-process engine without one
+        search_engine = None
+        if use_daemon:
+            from .search_daemon import SearchDaemonClient
+            client = SearchDaemonClient(neo4j_uri, neo4j_user, neo4j_password)
+            if await client.is_available():
+                search_engine = client
+            else:
+                console.print("[dim]Search daemon not running, searching in-process[/dim]")
+        
+        if search_engine is None:
+            # Repeat queries reuse their cached embedding
+            search_engine = HybridSearchEngine(
+                neo4j_uri, neo4j_user, neo4j_password,
+                driver=get_driver(neo4j_uri, neo4j_user, neo4j_password),
+                query_cache=None if no_cache else EmbeddingCache()
             )
-            
-            # Perform search
-            results = await search_engine.search(query, config)
-            
-            if not results:
-                console.print("[yellow]No results found[/yellow]")
-                return
-            
-            # Display results
-            table = Table(title=f"Search Results ({len(results)} found)")
+        
+        try:
+            # Display results, adding each row as the engine yields it
+            table = Table(title="Search Results")
             table.add_column("Rank", justify="right", style="cyan", no_wrap=True)
             table.add_column("Name", style="bold")
             table.add_column("Type", style="green")
@@ -266,29 +376,42 @@ def search_command(
             if verbose:
                 table.add_column("Summary", style="dim", max_width=50)
             
-            for i, result in enumerate(results, 1):
-                name_text = result.search_result.name
-                if result.search_result.full_name != result.search_result.name:
-                    name_text = f"{result.search_result.name}\n[dim]{result.search_result.full_name}[/dim]"
-                
-                score_text = f"{result.hybrid_score:.3f}"
-                if result.search_result.similarity_score != result.hybrid_score:
-                    score_text += f"\n[dim]({result.search_result.similarity_score:.3f})[/dim]"
-                
-                row = [
-                    str(i),
-                    name_text,
-                    result.search_result.node_type,
-                    score_text,
-                    result.match_type
-                ]
-                
-                if verbose:
-                    summary = result.search_result.summary[:100] + "..." if len(result.search_result.summary) > 100 else result.search_result.summary
-                    row.append(summary)
-                
-                table.add_row(*row)
+            results = []
+            with Live(table, console=console, refresh_per_second=8, transient=True) as live:
+                async for result in search_engine.search_iter(query, config):
+                    results.append(result)
+                    
+                    name_text = result.search_result.name
+                    if result.search_result.full_name != result.search_result.name:
+                        name_text = f"{result.search_result.name}\n[dim]{result.search_result.full_name}[/dim]"
+                    
+                    score_text = f"{result.hybrid_score:.3f}"
+                    if result.search_result.similarity_score != result.hybrid_score:
+                        score_text += f"\n[dim]({result.search_result.similarity_score:.3f})[/dim]"
+                    
+                    row = [
+                        str(len(results)),
+                        name_text,
+                        result.search_result.node_type,
+                        score_text,
+                        result.match_type
+                    ]
+                    
+                    if verbose:
+                        summary = result.search_result.summary[:100] + "..." if len(result.search_result.summary) > 100 else result.search_result.summary
+                        row.append(summary)
+                    
+                    table.add_row(*row)
+                    live.refresh()
+                    
+                    if len(results) >= max_results:
+                        break
             
+            if not results:
+                console.print("[yellow]No results found[/yellow]")
+                return
+            
+            table.title = f"Search Results ({len(results)} found)"
             console.print(table)
             
             # Show context information if available
@@ -318,7 +441,10 @@ def search_command(
             console.print(f"[red]❌ Search failed: {e}[/red]")
             raise typer.Exit(1)
         finally:
-            search_engine.close()
+            if isinstance(search_engine, HybridSearchEngine):
+                if search_engine.query_cache is not None:
+                    search_engine.query_cache.close()
+                close_driver(search_engine.driver)
     
     asyncio.run(run_search())
 
@@ -327,7 +453,8 @@ def explain_command(
     query: str = typer.Argument(..., help="Query to explain"),
     neo4j_uri: str = typer.Option("bolt://localhost:7687", "--neo4j-uri", help="Neo4j database URI"),
     neo4j_user: str = typer.Option("neo4j", "--neo4j-user", help="Neo4j username"),
-    neo4j_password: str = typer.Option("password", "--neo4j-password", help="Neo4j password")
+    neo4j_password: str = typer.Option("password", "--neo4j-password", help="Neo4j password"),
+    use_daemon: bool = typer.Option(False, "--daemon", help="Explain through a running search daemon when one is available")
 ):
     """
     💡 Explain how a search query would be processed.
@@ -337,13 +464,29 @@ def explain_command(
     """
     
     async def run_explain():
+        from .hybrid_search import HybridSearchEngine
+        from .neo4j_setup import get_driver, close_driver
+        
         console.print(Panel.fit(
             f"[bold blue]💡 Query Analysis: {query}[/bold blue]\n"
             "Understanding search strategy",
             border_style="blue"
         ))
         
-        search_engine = HybridSearchEngine(neo4j_uri, neo4j_user, neo4j_password)
+        search_engine = None
+        if use_daemon:
+            from .search_daemon import SearchDaemonClient
+            client = SearchDaemonClient(neo4j_uri, neo4j_user, neo4j_password)
+            if await client.is_available():
+                search_engine = client
+            else:
+                console.print("[dim]Search daemon not running, explaining in-process[/dim]")
+        
+        if search_engine is None:
+            search_engine = HybridSearchEngine(
+                neo4j_uri, neo4j_user, neo4j_password,
+                driver=get_driver(neo4j_uri, neo4j_user, neo4j_password)
+            )
         
         try:
             explanation = await search_engine.explain_search(query)
@@ -388,10 +531,64 @@ def explain_command(
             console.print(f"[red]❌ Explain failed: {e}[/red]")
             raise typer.Exit(1)
         finally:
-            search_engine.close()
+            if isinstance(search_engine, HybridSearchEngine):
+                close_driver(search_engine.driver)
     
     asyncio.run(run_explain())
 
+@app.command("daemon")
+def daemon_command(
+    neo4j_uri: str = typer.Option("bolt://localhost:7687", "--neo4j-uri", help="Neo4j database URI"),
+    neo4j_user: str = typer.Option("neo4j", "--neo4j-user", help="Neo4j username"),
+    neo4j_password: str = typer.Option("password", "--neo4j-password", help="Neo4j password"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose logging")
+):
+    """
+    🔌 Run a resident search daemon.
+    
+    Keeps the Neo4j driver, embedding model and query cache loaded so that
+    `search --daemon` and `explain --daemon` skip startup and warmup costs.
+    Listens on a Unix socket in a private per-user directory (loopback TCP
+    on Windows), and only answers clients that present its token and the
+    same Neo4j connection options.
+    """
+    
+    log_level = logging.DEBUG if verbose else logging.INFO
+    configure_logging(log_level)
+    
+    from .hybrid_search import HybridSearchEngine
+    from .embedding_cache import EmbeddingCache
+    from .neo4j_setup import get_driver, close_driver
+    from .search_daemon import SearchDaemon
+    
+    async def run_daemon():
+        search_engine = HybridSearchEngine(
+            neo4j_uri, neo4j_user, neo4j_password,
+            driver=get_driver(neo4j_uri, neo4j_user, neo4j_password),
+            query_cache=EmbeddingCache()
+        )
+        
+        try:
+            # Load the embedding model and open a connection up front so the
+            # first client request does not pay for either
+            search_engine.vector_engine.embedding_generator
+            search_engine.driver.verify_connectivity()
+            daemon = SearchDaemon(search_engine, neo4j_uri, neo4j_user, neo4j_password)
+            console.print(Panel.fit(
+                f"[bold green]🔌 Search Daemon[/bold green]\n"
+                f"Listening on {daemon.address}",
+                border_style="green"
+            ))
+            await daemon.serve_forever()
+        finally:
+            search_engine.query_cache.close()
+            close_driver(search_engine.driver)
+    
+    try:
+        asyncio.run(run_daemon())
+    except KeyboardInterrupt:
+        console.print("[yellow]Search daemon stopped[/yellow]")
+
 @app.command("api")
 def api_command(
     host: str = typer.Option("0.0.0.0", "--host", help="Host to bind to"),
@@ -413,6 +610,8 @@ def api_command(
     Documentation at http://localhost:8000/docs
     """
     
+    from .search_api import run_api
+    
     console.print(Panel.fit(
         f"[bold green]🌐 Starting Search API Server[/bold green]\n"
         f"Host: {host}\n"
@@ -422,41 +621,111 @@ def api_command(
     ))
     
     # Set environment variables if not already set
-    if not os.getenv("NEO4J_URI"):
-        os.environ["NEO4J_URI"] = "bolt://localhost:7687"
-    if not os.getenv("NEO4J_USER"):
-        os.environ["NEO4J_USER"] = "neo4j"
-    if not os.getenv("NEO4J_PASSWORD"):
-        os.environ["NEO4J_PASSWORD"] = "password"
+    os.environ.setdefault("NEO4J_URI", "bolt://localhost:7687")
+    os.environ.setdefault("NEO4J_USER", "neo4j")
+    os.environ.setdefault("NEO4J_PASSWORD", "password")
     
     run_api(host=host, port=port, reload=reload, log_level=log_level)
 
-async def run_llm_enrichment(neo4j_uri: str, neo4j_user: str, neo4j_password: str, batch_size: int = 20):
-    """Run the complete LLM enrichment process."""
+async def run_llm_enrichment(
+    neo4j_uri: str,
+    neo4j_user: str,
+    neo4j_password: str,
+    batch_size: int = 20,
+    write_batch_size: int = 500,
+    max_concurrent: Optional[int] = None,
+    rpm_limit: Optional[int] = None,
+    prewarm: bool = True
+):
+    """
+    Run the complete LLM enrichment process.
+    
+    Both components share the process-wide driver from get_driver(); the
+    calling command is responsible for closing it. At most max_concurrent
+    (default DEFAULT_LLM_CONCURRENCY) LLM requests are in flight at once,
+    and no more than rpm_limit are
+    started per minute when a limit is given. With prewarm, the Neo4j and
+    LLM connections are opened concurrently before the first batch.
+    """
+    
+    # Bail out before importing the LLM and embedding stacks
+    if not _get_llm_credentials():
+        console.print("[yellow]⚠️ ANTHROPIC_API_KEY not set, skipping LLM features[/yellow]")
+        return
+    
+    # The LLM limit is independent of chunker concurrency, so a missing
+    # value falls back to its own default rather than staying None
+    max_concurrent = max_concurrent or DEFAULT_LLM_CONCURRENCY
+    
+    from .llm_integration import LLMEmbeddingIntegration, PromptBatcher
+    from .summarization_orchestrator import HierarchicalSummarizationOrchestrator
+    from .neo4j_setup import get_driver
+    from .embedding_cache import DEFAULT_CACHE_DIR, EmbeddingCache
     
     # Initialize components
-    llm_integration = LLMEmbeddingIntegration(neo4j_uri, neo4j_user, neo4j_password)
-    summarization_orchestrator = HierarchicalSummarizationOrchestrator(neo4j_uri, neo4j_user, neo4j_password)
+    driver = get_driver(neo4j_uri, neo4j_user, neo4j_password)
+    embedding_cache = EmbeddingCache(DEFAULT_CACHE_DIR / "embeddings.db")
+    llm_integration = LLMEmbeddingIntegration(
+        neo4j_uri, neo4j_user, neo4j_password, driver=driver, write_batch_size=write_batch_size,
+        max_concurrent_requests=max_concurrent, rpm_limit=rpm_limit, embedding_cache=embedding_cache
+    )
+    summarization_orchestrator = HierarchicalSummarizationOrchestrator(
+        neo4j_uri, neo4j_user, neo4j_password, driver=driver
+    )
+    # Coalesces per-node summary prompts into multi-item LLM requests
+    prompt_batcher = PromptBatcher(llm_integration.llm_summarizer, max_concurrent=max_concurrent)
+    
+    # Summarized batches are embedded while later batches are still being
+    # summarized; the bounded queue keeps summarization from running too far
+    # ahead of the embedding worker
+    embed_queue: asyncio.Queue = asyncio.Queue(maxsize=8)
+    streamed_embeddings = 0
+    
+    async def embed_worker():
+        nonlocal streamed_embeddings
+        while (rows := await embed_queue.get()) is not None:
+            try:
+                # The summaries come straight from the summarizer, so embedding
+                # them needs no read back from the database
+                streamed_embeddings += await llm_integration.embed_summarized_nodes(rows)
+            except Exception as e:
+                # Anything missed here is picked up by the final embedding pass
+                logger.error(f"Error embedding summarized batch: {e}")
     
     try:
-        # Step 1: Hierarchical summarization
+        if prewarm:
+            # Pay the Bolt and HTTPS handshakes together, up front
+            await asyncio.gather(
+                asyncio.to_thread(driver.verify_connectivity),
+                llm_integration.llm_summarizer.prewarm()
+            )
+        
+        # Step 1: Hierarchical summarization, embedding each batch as it lands
         console.print("[yellow]🔄 Running hierarchical summarization...[/yellow]")
-        summary_stats = await summarization_orchestrator.run_hierarchical_summarization(
-            llm_integration, batch_size
-        )
+        embed_task = asyncio.create_task(embed_worker())
+        summary_stats = {level.name.lower(): 0 for level in summarization_orchestrator.level_order}
+        try:
+            async for level, rows in summarization_orchestrator.stream_hierarchical_summarization(
+                llm_integration, batch_size, prompt_batcher
+            ):
+                summary_stats[level.name.lower()] += len(rows)
+                await embed_queue.put(rows)
+        finally:
+            await embed_queue.put(None)
+            await embed_task
         
         console.print("[green]✅ Summarization complete[/green]")
         for level, count in summary_stats.items():
             if count > 0:
                 console.print(f"  {level}: {count} nodes")
         
-        # Step 2: Embedding generation
+        # Step 2: Remaining summaries and embeddings
         console.print("\n[yellow]🔄 Generating embeddings...[/yellow]")
         embedding_stats = await llm_integration.run_full_enrichment()
         
         console.print("[green]✅ Embedding generation complete[/green]")
         console.print(f"  Summaries: {embedding_stats['summaries_generated']}")
-        console.print(f"  Embeddings: {embedding_stats['embeddings_generated']}")
+        console.print(f"  Embeddings: {embedding_stats['embeddings_generated'] + streamed_embeddings}")
         
     except Exception as e:
         console.print(f"[red]❌ LLM enrichment failed: {e}[/red]")
@@ -464,6 +733,7 @@ async def run_llm_enrichment(neo4j_uri: str, neo4j_user: str, neo4j_password: st
     finally:
         llm_integration.close()
         summarization_orchestrator.close()
+        embedding_cache.close()
 
 @app.callback()
 def main(
@@ -487,6 +757,14 @@ def main(
     if version:
         console.print("Agentic Code Indexer v1.0.0")
         raise typer.Exit()
+    
+    # Prefer the libuv-based event loop for the commands' asyncio.run calls
+    # when it is available (it is not on Windows)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
 
 if __name__ == "__main__":
     app() 
\ No newline at end of file
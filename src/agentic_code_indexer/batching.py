@@ -0,0 +1,73 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, List, Optional, Tuple
+
+class AsyncBatcher(ABC):
+    """
+    Coalesces concurrent process() calls into batched process_batch() calls.
+    
+    A batch is flushed once max_batch_size items are waiting or the oldest
+    waiting item has been queued for max_queue_time seconds.
+    """
+    
+    def __init__(self, max_batch_size: int = 16, max_queue_time: float = 0.05):
+        self.max_batch_size = max_batch_size
+        self.max_queue_time = max_queue_time
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: set = set()
+    
+    async def process(self, item: Any) -> Any:
+        """Queue one item and wait for its result from the batch it lands in."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_queue_time, self._flush)
+        
+        return await future
+    
+    def _flush(self):
+        """Start processing everything queued so far as one batch."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+        
+        batch, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._run_batch(batch))
+        # Keep a reference so the task is not garbage collected mid-flight
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _run_batch(self, batch: List[Tuple[Any, asyncio.Future]]):
+        # Every caller's future must be resolved whatever happens here, or
+        # its process() call would wait forever
+        items = [item for item, _ in batch]
+        try:
+            results = await self.process_batch(items)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+            if len(results) < len(batch):
+                raise RuntimeError(
+                    f"process_batch returned {len(results)} results for {len(batch)} items"
+                )
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except BaseException as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+    
+    @abstractmethod
+    async def process_batch(self, items: List[Any]) -> List[Any]:
+        """Process a batch of items, returning one result per item in order."""
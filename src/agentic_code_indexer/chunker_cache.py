@@ -0,0 +1,85 @@
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+from .common_data_format import ChunkerOutput
+from .sqlite_cache import DEFAULT_CACHE_DIR, DEFAULT_CACHE_MAX_AGE_DAYS, DEFAULT_CACHE_MAX_BYTES, SQLiteCache
+
+logger = logging.getLogger(__name__)
+
+def file_sha256(file_path: str) -> str:
+    """Calculate the SHA-256 checksum of a file, as stored on File nodes."""
+    hash_sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        while chunk := f.read(1024 * 1024):
+            hash_sha256.update(chunk)
+    return hash_sha256.hexdigest()
+
+class ChunkerOutputCache(SQLiteCache):
+    """
+    On-disk cache of chunker output keyed by chunker build, file path and
+    file content checksum.
+
+    Outputs are stored as their JSON encoding in a SQLite table, so a file
+    whose bytes were chunked before (e.g. after switching branches back, or
+    re-indexing into a fresh database) skips the chunker entirely. Least
+    recently used outputs are evicted past the size and age limits.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = DEFAULT_CACHE_DIR / "chunker.db",
+        max_bytes: Optional[int] = DEFAULT_CACHE_MAX_BYTES,
+        max_age_days: Optional[float] = DEFAULT_CACHE_MAX_AGE_DAYS
+    ):
+        super().__init__(path, "outputs", max_bytes, max_age_days)
+
+    @staticmethod
+    def make_key(fingerprint: str, file_path: str, checksum: str) -> str:
+        """Build the cache key for a file chunked by the chunker build identified by fingerprint."""
+        return hashlib.blake2b(
+            f"{fingerprint}\0{file_path}\0{checksum}".encode("utf-8"), digest_size=32
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[ChunkerOutput]:
+        """Return the cached output for a key, or None on a miss."""
+        value = self.get_value(key)
+        if value is None:
+            return None
+        try:
+            return ChunkerOutput.model_validate_json(value)
+        except ValueError as e:
+            logger.warning(f"Discarding unreadable chunker cache entry: {e}")
+            return None
+
+    def put(self, key: str, output: ChunkerOutput):
+        """Store the output for a key, replacing any previous entry."""
+        self.put_values({key: output.model_dump_json().encode("utf-8")})
+
+def chunker_fingerprint(
+    language: str,
+    command: List[str],
+    source_dir: Optional[str] = None,
+    source_globs: Iterable[str] = ()
+) -> str:
+    """
+    Identify a chunker build by its language and the modification times of
+    the files on its command line (script, compiled entry point or binary)
+    and of the shared data format, so rebuilding a chunker invalidates its
+    cached outputs.
+
+    Chunkers run from source (`dotnet run`) have no such file on their
+    command line, so the files matching source_globs in source_dir are
+    included instead.
+    """
+    sources = sorted(
+        str(path) for pattern in source_globs for path in Path(source_dir).glob(pattern)
+    ) if source_dir else []
+    parts = [language]
+    for path in [*command, str(Path(__file__).with_name("common_data_format.py")), *sources]:
+        try:
+            parts.append(f"{path}:{os.stat(path).st_mtime_ns}")
+        except OSError:
+            continue
+    return "|".join(parts)
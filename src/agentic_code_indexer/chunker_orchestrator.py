@@ -1,24 +1,552 @@
 import asyncio
+import functools
+import itertools
 import subprocess
 import json
 import tempfile
 import os
+import shutil
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import AsyncIterator, Deque, Dict, Iterable, List, Optional, Any, Set, Tuple, Union
 from dataclasses import dataclass
 import logging
-from .file_traversal import FileChange
-from .common_data_format import ChunkerOutput
+from pydantic import TypeAdapter
+from .batching import AsyncBatcher
+from .chunker_cache import ChunkerOutputCache, chunker_fingerprint, file_sha256
+from .file_traversal import FileChange, FileTraversal
+from .common_data_format import ChunkerOutput, ChunkerRecord, HeaderRecord
 
 logger = logging.getLogger(__name__)
 
+# Chunker language per file extension, shared with the traversal's detection
+_EXTENSION_LANGUAGES = MappingProxyType(FileTraversal.SUPPORTED_EXTENSIONS)
+
+# Relative cost of one running chunker process; heavier runtimes get
+# proportionally fewer concurrent processes
+CHUNKER_COST = {"csharp": 2}
+
+def default_chunker_concurrency() -> int:
+    """
+    Default number of concurrent chunker processes: ACI_CHUNKER_CONCURRENCY
+    if set, otherwise twice the CPU count, capped at 64.
+    """
+    configured = os.environ.get("ACI_CHUNKER_CONCURRENCY")
+    if configured:
+        try:
+            return max(1, int(configured))
+        except ValueError:
+            logger.warning(f"Ignoring invalid ACI_CHUNKER_CONCURRENCY={configured!r}")
+    return min(64, 2 * (os.cpu_count() or 4))
+
+def chunker_concurrency(language: str, max_concurrent: int) -> int:
+    """Scale an overall concurrency limit down by the chunker's cost."""
+    return max(1, max_concurrent // CHUNKER_COST.get(language, 1))
+
+# Files handed to one chunker process per manifest batch
+DEFAULT_FILES_PER_BATCH = 100
+
+# Longest single NDJSON record accepted from a chunker (a node carries its source code)
+MAX_RECORD_BYTES = 64 * 1024 * 1024
+
+_record_adapter = TypeAdapter(ChunkerRecord)
+
+# Trailing chunker stderr kept for error reports; earlier output is discarded
+STDERR_TAIL_BYTES = 64 * 1024
+
+async def read_tail(stream: asyncio.StreamReader, limit: int = STDERR_TAIL_BYTES) -> bytes:
+    """Read a stream to EOF, keeping only its last limit bytes."""
+    tail = bytearray()
+    while chunk := await stream.read(65536):
+        tail += chunk
+        if len(tail) > limit:
+            del tail[:-limit]
+    return bytes(tail)
+
+# Sentinel a stream_process worker emits once its input is exhausted
+_WORKER_DONE = object()
+
+async def read_chunker_records(stream: asyncio.StreamReader) -> Optional[ChunkerOutput]:
+    """
+    Assemble a ChunkerOutput from an NDJSON record stream (--ndjson), validating
+    one node or relationship line at a time as it arrives.
+    Returns None if the stream carried no header record.
+    """
+    header: Optional[HeaderRecord] = None
+    nodes = []
+    relationships = []
+    async for line in stream:
+        if not line.strip():
+            continue
+        record = _record_adapter.validate_json(line)
+        if record.type == "node":
+            nodes.append(record.data)
+        elif record.type == "rel":
+            relationships.append(record.data)
+        else:
+            header = record
+    
+    if header is None:
+        return None
+    # Every part was validated above, so skip re-validating the whole document
+    return ChunkerOutput.model_construct(
+        language=header.language,
+        version=header.version,
+        processed_files=header.processed_files,
+        nodes=nodes,
+        relationships=relationships,
+        metadata=header.metadata
+    )
+
 @dataclass
 class ChunkerConfig:
     """Configuration for a language-specific chunker."""
     language: str
-    executable_path: str
+    executable_path: List[str]  # Command prefix, e.g. [interpreter, script]
     working_directory: str
     timeout: int = 300  # 5 minutes default timeout
+    # Source files (globs under working_directory) that make up the chunker
+    # when it runs from source rather than from a built entry point
+    source_globs: Tuple[str, ...] = ()
+
+# Threads that run the blocking fork/exec of chunker processes
+_spawn_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="chunker-spawn")
+
+class _PipeWriteProtocol(asyncio.Protocol):
+    """
+    Flow control for a write pipe, built on the documented
+    pause_writing/resume_writing/connection_lost protocol callbacks.
+    """
+    
+    def __init__(self):
+        self._paused = False
+        self._lost = False
+        self._waiters: List[asyncio.Future] = []
+    
+    def pause_writing(self):
+        self._paused = True
+    
+    def resume_writing(self):
+        self._paused = False
+        self._wake()
+    
+    def connection_lost(self, exc: Optional[Exception]):
+        self._lost = True
+        self._wake()
+    
+    def _wake(self):
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._waiters.clear()
+    
+    async def wait_writable(self):
+        while self._paused and not self._lost:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            await waiter
+        if self._lost:
+            raise ConnectionResetError("pipe closed")
+
+class PipeWriter:
+    """The write/drain/close subset of asyncio.StreamWriter for a subprocess stdin pipe."""
+    
+    def __init__(self, transport: asyncio.WriteTransport, protocol: _PipeWriteProtocol):
+        self._transport = transport
+        self._protocol = protocol
+    
+    def write(self, data: bytes):
+        if self._transport.is_closing():
+            raise ConnectionResetError("pipe closed")
+        self._transport.write(data)
+    
+    async def drain(self):
+        """Wait until the pipe buffer is below the high-water mark."""
+        await self._protocol.wait_writable()
+    
+    def close(self):
+        self._transport.close()
+
+def _kill_orphaned_spawn(spawn: asyncio.Future):
+    """Kill a process whose spawning caller was cancelled before it got the Popen."""
+    if not spawn.cancelled() and spawn.exception() is None:
+        try:
+            spawn.result().kill()
+        except ProcessLookupError:
+            pass
+
+class SpawnedProcess:
+    """
+    asyncio view of a subprocess.Popen started off the event loop, mirroring
+    the parts of asyncio.subprocess.Process the orchestrator uses: its pipes
+    are wrapped as streams and wait() does not block the loop.
+    """
+    
+    def __init__(
+        self,
+        popen: subprocess.Popen,
+        stdin: Optional[PipeWriter],
+        stdout: Optional[asyncio.StreamReader],
+        stderr: Optional[asyncio.StreamReader]
+    ):
+        self._popen = popen
+        self.stdin = stdin
+        self.stdout = stdout
+        self.stderr = stderr
+    
+    @property
+    def pid(self) -> int:
+        return self._popen.pid
+    
+    @property
+    def returncode(self) -> Optional[int]:
+        return self._popen.poll()
+    
+    def kill(self):
+        try:
+            self._popen.kill()
+        except ProcessLookupError:
+            pass
+    
+    async def wait(self) -> int:
+        if self._popen.poll() is None:
+            # Parked on the spawn threads so it cannot starve the default
+            # executor that checksumming and database work share
+            await asyncio.get_running_loop().run_in_executor(_spawn_executor, self._popen.wait)
+        if self.stdin is not None:
+            self.stdin.close()
+        return self._popen.returncode
+
+async def spawn_process(
+    cmd: List[str], cwd: str, stdin: bool = False, limit: int = 2 ** 16
+) -> Union[SpawnedProcess, asyncio.subprocess.Process]:
+    """
+    Start a chunker process with piped stdout/stderr (and stdin if asked).
+    
+    asyncio.create_subprocess_exec forks on the event loop thread, which
+    stalls every other coroutine while a large parent is cloned; here the
+    fork/exec runs on a spawn thread and only the pipes are attached to the
+    loop afterwards.
+    
+    The Popen arguments are kept eligible for CPython's vfork fast path
+    (3.10+): no preexec_fn, user/group or session changes, and close_fds, so
+    the child never copies the parent's page tables. posix_spawn itself is
+    not used because CPython only takes it with close_fds=False and no cwd,
+    which would leak other workers' pipe ends into every child.
+    
+    Outside POSIX the loop cannot attach Popen's pipes (the Proactor loop
+    needs overlapped handles), so asyncio.create_subprocess_exec is used
+    there; its Process offers the same interface.
+    """
+    if os.name != "posix":
+        return await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=cwd,
+            stdin=asyncio.subprocess.PIPE if stdin else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=limit
+        )
+    
+    loop = asyncio.get_running_loop()
+    spawn = loop.run_in_executor(_spawn_executor, functools.partial(
+        subprocess.Popen,
+        cmd,
+        cwd=cwd,
+        stdin=subprocess.PIPE if stdin else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        bufsize=0,
+        close_fds=True
+    ))
+    # Cancelling the await cannot stop a fork/exec already under way, so
+    # shield it and kill the child once it exists instead of leaking it
+    try:
+        popen = await asyncio.shield(spawn)
+    except asyncio.CancelledError:
+        spawn.add_done_callback(_kill_orphaned_spawn)
+        raise
+    
+    try:
+        readers = []
+        for pipe in (popen.stdout, popen.stderr):
+            reader = asyncio.StreamReader(limit=limit, loop=loop)
+            await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader, loop=loop), pipe)
+            readers.append(reader)
+        
+        writer = None
+        if stdin:
+            transport, protocol = await loop.connect_write_pipe(_PipeWriteProtocol, popen.stdin)
+            writer = PipeWriter(transport, protocol)
+    except BaseException:
+        popen.kill()
+        raise
+    
+    return SpawnedProcess(popen, writer, *readers)
+
+# Default restart policy for persistent chunker workers
+DEFAULT_MAX_FILES_PER_WORKER = 1000
+DEFAULT_MAX_WORKER_RSS_MB = 1024
+WORKER_RSS_CHECK_INTERVAL = 50
+
+def process_rss(pid: int) -> Optional[int]:
+    """Resident set size of a process in bytes, or None if it cannot be read."""
+    try:
+        with open(f"/proc/{pid}/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    # No procfs (macOS, Windows): fall back to psutil when it is installed
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss
+    except Exception:
+        return None
+
+class ChunkerWorkerError(Exception):
+    """Raised when a persistent chunker worker cannot serve a request."""
+
+def _encode_frame(header: Dict[str, Any], body: bytes) -> bytes:
+    """Encode a protocol message: a JSON header line carrying len, then the body."""
+    return json.dumps({**header, "len": len(body)}).encode('utf-8') + b"\n" + body
+
+class ChunkerWorker:
+    """
+    A persistent chunker process started with --serve. Requests and
+    responses are framed messages on its stdin/stdout; a reader task
+    matches each response to its request by id.
+    """
+    
+    def __init__(self, process: Union[SpawnedProcess, asyncio.subprocess.Process], language: str):
+        self.process = process
+        self.language = language
+        self.files_processed = 0
+        self._closed = False
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader_task = asyncio.ensure_future(self._read_responses())
+        self._stderr_task = asyncio.ensure_future(self._drain_stderr())
+    
+    @property
+    def alive(self) -> bool:
+        return not self._closed and self.process.returncode is None and not self._reader_task.done()
+    
+    async def request(self, request_id: int, file_path: str, timeout: float) -> Optional[bytes]:
+        """
+        Ask the worker to chunk one file. Returns the raw ChunkerOutput JSON,
+        or None if the worker reported an error for this file.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            body = json.dumps({"id": request_id, "path": file_path}).encode('utf-8')
+            self.process.stdin.write(_encode_frame({}, body))
+            await self.process.stdin.drain()
+        except (ConnectionError, RuntimeError) as e:
+            self._pending.pop(request_id, None)
+            raise ChunkerWorkerError(f"{self.language} chunker worker is gone: {e}") from e
+        return await asyncio.wait_for(future, timeout)
+    
+    async def _read_responses(self):
+        stdout = self.process.stdout
+        try:
+            while header_line := await stdout.readline():
+                header = json.loads(header_line)
+                body = await stdout.readexactly(header["len"])
+                future = self._pending.pop(header["id"], None)
+                if future is None or future.done():
+                    continue
+                if "error" in header:
+                    logger.error(f"{self.language} chunker worker error: {header['error']}")
+                    future.set_result(None)
+                else:
+                    future.set_result(body)
+        except Exception as e:
+            logger.error(f"Lost {self.language} chunker worker output stream: {e}")
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ChunkerWorkerError(f"{self.language} chunker worker exited"))
+            self._pending.clear()
+    
+    async def _drain_stderr(self):
+        # Chunker diagnostics arrive on stderr; like a one-shot run's stderr
+        # they are only interesting when debugging
+        while line := await self.process.stderr.readline():
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"{self.language} chunker: {line.decode(errors='replace').rstrip()}")
+    
+    def kill(self):
+        """Terminate the worker immediately, e.g. after a timeout."""
+        self._closed = True
+        if self.process.returncode is None:
+            self.process.kill()
+    
+    async def close(self):
+        """Ask the worker to exit by closing its stdin, killing it if it lingers."""
+        self._closed = True
+        try:
+            if self.process.returncode is None:
+                try:
+                    self.process.stdin.close()
+                    await asyncio.wait_for(self.process.wait(), timeout=5)
+                except (asyncio.TimeoutError, ConnectionError):
+                    self.process.kill()
+                    await self.process.wait()
+            await asyncio.gather(self._reader_task, self._stderr_task, return_exceptions=True)
+        finally:
+            # A cancelled close (Ctrl-C during shutdown) must not leave the
+            # process running
+            if self.process.returncode is None:
+                self.process.kill()
+
+class ChunkerWorkerPool:
+    """
+    Pool of persistent worker processes for one chunker. Workers are started
+    on demand up to size and reused across files, so interpreter/runtime
+    startup is paid once per worker instead of once per file.
+    """
+    
+    def __init__(
+        self,
+        chunker_config: ChunkerConfig,
+        project_root: Path,
+        size: int,
+        max_files_per_worker: Optional[int] = DEFAULT_MAX_FILES_PER_WORKER,
+        max_worker_rss_mb: Optional[int] = DEFAULT_MAX_WORKER_RSS_MB
+    ):
+        self.chunker_config = chunker_config
+        self.project_root = project_root
+        self.size = size
+        # Workers are retired and replaced once they hit either limit, so
+        # caches and leaks in long-lived chunker processes cannot grow unbounded
+        self.max_files_per_worker = max_files_per_worker
+        self.max_worker_rss_mb = max_worker_rss_mb
+        self._retiring: Set[asyncio.Task] = set()
+        self._retiring_workers: Set[ChunkerWorker] = set()
+        # Set when workers die before any of them has served anything, e.g.
+        # a chunker build without --serve support; callers then fall back to
+        # one-shot runs
+        self.disabled = False
+        self._any_success = False
+        self._slots = asyncio.Semaphore(size)
+        self._idle: List[ChunkerWorker] = []
+        self._workers: Set[ChunkerWorker] = set()
+        self._request_ids = itertools.count()
+    
+    async def _spawn(self) -> ChunkerWorker:
+        cmd = [*self.chunker_config.executable_path, "--serve", "--project-root", str(self.project_root)]
+        logger.debug(f"Starting chunker worker: {' '.join(cmd)}")
+        process = await spawn_process(cmd, self.chunker_config.working_directory, stdin=True)
+        worker = ChunkerWorker(process, self.chunker_config.language)
+        self._workers.add(worker)
+        return worker
+    
+    async def submit(self, file_change: FileChange) -> Optional[ChunkerOutput]:
+        """
+        Chunk one file on an idle worker. Returns None if the chunker failed
+        on the file; raises ChunkerWorkerError if the worker itself died.
+        """
+        async with self._slots:
+            while self._idle and not self._idle[-1].alive:
+                self._idle.pop()
+            try:
+                worker = self._idle.pop() if self._idle else await self._spawn()
+            except OSError as e:
+                self.disabled = True
+                raise ChunkerWorkerError(f"Could not start {self.chunker_config.language} chunker worker: {e}") from e
+            
+            try:
+                body = await worker.request(
+                    next(self._request_ids), file_change.absolute_path, self.chunker_config.timeout
+                )
+            except asyncio.TimeoutError:
+                logger.error(f"Chunker timeout for file: {file_change.path}")
+                worker.kill()
+                return None
+            except ChunkerWorkerError:
+                # A replacement worker dying on its first file (a crash or
+                # one bad file) says nothing about worker mode support
+                if not self._any_success and not self.disabled:
+                    self.disabled = True
+                    logger.warning(f"{self.chunker_config.language} chunker does not support worker mode, using one process per file")
+                raise
+            else:
+                worker.files_processed += 1
+                self._any_success = True
+            finally:
+                # Dead workers stay in _workers until close() reaps them
+                if worker.alive:
+                    if self._should_retire(worker):
+                        self._retire(worker)
+                    else:
+                        self._idle.append(worker)
+        
+        if body is None:
+            return None
+        return ChunkerOutput.model_validate_json(body)
+    
+    def _should_retire(self, worker: ChunkerWorker) -> bool:
+        """Check an idle worker against the file count and memory limits."""
+        if self.max_files_per_worker and worker.files_processed >= self.max_files_per_worker:
+            logger.info(f"Restarting {self.chunker_config.language} chunker worker after {worker.files_processed} files")
+            return True
+        # Reading RSS costs a syscall or two, so only sample periodically
+        if self.max_worker_rss_mb and worker.files_processed % WORKER_RSS_CHECK_INTERVAL == 0:
+            rss = process_rss(worker.process.pid)
+            if rss is not None and rss > self.max_worker_rss_mb * 1024 * 1024:
+                logger.info(f"Restarting {self.chunker_config.language} chunker worker at {rss // (1024 * 1024)} MB RSS")
+                return True
+        return False
+    
+    def _retire(self, worker: ChunkerWorker):
+        """Shut an idle worker down in the background; the next submit spawns a replacement."""
+        self._workers.discard(worker)
+        self._retiring_workers.add(worker)
+        task = asyncio.ensure_future(worker.close())
+        self._retiring.add(task)
+        task.add_done_callback(self._retiring.discard)
+        task.add_done_callback(lambda _: self._retiring_workers.discard(worker))
+    
+    def kill(self):
+        """Kill every worker process immediately, without waiting for it to exit."""
+        for worker in (*self._workers, *self._retiring_workers):
+            worker.kill()
+    
+    async def close(self):
+        """Stop every worker in the pool, killing any still running if closing is interrupted."""
+        workers, self._idle = list(self._workers), []
+        try:
+            await asyncio.gather(
+                *(worker.close() for worker in workers), *self._retiring, return_exceptions=True
+            )
+        finally:
+            self.kill()
+            self._workers.clear()
+
+class FileBatcher(AsyncBatcher):
+    """
+    Coalesces files submitted one at a time for a single chunker into
+    manifest runs, so a burst of individual submissions shares one chunker
+    process instead of starting one per file.
+    """
+    
+    def __init__(
+        self,
+        orchestrator: "ChunkerOrchestrator",
+        chunker_config: ChunkerConfig,
+        max_batch_size: int = DEFAULT_FILES_PER_BATCH,
+        max_queue_time: float = 0.02
+    ):
+        super().__init__(max_batch_size, max_queue_time)
+        self.orchestrator = orchestrator
+        self.chunker_config = chunker_config
+    
+    async def process_batch(self, items: List[FileChange]) -> List[Optional[ChunkerOutput]]:
+        return await self.orchestrator.process_manifest(self.chunker_config, items)
 
 class ChunkerOrchestrator:
     """
@@ -26,11 +554,94 @@ class ChunkerOrchestrator:
     and extract structured data in the common JSON format.
     """
     
-    def __init__(self, project_root: str):
+    def __init__(
+        self,
+        project_root: str,
+        persistent_workers: bool = True,
+        workers_per_chunker: Optional[int] = None,
+        validation_ttl: float = 300,
+        output_cache: Optional[ChunkerOutputCache] = None
+    ):
         self.project_root = Path(project_root)
         self.chunkers: Dict[str, ChunkerConfig] = {}
+        # With persistent workers, files are sent to long-running chunker
+        # processes instead of starting a process per file or batch
+        self.persistent_workers = persistent_workers
+        self.workers_per_chunker = workers_per_chunker or default_chunker_concurrency()
+        self._worker_pools: Dict[str, ChunkerWorkerPool] = {}
+        self._file_batchers: Dict[str, FileBatcher] = {}
+        # Reuses output for file contents chunked before
+        self.output_cache = output_cache
+        self._fingerprints: Dict[str, str] = {}
+        # Reusable manifest file paths, created on demand in _tmpdir
+        self._tmpdir: Optional[str] = None
+        self._manifest_slots: Deque[str] = deque()
+        self._manifest_slot_count = 0
+        self.validation_ttl = validation_ttl
+        # (language, executable_path, working_directory) -> (passed, checked at)
+        self._validation_cache: Dict[Tuple[str, Tuple[str, ...], str], Tuple[bool, float]] = {}
+        # Chunkers whose build is checked (and run if stale) on first use,
+        # keyed by working directory, and the running or finished checks
+        self._lazy_builds: Dict[str, Path] = {}
+        self._build_tasks: Dict[str, asyncio.Task] = {}
         self._setup_chunkers()
     
+    def _get_worker_pool(self, chunker_config: ChunkerConfig) -> ChunkerWorkerPool:
+        pool = self._worker_pools.get(chunker_config.language)
+        if pool is None:
+            pool = ChunkerWorkerPool(
+                chunker_config,
+                self.project_root,
+                chunker_concurrency(chunker_config.language, self.workers_per_chunker)
+            )
+            self._worker_pools[chunker_config.language] = pool
+        return pool
+    
+    async def __aenter__(self) -> "ChunkerOrchestrator":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    def kill_workers(self):
+        """
+        Kill all persistent chunker workers without waiting for them. Safe to
+        call from synchronous cleanup after the event loop has stopped, e.g.
+        when Ctrl-C interrupted close().
+        """
+        for pool in self._worker_pools.values():
+            pool.kill()
+    
+    async def close(self):
+        """Stop any persistent chunker workers, close the output cache and remove the manifest directory."""
+        try:
+            await asyncio.gather(*(pool.close() for pool in self._worker_pools.values()))
+        finally:
+            self.kill_workers()
+            self._worker_pools = {}
+        if self.output_cache is not None:
+            self.output_cache.close()
+            self.output_cache = None
+        if self._tmpdir is not None:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+            self._tmpdir = None
+            self._manifest_slots.clear()
+            self._manifest_slot_count = 0
+    
+    def _acquire_manifest_slot(self) -> str:
+        """
+        Return a manifest file path for one batch. Paths live in a single
+        temp directory and are handed back to _manifest_slots after use, so
+        each concurrent batch reuses (truncates) the same file instead of
+        creating and unlinking a new temp file.
+        """
+        if self._manifest_slots:
+            return self._manifest_slots.popleft()
+        if self._tmpdir is None:
+            self._tmpdir = tempfile.mkdtemp(prefix="aci_")
+        self._manifest_slot_count += 1
+        return os.path.join(self._tmpdir, f"manifest_{self._manifest_slot_count}.txt")
+    
     def _setup_chunkers(self):
         """Initialize configurations for all available chunkers."""
         # Python chunker
@@ -38,7 +649,7 @@ class ChunkerOrchestrator:
         if python_chunker_path.exists():
             self.chunkers["python"] = ChunkerConfig(
                 language="python",
-                executable_path=str(python_chunker_path),
+                executable_path=[sys.executable, str(python_chunker_path)],
                 working_directory=str(python_chunker_path.parent),
                 timeout=300
             )
@@ -47,210 +658,571 @@ class ChunkerOrchestrator:
         # C# chunker
         csharp_chunker_path = self.project_root / "src" / "csharp-chunker" / "CSharpChunker"
         if csharp_chunker_path.exists():
+            # Prefer a published binary; `dotnet run` restores and builds the
+            # project on every invocation
+            binary_name = "CSharpChunker.exe" if os.name == "nt" else "CSharpChunker"
+            published = sorted(
+                csharp_chunker_path.glob(f"bin/Release/**/publish/{binary_name}"),
+                key=lambda p: p.stat().st_mtime,
+                reverse=True
+            )
+            source_globs: Tuple[str, ...] = ()
+            if published:
+                executable = [str(published[0])]
+            else:
+                executable = [shutil.which("dotnet") or "dotnet", "run", "--"]
+                source_globs = ("*.cs", "*.csproj")
+                logger.warning("No published C# chunker found, falling back to `dotnet run` (run `dotnet publish -c Release` to speed this up)")
+            
             self.chunkers["csharp"] = ChunkerConfig(
                 language="csharp",
-                executable_path="dotnet run --",
+                executable_path=executable,
                 working_directory=str(csharp_chunker_path),
-                timeout=300
+                timeout=300,
+                source_globs=source_globs
             )
             logger.info("C# chunker configured")
         
         # Node.js chunker  
         nodejs_chunker_path = self.project_root / "src" / "nodejs-chunker" / "src" / "main.ts"
         if nodejs_chunker_path.exists():
-            # Check if compiled JS exists, otherwise use ts-node
-            compiled_js = self.project_root / "src" / "nodejs-chunker" / "dist" / "main.js"
-            if compiled_js.exists():
-                executable = f"node {compiled_js}"
+            # Always run compiled JS; ts-node would transpile on every call.
+            # The build is brought up to date on first use, not here, so
+            # commands that never chunk do not wait for npm
+            chunker_dir = nodejs_chunker_path.parent.parent
+            compiled_js = chunker_dir / "dist" / "main.js"
+            node_exe = shutil.which("node")
+            if node_exe and (compiled_js.exists() or shutil.which("npm")):
+                self.chunkers["javascript"] = ChunkerConfig(
+                    language="javascript",
+                    executable_path=[node_exe, str(compiled_js)],
+                    working_directory=str(chunker_dir),
+                    timeout=300
+                )
+                self.chunkers["typescript"] = self.chunkers["javascript"]  # Same chunker handles both
+                self._lazy_builds[str(chunker_dir)] = chunker_dir
+                logger.info("Node.js/TypeScript chunker configured")
             else:
-                executable = f"npx ts-node {nodejs_chunker_path}"
-                
-            self.chunkers["javascript"] = ChunkerConfig(
-                language="javascript",
-                executable_path=executable,
-                working_directory=str(nodejs_chunker_path.parent.parent),
+                logger.warning("Node.js/TypeScript chunker disabled: node, or npm to build dist/main.js, is unavailable")
+    
+    async def _ensure_built(self, chunker_config: ChunkerConfig) -> bool:
+        """
+        Make sure a chunker that is built from source is current before its
+        first run. The check runs once, in a worker thread; returns False if
+        the chunker cannot be used.
+        """
+        chunker_dir = self._lazy_builds.get(chunker_config.working_directory)
+        if chunker_dir is None:
+            return True
+        task = self._build_tasks.get(chunker_config.working_directory)
+        if task is None:
+            task = asyncio.ensure_future(asyncio.to_thread(self._ensure_nodejs_chunker_built, chunker_dir))
+            self._build_tasks[chunker_config.working_directory] = task
+        # Shielded so one cancelled caller does not abort the build for the others
+        return await asyncio.shield(task) is not None
+    
+    def _ensure_nodejs_chunker_built(self, chunker_dir: Path) -> Optional[Path]:
+        """
+        Return the compiled Node.js chunker entry point, running the npm build
+        if it is missing or older than any file under src/. Returns None if
+        there is no usable build.
+        """
+        compiled_js = chunker_dir / "dist" / "main.js"
+        try:
+            built_at = compiled_js.stat().st_mtime
+        except OSError:
+            built_at = None
+        if built_at is not None:
+            try:
+                current = all(
+                    path.stat().st_mtime <= built_at
+                    for path in (chunker_dir / "src").rglob("*") if path.is_file()
+                )
+            except OSError:
+                # Sources changing under the check; rebuild to be safe
+                current = False
+            if current:
+                return compiled_js
+        
+        npm = shutil.which("npm")
+        if not npm:
+            if built_at is not None:
+                logger.warning("Compiled Node.js chunker is older than its sources and npm is unavailable to rebuild it")
+                return compiled_js
+            return None
+        
+        logger.info("Compiled Node.js chunker is missing or stale, running `npm run build`")
+        try:
+            result = subprocess.run(
+                [npm, "run", "build"],
+                cwd=chunker_dir,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 timeout=300
             )
-            self.chunkers["typescript"] = self.chunkers["javascript"]  # Same chunker handles both
-            logger.info("Node.js/TypeScript chunker configured")
-    
-    def get_chunker_for_file(self, file_path: str) -> Optional[ChunkerConfig]:
-        """Get the appropriate chunker for a file based on its extension."""
-        path = Path(file_path)
-        extension = path.suffix.lower()
-        
-        # Map extensions to chunker languages
-        extension_map = {
-            '.py': 'python',
-            '.cs': 'csharp',
-            '.js': 'javascript',
-            '.jsx': 'javascript', 
-            '.mjs': 'javascript',
-            '.cjs': 'javascript',
-            '.ts': 'typescript',
-            '.tsx': 'typescript'
-        }
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.error(f"Node.js chunker build failed: {e}")
+            return None
+        
+        if result.returncode != 0:
+            logger.error(f"Node.js chunker build failed (run `npm install` first?): {result.stderr.decode(errors='replace')}")
+            return None
+        
+        return compiled_js if compiled_js.exists() else None
+    
+    def get_chunker_for_file(self, file_path: str, language: Optional[str] = None) -> Optional[ChunkerConfig]:
+        """
+        Get the appropriate chunker for a file based on its extension.
+        A language already detected during traversal takes precedence.
+        """
+        if language and language in self.chunkers:
+            return self.chunkers[language]
         
-        language = extension_map.get(extension)
+        language = _EXTENSION_LANGUAGES.get(os.path.splitext(file_path)[1].lower())
         if language and language in self.chunkers:
             return self.chunkers[language]
         
         logger.warning(f"No chunker available for file: {file_path}")
         return None
     
+    async def submit_file(self, file_change: FileChange) -> Optional[ChunkerOutput]:
+        """
+        Process a single file, coalescing it with other files submitted for
+        the same chunker within a few milliseconds into one manifest run.
+        Persistent workers already serve files individually, so they are
+        used directly when enabled.
+        """
+        if self.persistent_workers:
+            return await self.process_file(file_change)
+        
+        chunker_config = self.get_chunker_for_file(file_change.absolute_path, file_change.language)
+        if not chunker_config:
+            return None
+        
+        batcher = self._file_batchers.get(chunker_config.language)
+        if batcher is None:
+            batcher = self._file_batchers[chunker_config.language] = FileBatcher(self, chunker_config)
+        return await batcher.process(file_change)
+    
+    def _build_command(self, chunker_config: ChunkerConfig, input_args: List[str]) -> List[str]:
+        """Build the chunker command line for the given inputs, with output on stdout."""
+        return [
+            *chunker_config.executable_path,
+            *input_args,
+            "--output", "-",
+            "--project-root", str(self.project_root)
+        ]
+    
+    async def _cache_key(self, chunker_config: ChunkerConfig, file_change: FileChange) -> Optional[str]:
+        """Output cache key for a file, or None if caching is off or the file is unreadable."""
+        if self.output_cache is None:
+            return None
+        fingerprint = self._fingerprints.get(chunker_config.language)
+        if fingerprint is None:
+            fingerprint = chunker_fingerprint(
+                chunker_config.language,
+                chunker_config.executable_path,
+                chunker_config.working_directory,
+                chunker_config.source_globs
+            )
+            self._fingerprints[chunker_config.language] = fingerprint
+        
+        # Traversal has usually checksummed the file already
+        checksum = file_change.new_checksum
+        if not checksum:
+            try:
+                checksum = await asyncio.to_thread(file_sha256, file_change.absolute_path)
+            except OSError:
+                return None
+        return ChunkerOutputCache.make_key(fingerprint, file_change.absolute_path, checksum)
+    
     async def process_file(self, file_change: FileChange) -> Optional[ChunkerOutput]:
         """
         Process a single file using the appropriate chunker.
         Returns ChunkerOutput or None if processing fails.
+        Output cached for the same file contents is returned without
+        running the chunker.
         """
-        chunker_config = self.get_chunker_for_file(file_change.absolute_path)
-        if not chunker_config:
+        chunker_config = self.get_chunker_for_file(file_change.absolute_path, file_change.language)
+        if not chunker_config or not await self._ensure_built(chunker_config):
             return None
         
-        # Create temporary output file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as temp_file:
-            temp_output_path = temp_file.name
+        cache_key = await self._cache_key(chunker_config, file_change)
+        if cache_key is not None:
+            cached = self.output_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        chunker_output = await self._run_file(chunker_config, file_change)
+        if chunker_output is not None and cache_key is not None:
+            self.output_cache.put(cache_key, chunker_output)
+        return chunker_output
+    
+    async def _run_file(self, chunker_config: ChunkerConfig, file_change: FileChange) -> Optional[ChunkerOutput]:
+        """Chunk a single file on a persistent worker, or a one-shot process as fallback."""
+        if self.persistent_workers:
+            pool = self._get_worker_pool(chunker_config)
+            if not pool.disabled:
+                try:
+                    return await pool.submit(file_change)
+                except ChunkerWorkerError as e:
+                    # Retry below with a one-shot process
+                    logger.debug(f"Worker failed for {file_change.path}: {e}")
         
         try:
-            # Build command based on chunker type
-            if chunker_config.language == "python":
-                cmd = [
-                    "python", chunker_config.executable_path,
-                    file_change.absolute_path,
-                    "--output", temp_output_path,
-                    "--project-root", str(self.project_root)
-                ]
-            elif chunker_config.language == "csharp":
-                cmd = chunker_config.executable_path.split() + [
-                    file_change.absolute_path,
-                    "-o", temp_output_path,
-                    "--project-root", str(self.project_root)
-                ]
-            else:  # javascript/typescript
-                cmd = chunker_config.executable_path.split() + [
-                    file_change.absolute_path,
-                    "--output", temp_output_path,
-                    "--project-root", str(self.project_root)
-                ]
+            cmd = self._build_command(chunker_config, [file_change.absolute_path, "--ndjson"])
             
-            logger.debug(f"Running chunker command: {' '.join(cmd)}")
+            # Guarded so the per-file join is skipped unless debugging
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Running chunker command: {' '.join(cmd)}")
             
-            # Execute chunker
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                cwd=chunker_config.working_directory,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
+            # Execute chunker; its NDJSON records arrive on stdout
+            process = await spawn_process(cmd, chunker_config.working_directory, limit=MAX_RECORD_BYTES)
             
+            # Drain stderr alongside stdout so neither pipe can fill up and stall the chunker
+            stderr_task = asyncio.create_task(read_tail(process.stderr))
             try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(), 
+                chunker_output = await asyncio.wait_for(
+                    read_chunker_records(process.stdout),
                     timeout=chunker_config.timeout
                 )
+                await process.wait()
             except asyncio.TimeoutError:
                 process.kill()
                 await process.wait()
                 logger.error(f"Chunker timeout for file: {file_change.path}")
                 return None
+            except Exception:
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+                raise
+            finally:
+                stderr = await stderr_task
             
             if process.returncode != 0:
-                logger.error(f"Chunker failed for {file_change.path}: {stderr.decode()}")
+                logger.error(f"Chunker failed for {file_change.path}: {stderr.decode(errors='replace')}")
                 return None
             
-            # Read and parse output
-            if os.path.exists(temp_output_path):
-                with open(temp_output_path, 'r', encoding='utf-8') as f:
-                    output_data = json.load(f)
-                
-                # Convert to ChunkerOutput object
-                chunker_output = ChunkerOutput.parse_obj(output_data)
-                logger.info(f"Successfully processed {file_change.path}: {len(chunker_output.nodes)} nodes, {len(chunker_output.relationships)} relationships")
-                return chunker_output
-            else:
-                logger.error(f"No output file generated for: {file_change.path}")
+            if chunker_output is None:
+                logger.error(f"No output generated for: {file_change.path}")
                 return None
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Successfully processed {file_change.path}: {len(chunker_output.nodes)} nodes, {len(chunker_output.relationships)} relationships")
+            return chunker_output
                 
         except Exception as e:
             logger.error(f"Error processing file {file_change.path}: {e}")
             return None
+    
+    async def process_manifest(
+        self, chunker_config: ChunkerConfig, file_changes: List[FileChange]
+    ) -> List[Optional[ChunkerOutput]]:
+        """
+        Process several files with a single chunker process by passing them in
+        a manifest. Returns one entry per file, None where processing failed.
+        Files with cached output are left out of the manifest.
+        """
+        if not await self._ensure_built(chunker_config):
+            return [None] * len(file_changes)
+        if self.output_cache is None:
+            return await self._run_manifest(chunker_config, file_changes)
+        
+        cache_keys = [await self._cache_key(chunker_config, fc) for fc in file_changes]
+        results = [self.output_cache.get(key) if key else None for key in cache_keys]
+        misses = [i for i, result in enumerate(results) if result is None]
+        if not misses:
+            return results
+        
+        outputs = await self._run_manifest(chunker_config, [file_changes[i] for i in misses])
+        for i, output in zip(misses, outputs):
+            results[i] = output
+            if output is not None and cache_keys[i]:
+                self.output_cache.put(cache_keys[i], output)
+        return results
+    
+    async def _run_manifest(
+        self, chunker_config: ChunkerConfig, file_changes: List[FileChange]
+    ) -> List[Optional[ChunkerOutput]]:
+        """Run one chunker process over a manifest of files."""
+        manifest_path = self._acquire_manifest_slot()
+        with open(manifest_path, 'w', encoding='utf-8') as manifest_file:
+            manifest_file.write("\n".join(fc.absolute_path for fc in file_changes))
+        
+        results: List[Optional[ChunkerOutput]] = [None] * len(file_changes)
+        try:
+            cmd = self._build_command(chunker_config, ["--manifest", manifest_path])
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Running chunker command: {' '.join(cmd)}")
+            
+            process = await spawn_process(cmd, chunker_config.working_directory, limit=MAX_RECORD_BYTES)
+            
+            async def read_results():
+                # One JSON document per stdout line, in manifest order
+                i = 0
+                async for line in process.stdout:
+                    if i < len(results) and line.strip():
+                        try:
+                            results[i] = ChunkerOutput.model_validate_json(line)
+                        except Exception as e:
+                            logger.error(f"Invalid chunker output for {file_changes[i].path}: {e}")
+                    i += 1
+            
+            stderr_task = asyncio.create_task(read_tail(process.stderr))
+            try:
+                await asyncio.wait_for(read_results(), timeout=chunker_config.timeout)
+                await process.wait()
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                logger.error(f"Chunker timeout for batch of {len(file_changes)} {chunker_config.language} files")
+                return [None] * len(file_changes)
+            except Exception:
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+                raise
+            finally:
+                stderr = await stderr_task
+            
+            if process.returncode != 0:
+                logger.error(f"Chunker failed for batch of {len(file_changes)} {chunker_config.language} files: {stderr.decode(errors='replace')}")
+                return [None] * len(file_changes)
+            
+            return results
+        
         finally:
-            # Clean up temp file
-            if os.path.exists(temp_output_path):
-                os.unlink(temp_output_path)
+            self._manifest_slots.append(manifest_path)
+    
+    def _plan_batches(
+        self, file_changes: List[FileChange], max_concurrent: int, files_per_batch: int
+    ) -> Tuple[List[Tuple[ChunkerConfig, List[FileChange]]], int]:
+        """
+        Group files by chunker and split each group into manifest batches.
+        Batches are kept small enough that each group still spreads over up to
+        max_concurrent processes. Returns the batches and the number of files
+        no chunker can handle.
+        """
+        groups: Dict[str, Tuple[ChunkerConfig, List[FileChange]]] = {}
+        unsupported = 0
+        for file_change in file_changes:
+            chunker_config = self.get_chunker_for_file(file_change.absolute_path, file_change.language)
+            if not chunker_config:
+                unsupported += 1
+                continue
+            groups.setdefault(chunker_config.language, (chunker_config, []))[1].append(file_change)
+        
+        batches = []
+        for chunker_config, group in groups.values():
+            batch_size = max(1, min(files_per_batch, -(-len(group) // max_concurrent)))
+            for start in range(0, len(group), batch_size):
+                batches.append((chunker_config, group[start:start + batch_size]))
+        return batches, unsupported
     
-    async def process_files_batch(self, file_changes: List[FileChange], max_concurrent: int = 5) -> List[ChunkerOutput]:
+    async def process_files_batch(
+        self,
+        file_changes: List[FileChange],
+        max_concurrent: Optional[int] = None,
+        files_per_batch: int = DEFAULT_FILES_PER_BATCH
+    ) -> List[ChunkerOutput]:
         """
         Process multiple files concurrently with limited parallelism.
         Returns list of ChunkerOutput objects for successful processing.
+        max_concurrent defaults to default_chunker_concurrency().
         """
-        semaphore = asyncio.Semaphore(max_concurrent)
+        max_concurrent = max_concurrent or default_chunker_concurrency()
+        logger.info(f"Processing {len(file_changes)} files with max {max_concurrent} concurrent workers")
         
-        async def process_with_semaphore(file_change: FileChange) -> Optional[ChunkerOutput]:
-            async with semaphore:
-                return await self.process_file(file_change)
+        successful_outputs = [
+            output async for output in self.iter_process(file_changes, max_concurrent, files_per_batch)
+        ]
         
-        logger.info(f"Processing {len(file_changes)} files with max {max_concurrent} concurrent workers")
+        logger.info(f"Batch processing complete: {len(successful_outputs)} successful, {len(file_changes) - len(successful_outputs)} failed")
+        return successful_outputs
+    
+    async def iter_process(
+        self,
+        file_changes: List[FileChange],
+        max_concurrent: Optional[int] = None,
+        files_per_batch: int = DEFAULT_FILES_PER_BATCH
+    ) -> AsyncIterator[ChunkerOutput]:
+        """
+        Process multiple files concurrently, yielding each successful
+        ChunkerOutput as soon as it is ready so callers can start consuming
+        before the whole set is done. Failed files are skipped; use
+        iter_processed_files to see them.
+        """
+        async for output in self.iter_processed_files(file_changes, max_concurrent, files_per_batch):
+            if output is not None:
+                yield output
+    
+    async def iter_processed_files(
+        self,
+        file_changes: List[FileChange],
+        max_concurrent: Optional[int] = None,
+        files_per_batch: int = DEFAULT_FILES_PER_BATCH
+    ) -> AsyncIterator[Optional[ChunkerOutput]]:
+        """
+        Process multiple files concurrently, yielding one result per file
+        (None for a failed file) as soon as its batch finishes.
+        
+        Files are grouped by language and handed to each chunker in manifest
+        batches of up to files_per_batch, so interpreter/runtime startup is
+        paid once per batch rather than once per file. At most max_concurrent
+        chunker processes run at a time (default_chunker_concurrency() if not
+        given), fewer for costly chunkers per CHUNKER_COST. With persistent
+        workers the files go through stream_process instead.
+        """
+        max_concurrent = max_concurrent or default_chunker_concurrency()
+        if self.persistent_workers:
+            async for result in self.stream_process(file_changes, max_concurrent):
+                yield result
+            return
+        
+        batches, unsupported = self._plan_batches(file_changes, max_concurrent, files_per_batch)
+        for _ in range(unsupported):
+            yield None
         
-        # Create tasks for all files
-        tasks = [process_with_semaphore(fc) for fc in file_changes]
+        semaphore = asyncio.Semaphore(max_concurrent)
+        language_semaphores = {
+            cfg.language: asyncio.Semaphore(chunker_concurrency(cfg.language, max_concurrent))
+            for cfg, _ in batches
+        }
         
-        # Wait for all tasks to complete
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        async def process_with_semaphore(
+            chunker_config: ChunkerConfig, batch: List[FileChange]
+        ) -> List[Optional[ChunkerOutput]]:
+            async with language_semaphores[chunker_config.language], semaphore:
+                try:
+                    return await self.process_manifest(chunker_config, batch)
+                except Exception as e:
+                    logger.error(f"Exception processing batch of {len(batch)} {chunker_config.language} files: {e}")
+                    return [None] * len(batch)
         
-        # Filter successful results
-        successful_outputs = []
-        failed_count = 0
+        tasks = [asyncio.ensure_future(process_with_semaphore(cfg, batch)) for cfg, batch in batches]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for result in await next_done:
+                    yield result
+        finally:
+            # Stop outstanding chunkers if the consumer bails out early
+            for task in tasks:
+                task.cancel()
+    
+    async def stream_process(
+        self, file_changes: Iterable[FileChange], max_concurrent: Optional[int] = None
+    ) -> AsyncIterator[Optional[ChunkerOutput]]:
+        """
+        Chunk files through a bounded producer/consumer pipeline, yielding one
+        result per file (None for a failed file) in completion order.
         
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.error(f"Exception processing {file_changes[i].path}: {result}")
-                failed_count += 1
-            elif result is not None:
-                successful_outputs.append(result)
-            else:
-                failed_count += 1
+        A producer feeds file_changes into a queue drained by max_concurrent
+        workers, whose results pass through a second bounded queue to the
+        caller. Both queues hold at most 2 * max_concurrent items, so a slow
+        consumer throttles chunking instead of letting results pile up, and
+        file_changes can be a lazy iterable. Each chunker's worker pool
+        further limits how many of its files are in flight.
+        """
+        max_concurrent = max_concurrent or default_chunker_concurrency()
+        inputs: asyncio.Queue = asyncio.Queue(maxsize=max_concurrent * 2)
+        outputs: asyncio.Queue = asyncio.Queue(maxsize=max_concurrent * 2)
         
-        logger.info(f"Batch processing complete: {len(successful_outputs)} successful, {failed_count} failed")
-        return successful_outputs
+        async def produce():
+            for file_change in file_changes:
+                await inputs.put(file_change)
+            for _ in range(max_concurrent):
+                await inputs.put(None)
+        
+        async def work():
+            while (file_change := await inputs.get()) is not None:
+                try:
+                    result = await self.process_file(file_change)
+                except Exception as e:
+                    logger.error(f"Exception processing {file_change.path}: {e}")
+                    result = None
+                await outputs.put(result)
+            await outputs.put(_WORKER_DONE)
+        
+        tasks = [asyncio.create_task(produce())]
+        tasks.extend(asyncio.create_task(work()) for _ in range(max_concurrent))
+        try:
+            running = max_concurrent
+            while running:
+                result = await outputs.get()
+                if result is _WORKER_DONE:
+                    running -= 1
+                    continue
+                yield result
+        finally:
+            # Stop the pipeline if the consumer bails out early
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
     
     def get_available_chunkers(self) -> List[str]:
         """Get list of available chunker languages."""
         return list(self.chunkers.keys())
     
+    def _validate_chunker(self, language: str, config: ChunkerConfig) -> bool:
+        """Check that the runtime behind one chunker starts."""
+        try:
+            # Test with a simple command that should work
+            if language == "python":
+                cmd = ["python", "--version"]
+            elif language == "csharp":
+                cmd = ["dotnet", "--version"]
+            else:  # javascript/typescript
+                cmd = ["node", "--version"]
+            
+            # Only the exit status matters, so nothing is buffered
+            result = subprocess.run(
+                cmd, 
+                cwd=config.working_directory,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=10
+            )
+            
+            if result.returncode == 0:
+                logger.info(f"{language} chunker validation passed")
+            else:
+                logger.error(f"{language} chunker validation failed")
+            return result.returncode == 0
+                
+        except Exception as e:
+            logger.error(f"Error validating {language} chunker: {e}")
+            return False
+    
     def validate_chunkers(self) -> Dict[str, bool]:
         """
         Validate that all configured chunkers are working properly.
         Returns dict mapping language to validation status.
+        
+        Results are cached per chunker configuration for validation_ttl
+        seconds; the remaining checks run concurrently.
         """
         validation_results = {}
+        pending = {}
+        now = time.monotonic()
         
         for language, config in self.chunkers.items():
-            try:
-                # Test with a simple command that should work
-                if language == "python":
-                    cmd = ["python", "--version"]
-                elif language == "csharp":
-                    cmd = ["dotnet", "--version"]
-                else:  # javascript/typescript
-                    cmd = ["node", "--version"]
-                
-                result = subprocess.run(
-                    cmd, 
-                    cwd=config.working_directory,
-                    capture_output=True, 
-                    timeout=10
-                )
-                validation_results[language] = result.returncode == 0
-                
-                if result.returncode == 0:
-                    logger.info(f"{language} chunker validation passed")
-                else:
-                    logger.error(f"{language} chunker validation failed")
-                    
-            except Exception as e:
-                logger.error(f"Error validating {language} chunker: {e}")
-                validation_results[language] = False
+            key = (language, tuple(config.executable_path), config.working_directory)
+            cached = self._validation_cache.get(key)
+            if cached is not None and now - cached[1] < self.validation_ttl:
+                validation_results[language] = cached[0]
+            else:
+                pending[language] = (key, config)
+        
+        if pending:
+            with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                futures = {
+                    language: executor.submit(self._validate_chunker, language, config)
+                    for language, (_, config) in pending.items()
+                }
+                for language, future in futures.items():
+                    validation_results[language] = future.result()
+                    self._validation_cache[pending[language][0]] = (validation_results[language], now)
         
         return validation_results
 
@@ -1,57 +1,76 @@
 #!/usr/bin/env python3
 """
 Common Intermediate Data Format for Agentic Code Indexer
-Defines Pydantic models for the structured data format that all language chunkers output.
+Defines the Pydantic models and dataclasses for the structured data format that all language chunkers output.
 """
 
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Union, Literal, Annotated, Final
+from dataclasses import dataclass, field
 from pydantic import BaseModel, Field
-from enum import Enum
-
-
-class NodeType(str, Enum):
-    """Enumeration of supported node types in the code graph."""
-    FILE = "File"
-    DIRECTORY = "Directory"
-    CLASS = "Class"
-    INTERFACE = "Interface"
-    METHOD = "Method"
-    FUNCTION = "Function"
-    VARIABLE = "Variable"
-    PARAMETER = "Parameter"
-    IMPORT = "Import"
-    EXPORT = "Export"
-
-
-class RelationshipType(str, Enum):
-    """Enumeration of supported relationship types in the code graph."""
-    CONTAINS = "CONTAINS"
-    DEFINES = "DEFINES"
-    DECLARES = "DECLARES"
-    HAS_MEMBER = "HAS_MEMBER"
-    CALLS = "CALLS"
-    INSTANTIATES = "INSTANTIATES"
-    EXTENDS = "EXTENDS"
-    IMPLEMENTS = "IMPLEMENTS"
-    IMPORTS = "IMPORTS"
-    EXPORTS = "EXPORTS"
-    SCOPES = "SCOPES"
-    USES = "USES"
-    REFERENCES = "REFERENCES"
-
-
-class SourceLocation(BaseModel):
+
+
+# Node and relationship types are plain strings rather than Enum members, so
+# validation is a literal membership check and values need no unwrapping when
+# they are serialized or formatted into Cypher
+class NodeType:
+    """Supported node types in the code graph."""
+    FILE: Final = "File"
+    DIRECTORY: Final = "Directory"
+    CLASS: Final = "Class"
+    INTERFACE: Final = "Interface"
+    METHOD: Final = "Method"
+    FUNCTION: Final = "Function"
+    VARIABLE: Final = "Variable"
+    PARAMETER: Final = "Parameter"
+    IMPORT: Final = "Import"
+    EXPORT: Final = "Export"
+
+
+class RelationshipType:
+    """Supported relationship types in the code graph."""
+    CONTAINS: Final = "CONTAINS"
+    DEFINES: Final = "DEFINES"
+    DECLARES: Final = "DECLARES"
+    HAS_MEMBER: Final = "HAS_MEMBER"
+    CALLS: Final = "CALLS"
+    INSTANTIATES: Final = "INSTANTIATES"
+    EXTENDS: Final = "EXTENDS"
+    IMPLEMENTS: Final = "IMPLEMENTS"
+    IMPORTS: Final = "IMPORTS"
+    EXPORTS: Final = "EXPORTS"
+    SCOPES: Final = "SCOPES"
+    USES: Final = "USES"
+    REFERENCES: Final = "REFERENCES"
+
+
+NodeLabel = Literal[
+    "File", "Directory", "Class", "Interface", "Method",
+    "Function", "Variable", "Parameter", "Import", "Export"
+]
+
+RelationshipLabel = Literal[
+    "CONTAINS", "DEFINES", "DECLARES", "HAS_MEMBER", "CALLS", "INSTANTIATES", "EXTENDS",
+    "IMPLEMENTS", "IMPORTS", "EXPORTS", "SCOPES", "USES", "REFERENCES"
+]
+
+
+# Leaf records with a small fixed schema are plain dataclasses: chunkers
+# create one per relationship, and a dataclass constructs several times
+# faster than a model. Pydantic still validates them when they are parsed
+# from JSON as part of a ChunkerOutput.
+@dataclass
+class SourceLocation:
     """Represents a source code location with line and column information."""
-    start_line: int = Field(..., description="Starting line number (1-indexed)")
-    end_line: int = Field(..., description="Ending line number (1-indexed)")
-    start_column: Optional[int] = Field(None, description="Starting column number (0-indexed)")
-    end_column: Optional[int] = Field(None, description="Ending column number (0-indexed)")
+    start_line: Annotated[int, Field(description="Starting line number (1-indexed)")]
+    end_line: Annotated[int, Field(description="Ending line number (1-indexed)")]
+    start_column: Annotated[Optional[int], Field(description="Starting column number (0-indexed)")] = None
+    end_column: Annotated[Optional[int], Field(description="Ending column number (0-indexed)")] = None
 
 
 class CodeNode(BaseModel):
     """Base model for all code nodes in the graph."""
     id: str = Field(..., description="Unique identifier for the node")
-    label: NodeType = Field(..., description="Type/label of the node")
+    label: NodeLabel = Field(..., description="Type/label of the node")
     name: str = Field(..., description="Name of the code element")
     full_name: Optional[str] = Field(None, description="Fully qualified name")
     raw_code: Optional[str] = Field(None, description="Raw source code content")
@@ -61,7 +80,7 @@ class CodeNode(BaseModel):
 
 class FileNode(CodeNode):
     """Represents a source code file."""
-    label: NodeType = Field(default=NodeType.FILE, description="Node type")
+    label: Literal["File"] = Field(default=NodeType.FILE, description="Node type")
     path: str = Field(..., description="File path relative to project root")
     absolute_path: str = Field(..., description="Absolute file path")
     extension: str = Field(..., description="File extension (e.g., .py, .cs, .js)")
@@ -73,14 +92,14 @@ class FileNode(CodeNode):
 
 class DirectoryNode(CodeNode):
     """Represents a directory in the codebase."""
-    label: NodeType = Field(default=NodeType.DIRECTORY, description="Node type")
+    label: Literal["Directory"] = Field(default=NodeType.DIRECTORY, description="Node type")
     path: str = Field(..., description="Directory path relative to project root")
     absolute_path: str = Field(..., description="Absolute directory path")
 
 
 class ClassNode(CodeNode):
     """Represents a class definition."""
-    label: NodeType = Field(default=NodeType.CLASS, description="Node type")
+    label: Literal["Class"] = Field(default=NodeType.CLASS, description="Node type")
     visibility: Optional[str] = Field(None, description="Visibility modifier (public, private, protected)")
     is_abstract: bool = Field(default=False, description="Whether the class is abstract")
     is_static: bool = Field(default=False, description="Whether the class is static")
@@ -91,7 +110,7 @@ class ClassNode(CodeNode):
 
 class InterfaceNode(CodeNode):
     """Represents an interface definition."""
-    label: NodeType = Field(default=NodeType.INTERFACE, description="Node type")
+    label: Literal["Interface"] = Field(default=NodeType.INTERFACE, description="Node type")
     visibility: Optional[str] = Field(None, description="Visibility modifier")
     base_interfaces: List[str] = Field(default_factory=list, description="List of base interface names")
     docstring: Optional[str] = Field(None, description="Interface documentation/docstring")
@@ -99,7 +118,7 @@ class InterfaceNode(CodeNode):
 
 class MethodNode(CodeNode):
     """Represents a method within a class."""
-    label: NodeType = Field(default=NodeType.METHOD, description="Node type")
+    label: Literal["Method"] = Field(default=NodeType.METHOD, description="Node type")
     visibility: Optional[str] = Field(None, description="Visibility modifier")
     is_static: bool = Field(default=False, description="Whether the method is static")
     is_abstract: bool = Field(default=False, description="Whether the method is abstract")
@@ -112,7 +131,7 @@ class MethodNode(CodeNode):
 
 class FunctionNode(CodeNode):
     """Represents a standalone function."""
-    label: NodeType = Field(default=NodeType.FUNCTION, description="Node type")
+    label: Literal["Function"] = Field(default=NodeType.FUNCTION, description="Node type")
     return_type: Optional[str] = Field(None, description="Return type of the function")
     parameters: List[str] = Field(default_factory=list, description="List of parameter names")
     signature: Optional[str] = Field(None, description="Full function signature")
@@ -123,7 +142,7 @@ class FunctionNode(CodeNode):
 
 class VariableNode(CodeNode):
     """Represents a variable declaration."""
-    label: NodeType = Field(default=NodeType.VARIABLE, description="Node type")
+    label: Literal["Variable"] = Field(default=NodeType.VARIABLE, description="Node type")
     type: Optional[str] = Field(None, description="Variable type")
     value: Optional[str] = Field(None, description="Initial value (as string)")
     is_constant: bool = Field(default=False, description="Whether the variable is constant")
@@ -133,7 +152,7 @@ class VariableNode(CodeNode):
 
 class ParameterNode(CodeNode):
     """Represents a function/method parameter."""
-    label: NodeType = Field(default=NodeType.PARAMETER, description="Node type")
+    label: Literal["Parameter"] = Field(default=NodeType.PARAMETER, description="Node type")
     type: Optional[str] = Field(None, description="Parameter type")
     default_value: Optional[str] = Field(None, description="Default value (as string)")
     is_optional: bool = Field(default=False, description="Whether the parameter is optional")
@@ -142,7 +161,7 @@ class ParameterNode(CodeNode):
 
 class ImportNode(CodeNode):
     """Represents an import statement."""
-    label: NodeType = Field(default=NodeType.IMPORT, description="Node type")
+    label: Literal["Import"] = Field(default=NodeType.IMPORT, description="Node type")
     module: str = Field(..., description="Module being imported")
     alias: Optional[str] = Field(None, description="Import alias")
     imported_names: List[str] = Field(default_factory=list, description="Specific names imported")
@@ -151,17 +170,30 @@ class ImportNode(CodeNode):
 
 class ExportNode(CodeNode):
     """Represents an export statement (JavaScript/TypeScript)."""
-    label: NodeType = Field(default=NodeType.EXPORT, description="Node type")
+    label: Literal["Export"] = Field(default=NodeType.EXPORT, description="Node type")
     exported_names: List[str] = Field(default_factory=list, description="Names being exported")
     is_default: bool = Field(default=False, description="Whether it's a default export")
 
 
-class Relationship(BaseModel):
+@dataclass
+class Relationship:
     """Represents a relationship between two nodes in the code graph."""
-    source_id: str = Field(..., description="ID of the source node")
-    target_id: str = Field(..., description="ID of the target node")
-    type: RelationshipType = Field(..., description="Type of relationship")
-    properties: Dict[str, Any] = Field(default_factory=dict, description="Additional relationship properties")
+    source_id: Annotated[str, Field(description="ID of the source node")]
+    target_id: Annotated[str, Field(description="ID of the target node")]
+    type: Annotated[RelationshipLabel, Field(description="Type of relationship")]
+    properties: Annotated[Dict[str, Any], Field(description="Additional relationship properties")] = field(default_factory=dict)
+
+
+# Type aliases for convenience. The label discriminates the union, so each
+# node is validated against its own model only, instead of trying every member
+AnyNode = Annotated[
+    Union[
+        FileNode, DirectoryNode, ClassNode, InterfaceNode,
+        MethodNode, FunctionNode, VariableNode, ParameterNode,
+        ImportNode, ExportNode
+    ],
+    Field(discriminator="label")
+]
 
 
 class ChunkerOutput(BaseModel):
@@ -169,18 +201,35 @@ class ChunkerOutput(BaseModel):
     language: str = Field(..., description="Programming language (python, csharp, javascript, typescript)")
     version: str = Field(default="1.0.0", description="Schema version")
     processed_files: List[str] = Field(default_factory=list, description="List of processed file paths")
-    nodes: List[Union[
-        FileNode, DirectoryNode, ClassNode, InterfaceNode, 
-        MethodNode, FunctionNode, VariableNode, ParameterNode,
-        ImportNode, ExportNode
-    ]] = Field(default_factory=list, description="List of extracted nodes")
+    nodes: List[AnyNode] = Field(default_factory=list, description="List of extracted nodes")
     relationships: List[Relationship] = Field(default_factory=list, description="List of relationships between nodes")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
 
 
-# Type aliases for convenience
-AnyNode = Union[
-    FileNode, DirectoryNode, ClassNode, InterfaceNode,
-    MethodNode, FunctionNode, VariableNode, ParameterNode,
-    ImportNode, ExportNode
-] 
\ No newline at end of file
+# NDJSON record stream (--ndjson): a header line, then one line per node and
+# per relationship, so readers never hold the whole document at once
+class HeaderRecord(BaseModel):
+    """First record of an NDJSON chunker stream: the output minus nodes and relationships."""
+    type: Literal["header"] = "header"
+    language: str = Field(..., description="Programming language (python, csharp, javascript, typescript)")
+    version: str = Field(default="1.0.0", description="Schema version")
+    processed_files: List[str] = Field(default_factory=list, description="List of processed file paths")
+    metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
+
+
+class NodeRecord(BaseModel):
+    """A single node in an NDJSON chunker stream."""
+    type: Literal["node"] = "node"
+    data: AnyNode
+
+
+class RelationshipRecord(BaseModel):
+    """A single relationship in an NDJSON chunker stream."""
+    type: Literal["rel"] = "rel"
+    data: Relationship
+
+
+ChunkerRecord = Annotated[
+    Union[HeaderRecord, NodeRecord, RelationshipRecord],
+    Field(discriminator="type")
+]
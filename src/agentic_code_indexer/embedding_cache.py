@@ -0,0 +1,58 @@
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import numpy as np
+from .sqlite_cache import DEFAULT_CACHE_DIR, DEFAULT_CACHE_MAX_AGE_DAYS, DEFAULT_CACHE_MAX_BYTES, SQLiteCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = "jinaai/jina-embeddings-v2-base-code"
+
+class EmbeddingCache(SQLiteCache):
+    """
+    On-disk cache of embedding vectors keyed by model name and input text.
+
+    Vectors are stored as float32 blobs in a SQLite table, so repeated
+    inputs skip both model loading and inference. Least recently used
+    vectors are evicted past the size and age limits.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = DEFAULT_CACHE_DIR / "query.db",
+        max_bytes: Optional[int] = DEFAULT_CACHE_MAX_BYTES,
+        max_age_days: Optional[float] = DEFAULT_CACHE_MAX_AGE_DAYS
+    ):
+        super().__init__(path, "embeddings", max_bytes, max_age_days)
+
+    @staticmethod
+    def make_key(model_name: str, text: str) -> str:
+        """Build the cache key for a text embedded with the given model."""
+        return hashlib.blake2b(f"{model_name}\0{text}".encode("utf-8"), digest_size=32).hexdigest()
+
+    def get(self, model_name: str, text: str) -> Optional[List[float]]:
+        """Return the cached embedding for a text, or None on a miss."""
+        value = self.get_value(self.make_key(model_name, text))
+        if value is None:
+            return None
+        return np.frombuffer(value, dtype=np.float32).tolist()
+
+    def put(self, model_name: str, text: str, embedding: List[float]):
+        """Store the embedding for a text, replacing any previous entry."""
+        self.put_many(model_name, {text: embedding})
+
+    def get_many(self, model_name: str, texts: List[str]) -> Dict[str, List[float]]:
+        """Return the cached embeddings for whichever of the texts are present, keyed by text."""
+        keys = {self.make_key(model_name, text): text for text in texts}
+        return {
+            keys[key]: np.frombuffer(value, dtype=np.float32).tolist()
+            for key, value in self.get_values(keys).items()
+        }
+
+    def put_many(self, model_name: str, embeddings: Dict[str, List[float]]):
+        """Store several embeddings, keyed by text, in one transaction."""
+        self.put_values({
+            self.make_key(model_name, text): np.asarray(embedding, dtype=np.float32).tobytes()
+            for text, embedding in embeddings.items()
+        })
@@ -1,16 +1,35 @@
 import os
 import hashlib
+import mmap
 import asyncio
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
-from typing import List, Dict, Set, Optional, Tuple
+from typing import List, Dict, Set, Optional, Tuple, Callable, Awaitable
 from dataclasses import dataclass
 from enum import Enum
-import aiofiles
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, Driver
 import logging
 
 logger = logging.getLogger(__name__)
 
+SHEBANG_SNIFF_BYTES = 64
+CHECKSUM_BLOCK_SIZE = 1024 * 1024
+CHECKSUM_MMAP_THRESHOLD = 4 * 1024 * 1024
+
+def has_python_shebang(file_path: str) -> bool:
+    """Check whether a file starts with a Python interpreter line (#!...python)."""
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return False
+    try:
+        head = os.pread(fd, SHEBANG_SNIFF_BYTES, 0)
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+    return head.startswith(b'#!') and b'python' in head.split(b'\n', 1)[0]
+
 class FileStatus(Enum):
     NEW = "new"
     MODIFIED = "modified"
@@ -26,6 +45,16 @@ class FileChange:
     new_checksum: Optional[str] = None
     size: int = 0
     extension: str = ""
+    language: Optional[str] = None
+    old_mtime_ns: Optional[int] = None
+    mtime_ns: Optional[int] = None
+
+@dataclass
+class StoredFile:
+    """What the graph records about a previously indexed file."""
+    checksum: str
+    size: Optional[int] = None
+    mtime_ns: Optional[int] = None
 
 class FileTraversal:
     """Handles recursive directory traversal and file change detection."""
@@ -46,124 +75,345 @@ class FileTraversal:
         '.vs', '.vscode', 'build', 'dist', 'target', '.idea', '.pytest_cache'
     }
     
-    def __init__(self, neo4j_uri: str, neo4j_user: str, neo4j_password: str):
-        self.driver = GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
+    # Precomputed lookups for the per-entry checks in the directory walk
+    _ignore_names = frozenset(IGNORE_PATTERNS)
+    _allowed_dotfiles = frozenset({'.gitignore', '.env'})
+    _supported_suffixes = tuple(SUPPORTED_EXTENSIONS)
+    
+    def __init__(
+        self,
+        neo4j_uri: str,
+        neo4j_user: str,
+        neo4j_password: str,
+        scan_workers: int = 16,
+        sniff_shebangs: bool = False,
+        driver: Optional[Driver] = None
+    ):
+        self._owns_driver = driver is None
+        self.driver = driver or GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
+        self.scan_workers = scan_workers
+        # Opt-in: also pick up extensionless scripts with a Python shebang.
+        # Off by default so the walk never opens files it would skip.
+        self.sniff_shebangs = sniff_shebangs
         
     def close(self):
-        if self.driver:
+        if self.driver and self._owns_driver:
             self.driver.close()
             
     async def calculate_file_checksum(self, file_path: str) -> str:
         """Calculate SHA-256 checksum of a file."""
-        hash_sha256 = hashlib.sha256()
         try:
-            async with aiofiles.open(file_path, 'rb') as f:
-                while chunk := await f.read(8192):
-                    hash_sha256.update(chunk)
-            return hash_sha256.hexdigest()
+            # Hash in a worker thread; hashlib releases the GIL on large buffers
+            return await asyncio.to_thread(self._checksum_file, file_path)
         except Exception as e:
             logger.error(f"Error calculating checksum for {file_path}: {e}")
             return ""
     
+    @staticmethod
+    def _checksum_file(file_path: str) -> str:
+        """Synchronously hash a file: large files through mmap, others in large blocks."""
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size >= CHECKSUM_MMAP_THRESHOLD:
+                # Hash the mapped pages in one call, without copying them
+                # through read buffers
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return hashlib.sha256(mapped).hexdigest()
+            if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+                return hashlib.file_digest(f, 'sha256').hexdigest()
+            hash_sha256 = hashlib.sha256()
+            while chunk := f.read(CHECKSUM_BLOCK_SIZE):
+                hash_sha256.update(chunk)
+            return hash_sha256.hexdigest()
+    
     def should_ignore_path(self, path: Path) -> bool:
         """Check if a path should be ignored."""
         for part in path.parts:
             if part in self.IGNORE_PATTERNS:
                 return True
-        return path.name.startswith('.') and path.name not in {'.gitignore', '.env'}
+        return path.name.startswith('.') and path.name not in self._allowed_dotfiles
     
     def is_supported_file(self, file_path: Path) -> bool:
         """Check if a file is supported."""
-        return file_path.suffix.lower() in self.SUPPORTED_EXTENSIONS
+        if file_path.suffix.lower() in self.SUPPORTED_EXTENSIONS:
+            return True
+        return self.sniff_shebangs and not file_path.suffix and has_python_shebang(str(file_path))
+    
+    def get_language(self, file_path: Path) -> Optional[str]:
+        """Get the chunker language for a supported file."""
+        language = self.SUPPORTED_EXTENSIONS.get(file_path.suffix.lower())
+        if language is None and not file_path.suffix:
+            # Only shebang-sniffed scripts are accepted without an extension
+            return 'python'
+        return language
     
-    async def scan_directory(self, directory_path: str) -> List[Path]:
-        """Recursively scan directory for supported files."""
+    def _scan_single_directory(self, dir_path: str) -> Tuple[List[str], List[Path]]:
+        """List one directory, returning its subdirectories and supported files."""
+        subdirectories = []
+        files = []
+        # Bound locally: the checks below run for every directory entry.
+        # Parents were already checked, so only the entry's own name matters.
+        ignore_names = self._ignore_names
+        allowed_dotfiles = self._allowed_dotfiles
+        supported_suffixes = self._supported_suffixes
+        try:
+            # DirEntry carries the d_type from the directory listing, so
+            # is_dir()/is_file() need no extra stat call per entry.
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name in ignore_names or (name[0] == '.' and name not in allowed_dotfiles):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirectories.append(entry.path)
+                        elif name.lower().endswith(supported_suffixes):
+                            if entry.is_file():
+                                files.append(Path(entry.path))
+                        elif self.sniff_shebangs and '.' not in name and entry.is_file():
+                            if has_python_shebang(entry.path):
+                                files.append(Path(entry.path))
+                    except OSError as e:
+                        logger.warning(f"Cannot access {entry.path}: {e}")
+        except (PermissionError, OSError) as e:
+            logger.warning(f"Cannot access {dir_path}: {e}")
+        return subdirectories, files
+    
+    async def scan_directory(
+        self,
+        directory_path: str,
+        on_files: Optional[Callable[[List[Path]], None]] = None
+    ) -> List[Path]:
+        """
+        Recursively scan directory for supported files.
+        
+        on_files, if given, is called from the walking thread with each
+        directory's supported files as soon as that directory is listed.
+        """
+        # The walk is blocking I/O, so keep it off the event loop
+        return await asyncio.to_thread(self._scan_directory_sync, directory_path, on_files)
+    
+    def _scan_directory_sync(
+        self,
+        directory_path: str,
+        on_files: Optional[Callable[[List[Path]], None]] = None
+    ) -> List[Path]:
+        """Blocking implementation of scan_directory."""
         directory = Path(directory_path)
         if not directory.exists():
             raise FileNotFoundError(f"Directory does not exist: {directory_path}")
             
         supported_files = []
-        
-        def _scan_recursive(current_path: Path):
-            try:
-                if self.should_ignore_path(current_path):
-                    return
-                    
-                if current_path.is_file():
-                    if self.is_supported_file(current_path):
-                        supported_files.append(current_path)
-                elif current_path.is_dir():
-                    for child in current_path.iterdir():
-                        _scan_recursive(child)
-            except (PermissionError, OSError) as e:
-                logger.warning(f"Cannot access {current_path}: {e}")
-        
-        _scan_recursive(directory)
+
+        if self.should_ignore_path(directory):
+            return supported_files
+        if directory.is_file():
+            if self.is_supported_file(directory):
+                supported_files.append(directory)
+                if on_files:
+                    on_files([directory])
+            return supported_files
+
+        # Directory listings are I/O bound, so keep several os.scandir calls in
+        # flight: every discovered subdirectory becomes its own pool task.
+        with ThreadPoolExecutor(max_workers=self.scan_workers) as pool:
+            pending = {pool.submit(self._scan_single_directory, str(directory))}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    subdirectories, files = future.result()
+                    supported_files.extend(files)
+                    if on_files and files:
+                        on_files(files)
+                    for subdirectory in subdirectories:
+                        pending.add(pool.submit(self._scan_single_directory, subdirectory))
+
+        supported_files.sort()
         logger.info(f"Found {len(supported_files)} supported files")
         return supported_files
     
-    def get_stored_checksums(self) -> Dict[str, str]:
-        """Get stored file checksums from Neo4j."""
-        checksums = {}
+    def get_stored_files(self, scope: Optional[str] = None) -> Dict[str, StoredFile]:
+        """
+        Get stored file checksums, sizes and modification times from Neo4j.
+        
+        With a scope (a project-relative file or directory path), only files
+        at or under it are returned; the filter uses the File.path index.
+        """
+        stored_files = {}
         with self.driver.session() as session:
             try:
-                result = session.run("MATCH (f:File) RETURN f.path as path, f.checksum as checksum")
+                result = session.run("""
+                    MATCH (f:File)
+                    WHERE $scope IS NULL OR f.path = $scope OR f.path STARTS WITH $prefix
+                    RETURN f.path as path, f.checksum as checksum, f.size as size, f.mtime_ns as mtime_ns
+                """, scope=scope, prefix=scope + os.sep if scope else None)
                 for record in result:
                     if record["path"] and record["checksum"]:
-                        checksums[record["path"]] = record["checksum"]
+                        stored_files[record["path"]] = StoredFile(
+                            record["checksum"], record["size"], record["mtime_ns"]
+                        )
             except Exception as e:
                 logger.error(f"Error retrieving checksums: {e}")
-        return checksums
+        return stored_files
     
-    async def detect_file_changes(self, directory_path: str, project_root: str) -> List[FileChange]:
-        """Detect file changes by comparing with stored checksums."""
+    def record_file_mtimes(self, file_changes: List[FileChange]) -> int:
+        """
+        Store the modification times of files that were hashed this run, so
+        the next run can skip hashing them while their mtime and size hold.
+        
+        A time is only stored on File nodes whose checksum matches the one
+        computed for it, so a file that failed to ingest is hashed again.
+        """
+        rows = [
+            {"path": fc.path, "checksum": fc.new_checksum, "mtime_ns": fc.mtime_ns}
+            for fc in file_changes
+            if fc.status != FileStatus.DELETED
+            and fc.mtime_ns is not None
+            and fc.mtime_ns != fc.old_mtime_ns
+        ]
+        if not rows:
+            return 0
+        
+        query = """
+        UNWIND $rows AS row
+        MATCH (f:File {path: row.path})
+        WHERE f.checksum = row.checksum
+        SET f.mtime_ns = row.mtime_ns
+        RETURN count(f) as updated
+        """
+        with self.driver.session() as session:
+            try:
+                record = session.run(query, rows=rows).single()
+                return record["updated"] if record else 0
+            except Exception as e:
+                logger.error(f"Error recording file modification times: {e}")
+                return 0
+    
+    @classmethod
+    def _stat_and_checksum(cls, file_path: Path, stored: Optional[StoredFile]) -> Tuple[os.stat_result, str]:
+        """
+        Return the stat result and SHA-256 checksum of a file. The stored
+        checksum is reused without reading the file when its modification
+        time and size are unchanged since it was hashed.
+        """
+        file_stat = file_path.stat()
+        if (
+            stored is not None
+            and stored.mtime_ns == file_stat.st_mtime_ns
+            and stored.size == file_stat.st_size
+        ):
+            return file_stat, stored.checksum
+        return file_stat, cls._checksum_file(str(file_path))
+    
+    async def _build_file_change(
+        self,
+        file_path: Path,
+        relative_path: str,
+        stored_files: Awaitable[Dict[str, StoredFile]],
+        semaphore: asyncio.Semaphore
+    ) -> Optional[FileChange]:
+        """Checksum a single file and classify it against the stored checksum."""
+        stored = (await stored_files).get(relative_path)
+        async with semaphore:
+            try:
+                # Stat and hash in the same worker thread so neither blocks the loop
+                file_stat, new_checksum = await asyncio.to_thread(
+                    self._stat_and_checksum, file_path, stored
+                )
+            except Exception as e:
+                logger.error(f"Error processing {file_path}: {e}")
+                return None
+        
+        if stored is None:
+            status = FileStatus.NEW
+        elif stored.checksum != new_checksum:
+            status = FileStatus.MODIFIED
+        else:
+            status = FileStatus.UNCHANGED
+        
+        return FileChange(
+            path=relative_path,
+            absolute_path=str(file_path),
+            status=status,
+            old_checksum=stored.checksum if stored else None,
+            new_checksum=new_checksum,
+            size=file_stat.st_size,
+            extension=file_path.suffix,
+            language=self.get_language(file_path),
+            old_mtime_ns=stored.mtime_ns if stored else None,
+            mtime_ns=file_stat.st_mtime_ns
+        )
+    
+    async def detect_file_changes(self, directory_path: str, project_root: str, max_concurrent: Optional[int] = None) -> List[FileChange]:
+        """
+        Detect file changes by comparing with stored checksums.
+        
+        Files are checksummed in worker threads, at most max_concurrent at a
+        time; by default that scales with the CPU count, since hashlib
+        releases the GIL while hashing. Files whose modification time and
+        size match what was recorded (see record_file_mtimes) are not read.
+        """
+        if max_concurrent is None:
+            max_concurrent = min(32, (os.cpu_count() or 1) * 4)
         project_root_path = Path(project_root)
-        current_files = await self.scan_directory(directory_path)
-        stored_checksums = self.get_stored_checksums()
+        # Only files under the scanned directory can be found deleted, so
+        # only those are fetched from the graph
+        try:
+            scope = str(Path(directory_path).relative_to(project_root_path))
+        except ValueError:
+            scope = None
+        if scope == '.':
+            scope = None
         
-        file_changes = []
+        # Fetch stored checksums while the tree is walked; the Neo4j driver
+        # is synchronous, so its round trip runs in a worker thread
+        stored_files_task = asyncio.ensure_future(asyncio.to_thread(self.get_stored_files, scope))
+        
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(max_concurrent)
         current_paths = set()
+        pending = []
         
-        # Process current files
-        for file_path in current_files:
-            try:
-                relative_path = str(file_path.relative_to(project_root_path))
+        def start_checksums(files: List[Path]) -> None:
+            # Checksum current files concurrently, bounded by max_concurrent
+            for file_path in files:
+                try:
+                    relative_path = str(file_path.relative_to(project_root_path))
+                except ValueError as e:
+                    logger.error(f"Error processing {file_path}: {e}")
+                    continue
                 current_paths.add(relative_path)
-                
-                file_stat = file_path.stat()
-                new_checksum = await self.calculate_file_checksum(str(file_path))
-                
-                if relative_path not in stored_checksums:
-                    status = FileStatus.NEW
-                    old_checksum = None
-                elif stored_checksums[relative_path] != new_checksum:
-                    status = FileStatus.MODIFIED
-                    old_checksum = stored_checksums[relative_path]
-                else:
-                    status = FileStatus.UNCHANGED
-                    old_checksum = stored_checksums[relative_path]
-                
-                file_changes.append(FileChange(
-                    path=relative_path,
-                    absolute_path=str(file_path),
-                    status=status,
-                    old_checksum=old_checksum,
-                    new_checksum=new_checksum,
-                    size=file_stat.st_size,
-                    extension=file_path.suffix
+                pending.append(asyncio.ensure_future(
+                    self._build_file_change(file_path, relative_path, stored_files_task, semaphore)
                 ))
-                
-            except Exception as e:
-                logger.error(f"Error processing {file_path}: {e}")
+        
+        try:
+            # Hashing starts as each directory is listed, overlapping the
+            # rest of the walk. The walking thread queues these callbacks
+            # before its own result, so every file has been started by the
+            # time scan_directory returns.
+            await self.scan_directory(
+                directory_path,
+                on_files=lambda files: loop.call_soon_threadsafe(start_checksums, files)
+            )
+            results = await asyncio.gather(*pending)
+            stored_files = await stored_files_task
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            stored_files_task.cancel()
+            raise
+        
+        # Keep the path order of the sorted scan, whatever order hashes finished in
+        file_changes = sorted((fc for fc in results if fc is not None), key=lambda fc: fc.path)
         
         # Find deleted files
-        for stored_path in stored_checksums.keys():
+        for stored_path in stored_files.keys():
             if stored_path not in current_paths:
                 file_changes.append(FileChange(
                     path=stored_path,
                     absolute_path="",
                     status=FileStatus.DELETED,
-                    old_checksum=stored_checksums[stored_path]
+                    old_checksum=stored_files[stored_path].checksum
                 ))
         
         return file_changes
@@ -1,7 +1,8 @@
 import asyncio
-from typing import List, Dict, Any, Optional, Set
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Set, Tuple
 from dataclasses import dataclass
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, Driver
 import logging
 from .common_data_format import ChunkerOutput, BaseNode, Relationship
 
@@ -23,13 +24,22 @@ class GraphIngestion:
     using batched operations and idempotent writes.
     """
     
-    def __init__(self, neo4j_uri: str, neo4j_user: str, neo4j_password: str, batch_size: int = 1000):
-        self.driver = GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
+    def __init__(
+        self,
+        neo4j_uri: str,
+        neo4j_user: str,
+        neo4j_password: str,
+        batch_size: int = 1000,
+        driver: Optional[Driver] = None
+    ):
+        self._owns_driver = driver is None
+        self.driver = driver or GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
         self.batch_size = batch_size
         
     def close(self):
         """Close the Neo4j driver connection."""
-        if self.driver:
+        # A driver injected by the caller is shared, so the caller closes it
+        if self.driver and self._owns_driver:
             self.driver.close()
     
     def _prepare_node_for_cypher(self, node: BaseNode) -> Dict[str, Any]:
@@ -123,6 +133,9 @@ class GraphIngestion:
                 stats.nodes_updated += node_stats.nodes_updated
                 stats.errors += node_stats.errors
             
+            # Relationship endpoints are matched by label so the id indexes apply
+            node_labels = {node.id: self._get_node_label(node) for node in chunker_output.nodes}
+            
             # Process relationships in batches
             rel_batches = [
                 chunker_output.relationships[i:i + self.batch_size]
@@ -130,7 +143,7 @@ class GraphIngestion:
             ]
             
             for batch in rel_batches:
-                rel_stats = await self._ingest_relationships_batch(batch)
+                rel_stats = await self._ingest_relationships_batch(batch, node_labels)
                 stats.relationships_created += rel_stats.relationships_created
                 stats.relationships_updated += rel_stats.relationships_updated
                 stats.errors += rel_stats.errors
@@ -161,102 +174,161 @@ class GraphIngestion:
                 nodes_by_label[label] = []
             nodes_by_label[label].append(self._prepare_node_for_cypher(node))
         
-        # Process each label group
-        for label, node_data in nodes_by_label.items():
-            try:
-                # Build dynamic MERGE query based on node properties
-                query = f"""
-                UNWIND $nodes as node_data
-                MERGE (n:{label} {{id: node_data.id}})
-                SET n += node_data
-                RETURN COUNT(n) as count
-                """
-                
-                with self.driver.session() as session:
-                    result = session.run(query, nodes=node_data)
-                    record = result.single()
-                    if record:
-                        stats.nodes_created += record["count"]
-                        
-                logger.debug(f"Processed {len(node_data)} {label} nodes")
-                
-            except Exception as e:
-                logger.error(f"Error ingesting {label} nodes: {e}")
-                stats.errors += len(node_data)
+        # Write every label group in one transaction, so the batch costs a
+        # single commit rather than one per label
+        statements = [
+            (self._node_merge_query(label), {"nodes": node_data})
+            for label, node_data in nodes_by_label.items()
+        ]
+        try:
+            with self.driver.session() as session:
+                stats.nodes_created += session.execute_write(self._run_counted, statements)
+            
+            logger.debug(f"Processed {len(nodes)} nodes in {len(statements)} label groups")
+            
+        except Exception as e:
+            logger.error(f"Error ingesting batch of {len(nodes)} nodes: {e}")
+            stats.errors += len(nodes)
         
         return stats
     
-    async def _ingest_relationships_batch(self, relationships: List[Relationship]) -> IngestionStats:
-        """Ingest a batch of relationships using UNWIND and MERGE operations."""
+    @staticmethod
+    def _run_counted(tx, statements: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """Transaction function running queries that each return a count; returns their sum."""
+        total = 0
+        for query, parameters in statements:
+            record = tx.run(query, parameters).single()
+            if record:
+                total += record["count"]
+        return total
+    
+    # Query texts are built once per label/type combination and reused for
+    # every batch; Neo4j caches plans by query text, so identical strings
+    # also skip re-planning server-side
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _node_merge_query(label: str) -> str:
+        """UNWIND MERGE query for nodes with the given label."""
+        return f"""
+        UNWIND $nodes as node_data
+        MERGE (n:{label} {{id: node_data.id}})
+        SET n += node_data
+        RETURN COUNT(n) as count
+        """
+    
+    @staticmethod
+    def _node_pattern(variable: str, label: Optional[str]) -> str:
+        """Cypher node pattern for a relationship endpoint, labelled when the label is known."""
+        return f"{variable}:{label}" if label else variable
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _relationship_query(
+        source_label: Optional[str],
+        target_label: Optional[str],
+        rel_type: Optional[str] = None
+    ) -> str:
+        """
+        UNWIND query creating relationships between labelled endpoints: via
+        apoc.create.relationship when rel_type is None, else a MERGE of that type.
+        """
+        source = GraphIngestion._node_pattern("source", source_label)
+        target = GraphIngestion._node_pattern("target", target_label)
+        if rel_type is None:
+            return f"""
+            UNWIND $relationships as rel_data
+            MATCH ({source} {{id: rel_data.source_id}})
+            MATCH ({target} {{id: rel_data.target_id}})
+            CALL apoc.create.relationship(source, rel_data.type, rel_data.properties, target)
+            YIELD rel
+            RETURN COUNT(rel) as count
+            """
+        return f"""
+        UNWIND $relationships as rel_data
+        MATCH ({source} {{id: rel_data.source_id}})
+        MATCH ({target} {{id: rel_data.target_id}})
+        MERGE (source)-[r:{rel_type}]->(target)
+        SET r += rel_data.properties
+        RETURN COUNT(r) as count
+        """
+    
+    async def _ingest_relationships_batch(
+        self,
+        relationships: List[Relationship],
+        node_labels: Optional[Dict[str, str]] = None
+    ) -> IngestionStats:
+        """
+        Ingest a batch of relationships using UNWIND and MERGE operations.
+        
+        Relationships are grouped by the labels of their endpoints (looked up
+        in node_labels) so each group MATCHes with labelled patterns, which
+        lets the planner seek the per-label id index instead of scanning all
+        nodes. Endpoints outside node_labels are matched without a label.
+        """
         stats = IngestionStats()
         
         if not relationships:
             return stats
         
-        # Prepare relationship data
-        rel_data = []
+        node_labels = node_labels or {}
+        
+        # Prepare relationship data, grouped by endpoint labels
+        rels_by_labels: Dict[Tuple[Optional[str], Optional[str]], List[Dict[str, Any]]] = {}
         for rel in relationships:
-            rel_dict = {
+            labels = (node_labels.get(rel.source_id), node_labels.get(rel.target_id))
+            rels_by_labels.setdefault(labels, []).append({
                 "source_id": rel.source_id,
                 "target_id": rel.target_id,
                 "type": rel.type,
                 "properties": rel.properties or {}
-            }
-            rel_data.append(rel_dict)
+            })
         
+        # Use dynamic relationship creation based on type, with all groups
+        # in one transaction; if it fails nothing was written, so the
+        # fallback cannot duplicate relationships
+        statements = [
+            (self._relationship_query(source_label, target_label), {"relationships": rel_data})
+            for (source_label, target_label), rel_data in rels_by_labels.items()
+        ]
         try:
-            # Use dynamic relationship creation based on type
-            query = """
-            UNWIND $relationships as rel_data
-            MATCH (source {id: rel_data.source_id})
-            MATCH (target {id: rel_data.target_id})
-            CALL apoc.create.relationship(source, rel_data.type, rel_data.properties, target)
-            YIELD rel
-            RETURN COUNT(rel) as count
-            """
-            
             with self.driver.session() as session:
-                result = session.run(query, relationships=rel_data)
-                record = result.single()
-                if record:
-                    stats.relationships_created += record["count"]
+                stats.relationships_created += session.execute_write(self._run_counted, statements)
                     
-            logger.debug(f"Processed {len(rel_data)} relationships")
+            logger.debug(f"Processed {len(relationships)} relationships")
             
         except Exception as e:
             # Fallback to simpler approach if APOC is not available
             logger.warning(f"APOC not available, using fallback method: {e}")
-            stats = await self._ingest_relationships_fallback(relationships)
+            stats = await self._ingest_relationships_fallback(relationships, node_labels)
         
         return stats
     
-    async def _ingest_relationships_fallback(self, relationships: List[Relationship]) -> IngestionStats:
+    async def _ingest_relationships_fallback(
+        self,
+        relationships: List[Relationship],
+        node_labels: Optional[Dict[str, str]] = None
+    ) -> IngestionStats:
         """Fallback method for relationship ingestion without APOC."""
         stats = IngestionStats()
+        node_labels = node_labels or {}
         
-        # Group relationships by type for efficiency
+        # Group relationships by type and endpoint labels for efficiency
         rels_by_type = {}
         for rel in relationships:
-            rel_type = rel.type
-            if rel_type not in rels_by_type:
-                rels_by_type[rel_type] = []
-            rels_by_type[rel_type].append({
+            key = (rel.type, node_labels.get(rel.source_id), node_labels.get(rel.target_id))
+            if key not in rels_by_type:
+                rels_by_type[key] = []
+            rels_by_type[key].append({
                 "source_id": rel.source_id,
                 "target_id": rel.target_id,
                 "properties": rel.properties or {}
             })
         
         # Process each relationship type
-        for rel_type, rel_data in rels_by_type.items():
+        for (rel_type, source_label, target_label), rel_data in rels_by_type.items():
             try:
-                query = f"""
-                UNWIND $relationships as rel_data
-                MATCH (source {{id: rel_data.source_id}})
-                MATCH (target {{id: rel_data.target_id}})
-                MERGE (source)-[r:{rel_type}]->(target)
-                SET r += rel_data.properties
-                RETURN COUNT(r) as count
-                """
+                query = self._relationship_query(source_label, target_label, rel_type)
                 
                 with self.driver.session() as session:
                     result = session.run(query, relationships=rel_data)
@@ -275,27 +347,39 @@ class GraphIngestion:
         Delete a file node and all its associated nodes and relationships.
         Returns the number of nodes deleted.
         """
-        try:
-            query = """
-            MATCH (f:File {path: $file_path})
-            OPTIONAL MATCH (f)-[*]-(n)
-            WITH f, collect(DISTINCT n) as related_nodes
-            DETACH DELETE f
-            FOREACH (node in related_nodes | DETACH DELETE node)
-            RETURN count(f) + size(related_nodes) as deleted_count
-            """
-            
-            with self.driver.session() as session:
-                result = session.run(query, file_path=file_path)
-                record = result.single()
-                deleted_count = record["deleted_count"] if record else 0
+        return await self.delete_file_subgraphs([file_path])
+    
+    async def delete_file_subgraphs(self, file_paths: List[str]) -> int:
+        """
+        Delete several files' subgraphs, batch_size files per UNWIND query
+        and transaction instead of one round trip per file.
+        Returns the number of nodes deleted.
+        """
+        query = """
+        UNWIND $file_paths AS file_path
+        MATCH (f:File {path: file_path})
+        OPTIONAL MATCH (f)-[*]-(n)
+        WITH f, collect(DISTINCT n) as related_nodes
+        DETACH DELETE f
+        FOREACH (node in related_nodes | DETACH DELETE node)
+        RETURN sum(1 + size(related_nodes)) as deleted_count
+        """
+        
+        total_deleted = 0
+        for i in range(0, len(file_paths), self.batch_size):
+            batch = file_paths[i:i + self.batch_size]
+            try:
+                with self.driver.session() as session:
+                    record = session.run(query, file_paths=batch).single()
+                    deleted_count = (record["deleted_count"] or 0) if record else 0
                 
-            logger.info(f"Deleted file subgraph for {file_path}: {deleted_count} nodes")
-            return deleted_count
-            
-        except Exception as e:
-            logger.error(f"Error deleting file subgraph {file_path}: {e}")
-            return 0
+                logger.info(f"Deleted subgraphs for {len(batch)} files: {deleted_count} nodes")
+                total_deleted += deleted_count
+                
+            except Exception as e:
+                logger.error(f"Error deleting subgraphs for {len(batch)} files: {e}")
+        
+        return total_deleted
     
     async def ingest_multiple_outputs(self, chunker_outputs: List[ChunkerOutput]) -> IngestionStats:
         """
@@ -306,14 +390,21 @@ class GraphIngestion:
         
         # Combine all nodes and relationships
         all_nodes = []
-        all_relationships = []
         all_processed_files = []
         
+        # The same edge is often reported by more than one output; keep one
+        # entry per (source, target, type) so it is only sent to Neo4j once.
+        # Later duplicates win, matching MERGE + SET semantics.
+        unique_relationships = {}
+        
         for output in chunker_outputs:
             all_nodes.extend(output.nodes)
-            all_relationships.extend(output.relationships)
+            for rel in output.relationships:
+                unique_relationships[(rel.source_id, rel.target_id, rel.type)] = rel
             all_processed_files.extend(output.processed_files)
         
+        all_relationships = list(unique_relationships.values())
+        
         # Create a combined output for efficient processing
         combined_output = ChunkerOutput(
             language="multi",
@@ -330,50 +421,54 @@ class GraphIngestion:
         stats = await self.ingest_chunker_output(combined_output)
         return stats
     
-    def get_ingestion_summary(self) -> Dict[str, Any]:
+    def _read_query(self, query: str) -> List[Dict[str, Any]]:
+        """Run a read query in its own session and return the records as dicts."""
+        with self.driver.session() as session:
+            return session.run(query).data()
+    
+    async def get_ingestion_summary(self) -> Dict[str, Any]:
         """Get summary statistics about the current database state."""
         summary = {}
         
-        with self.driver.session() as session:
-            try:
+        try:
+            # The three counts are independent full scans, so issue them
+            # concurrently; the driver is synchronous, so each runs in a
+            # worker thread with its own session
+            node_records, rel_records, file_records = await asyncio.gather(
                 # Node counts by type
-                result = session.run("""
+                asyncio.to_thread(self._read_query, """
                 MATCH (n)
                 RETURN labels(n)[0] as label, count(n) as count
                 ORDER BY count DESC
-                """)
-                
-                node_counts = {record["label"]: record["count"] for record in result}
-                summary["node_counts"] = node_counts
-                
+                """),
                 # Relationship counts by type
-                result = session.run("""
+                asyncio.to_thread(self._read_query, """
                 MATCH ()-[r]->()
                 RETURN type(r) as rel_type, count(r) as count
                 ORDER BY count DESC
-                """)
-                
-                rel_counts = {record["rel_type"]: record["count"] for record in result}
-                summary["relationship_counts"] = rel_counts
-                
+                """),
                 # File statistics
-                result = session.run("""
+                asyncio.to_thread(self._read_query, """
                 MATCH (f:File)
                 RETURN count(f) as file_count,
                        collect(DISTINCT f.language) as languages,
                        sum(f.size) as total_size
                 """)
-                
-                record = result.single()
-                if record:
-                    summary["files"] = {
-                        "count": record["file_count"],
-                        "languages": record["languages"],
-                        "total_size": record["total_size"]
-                    }
-                
-            except Exception as e:
-                logger.error(f"Error getting ingestion summary: {e}")
+            )
+            
+            summary["node_counts"] = {record["label"]: record["count"] for record in node_records}
+            summary["relationship_counts"] = {record["rel_type"]: record["count"] for record in rel_records}
+            
+            if file_records:
+                record = file_records[0]
+                summary["files"] = {
+                    "count": record["file_count"],
+                    "languages": record["languages"],
+                    "total_size": record["total_size"]
+                }
+            
+        except Exception as e:
+            logger.error(f"Error getting ingestion summary: {e}")
         
         return summary
 
@@ -388,7 +483,7 @@ async def main():
     
     try:
         # Get current state summary
-        summary = ingestion.get_ingestion_summary()
+        summary = await ingestion.get_ingestion_summary()
         print("Database summary:", summary)
         
     finally:
@@ -3,7 +3,7 @@ from typing import List, Dict, Set, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import logging
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, Driver
 from .vector_search import SearchResult
 
 logger = logging.getLogger(__name__)
@@ -51,8 +51,15 @@ class GraphTraversalEngine:
     relationships to gather context around search results.
     """
     
-    def __init__(self, neo4j_uri: str, neo4j_user: str, neo4j_password: str):
-        self.driver = GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
+    def __init__(
+        self,
+        neo4j_uri: str,
+        neo4j_user: str,
+        neo4j_password: str,
+        driver: Optional[Driver] = None
+    ):
+        self._owns_driver = driver is None
+        self.driver = driver or GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
         self._init_traversal_rules()
     
     def _init_traversal_rules(self):
@@ -123,7 +130,8 @@ class GraphTraversalEngine:
     
     def close(self):
         """Close database connection."""
-        if self.driver:
+        # A driver injected by the caller is shared, so the caller closes it
+        if self.driver and self._owns_driver:
             self.driver.close()
     
     async def expand_context(
@@ -1,15 +1,27 @@
 import asyncio
+import heapq
 import re
-from typing import List, Dict, Set, Any, Optional, Tuple
+from typing import AsyncIterator, List, Dict, Set, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 import logging
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, Driver
 from .vector_search import VectorSearchEngine, SearchResult, VectorSearchConfig
+from .embedding_cache import EmbeddingCache
 from .graph_traversal import GraphTraversalEngine, GraphContext, TraversalDirection
 
 logger = logging.getLogger(__name__)
 
+# Query parsing patterns, compiled once at import instead of on every query
+ENTITY_PATTERNS = [
+    re.compile(r'\b[A-Z][a-zA-Z]*(?:Service|Controller|Repository|Manager|Handler|Factory|Builder|Helper|Util|Utils)\b'),
+    re.compile(r'\b[A-Z][a-zA-Z]*(?:Entity|Model|DTO|Request|Response|Config|Configuration)\b'),
+    re.compile(r'\b[A-Z][a-zA-Z]*(?:Exception|Error)\b'),
+    re.compile(r'\b[a-z][a-zA-Z]*(?:Api|HTTP|Rest|GraphQL)\b'),
+    re.compile(r'\b[A-Z][a-zA-Z0-9_]*\b')  # General PascalCase identifiers
+]
+NON_WORD_RE = re.compile(r'[^\w]')
+
 class QueryType(Enum):
     """Types of search queries."""
     SEMANTIC = "semantic"  # Natural language semantic search
@@ -75,13 +87,7 @@ class QueryParser:
         }
         
         # Common entity name patterns
-        self.entity_patterns = [
-            r'\b[A-Z][a-zA-Z]*(?:Service|Controller|Repository|Manager|Handler|Factory|Builder|Helper|Util|Utils)\b',
-            r'\b[A-Z][a-zA-Z]*(?:Entity|Model|DTO|Request|Response|Config|Configuration)\b',
-            r'\b[A-Z][a-zA-Z]*(?:Exception|Error)\b',
-            r'\b[a-z][a-zA-Z]*(?:Api|HTTP|Rest|GraphQL)\b',
-            r'\b[A-Z][a-zA-Z0-9_]*\b'  # General PascalCase identifiers
-        ]
+        self.entity_patterns = ENTITY_PATTERNS
         
         # Node type keywords
         self.node_type_mapping = {
@@ -107,7 +113,7 @@ class QueryParser:
         # Extract entity names (capitalized terms, class names, etc.)
         entity_names = []
         for pattern in self.entity_patterns:
-            matches = re.findall(pattern, query)
+            matches = pattern.findall(query)
             entity_names.extend(matches)
         
         # Extract programming terms
@@ -125,7 +131,7 @@ class QueryParser:
         # Extract semantic terms (non-entity, non-programming words)
         semantic_terms = []
         for word in words:
-            word_clean = re.sub(r'[^\w]', '', word.lower())
+            word_clean = NON_WORD_RE.sub('', word.lower())
             if (word_clean not in self.programming_terms and 
                 word_clean not in self.node_type_mapping and
                 len(word_clean) > 2):
@@ -190,18 +196,33 @@ class HybridSearchEngine:
     and graph traversal for comprehensive code search.
     """
     
-    def __init__(self, neo4j_uri: str, neo4j_user: str, neo4j_password: str):
-        self.driver = GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
-        self.vector_engine = VectorSearchEngine(neo4j_uri, neo4j_user, neo4j_password)
-        self.graph_engine = GraphTraversalEngine(neo4j_uri, neo4j_user, neo4j_password)
+    def __init__(
+        self,
+        neo4j_uri: str,
+        neo4j_user: str,
+        neo4j_password: str,
+        driver: Optional[Driver] = None,
+        query_cache: Optional[EmbeddingCache] = None
+    ):
+        self._owns_driver = driver is None
+        self.driver = driver or GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
+        self.query_cache = query_cache
+        # Both engines run on this driver rather than opening pools of their own
+        self.vector_engine = VectorSearchEngine(
+            neo4j_uri, neo4j_user, neo4j_password, driver=self.driver, query_cache=query_cache
+        )
+        self.graph_engine = GraphTraversalEngine(neo4j_uri, neo4j_user, neo4j_password, driver=self.driver)
         self.query_parser = QueryParser()
     
     def close(self):
         """Close all database connections."""
-        if self.driver:
+        # A driver injected by the caller is shared, so the caller closes it
+        if self.driver and self._owns_driver:
             self.driver.close()
         self.vector_engine.close()
         self.graph_engine.close()
+        if self.query_cache is not None:
+            self.query_cache.close()
     
     async def search(
         self, 
@@ -218,12 +239,33 @@ class HybridSearchEngine:
         Returns:
             List of hybrid search results with scoring and context
         """
+        return [result async for result in self.search_iter(query, config)]
+    
+    async def search_iter(
+        self, 
+        query: str, 
+        config: HybridSearchConfig = None
+    ) -> AsyncIterator[HybridSearchResult]:
+        """
+        Perform hybrid search, yielding results one at a time in rank order.
+        
+        Ranking needs every candidate's score, so the underlying searches
+        still complete first; consumers can render each result as it is
+        yielded and stop iterating early without building the full list.
+        
+        Args:
+            query: Natural language search query
+            config: Search configuration options
+            
+        Yields:
+            Hybrid search results, best first, up to max_total_results
+        """
         if config is None:
             config = HybridSearchConfig()
         
         # Parse query intent
         intent = self.query_parser.parse_query(query)
-        logger.info(f"Query intent: {intent.query_type.value}, confidence: {intent.confidence:.2f}")
+        logger.debug(f"Query intent: {intent.query_type.value}, confidence: {intent.confidence:.2f}")
         
         # Perform different search strategies based on intent
         all_results = []
@@ -245,9 +287,9 @@ class HybridSearchEngine:
         # Deduplicate and score results
         final_results = self._merge_and_score_results(all_results, intent, config)
         
-        # Sort by hybrid score and limit results
-        final_results.sort(key=lambda x: x.hybrid_score, reverse=True)
-        return final_results[:config.max_total_results]
+        # Only the best max_total_results are ranked; the rest are never sorted
+        for result in heapq.nlargest(config.max_total_results, final_results, key=lambda x: x.hybrid_score):
+            yield result
     
     async def _semantic_search(
         self, 
@@ -319,7 +361,7 @@ class HybridSearchEngine:
             n.full_name as full_name,
             labels(n)[0] as node_type,
             n.generated_summary as summary,
-            n.raw_code as raw_code,
+            CASE WHEN $include_raw_code THEN n.raw_code END as raw_code,
             n.start_line as start_line,
             n.end_line as end_line,
             n.path as path,
@@ -340,7 +382,8 @@ class HybridSearchEngine:
             result = session.run(
                 query, 
                 name=name, 
-                limit=config.max_entity_results
+                limit=config.max_entity_results,
+                include_raw_code=config.include_source_code
             )
             
             for record in result:
@@ -365,7 +408,7 @@ class HybridSearchEngine:
                     full_name=record["full_name"],
                     node_type=record["node_type"],
                     summary=record["summary"] or "",
-                    raw_code=record["raw_code"] if config.include_source_code else None,
+                    raw_code=record["raw_code"],
                     similarity_score=record["match_score"],
                     location=location,
                     metadata=metadata
@@ -445,24 +488,21 @@ class HybridSearchEngine:
         config: HybridSearchConfig
     ) -> List[HybridSearchResult]:
         """Merge duplicate results and compute hybrid scores."""
-        # Deduplicate by node_id
-        seen_nodes = set()
-        unique_results = []
+        # Deduplicate by node_id, keeping first-seen order
+        results_by_node: Dict[str, HybridSearchResult] = {}
         
         for result in all_results:
             node_id = result.search_result.node_id
-            if node_id not in seen_nodes:
-                seen_nodes.add(node_id)
-                unique_results.append(result)
+            existing = results_by_node.get(node_id)
+            if existing is None:
+                results_by_node[node_id] = result
             else:
-                # Find existing result and merge scores
-                for existing in unique_results:
-                    if existing.search_result.node_id == node_id:
-                        # Take the higher score and combine match types
-                        if result.hybrid_score > existing.hybrid_score:
-                            existing.hybrid_score = result.hybrid_score
-                        existing.match_type = f"{existing.match_type}+{result.match_type}"
-                        break
+                # Take the higher score and combine match types
+                if result.hybrid_score > existing.hybrid_score:
+                    existing.hybrid_score = result.hybrid_score
+                existing.match_type = f"{existing.match_type}+{result.match_type}"
+        
+        unique_results = list(results_by_node.values())
         
         # Apply hybrid scoring
         for result in unique_results:
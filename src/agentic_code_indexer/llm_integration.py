@@ -1,19 +1,30 @@
 import asyncio
 import os
-from typing import List, Dict, Optional, Any, Union
+import random
+from typing import List, Dict, Optional, Any, Union, Tuple, Set, Callable, Awaitable
 from dataclasses import dataclass
 import logging
 from pathlib import Path
 import json
 import aiohttp
+from aiolimiter import AsyncLimiter
 import torch
 from transformers import AutoTokenizer, AutoModel
-from anthropic import AsyncAnthropic
+from anthropic import AsyncAnthropic, APIConnectionError, APIStatusError
 import numpy as np
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, Driver
+from .batching import AsyncBatcher
+from .embedding_cache import DEFAULT_EMBEDDING_MODEL, EmbeddingCache
 
 logger = logging.getLogger(__name__)
 
+# Responses worth retrying: rate limited, overloaded or transient server errors
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+MAX_RETRY_DELAY = 60.0
+
+# Node labels that get embeddings (and so have vector indexes)
+EMBEDDED_NODE_TYPES = frozenset({'File', 'Class', 'Method', 'Function', 'Variable', 'Interface'})
+
 @dataclass
 class EmbeddingResult:
     """Result of an embedding operation."""
@@ -36,8 +47,10 @@ class EmbeddingGenerator:
     Supports both local and API-based embedding generation.
     """
     
-    def __init__(self, model_name: str = "jinaai/jina-embeddings-v2-base-code"):
+    def __init__(self, model_name: str = DEFAULT_EMBEDDING_MODEL, max_length: int = 512):
         self.model_name = model_name
+        # Longest input, in tokens, the model is given; the rest is truncated
+        self.max_length = max_length
         self.tokenizer = None
         self.model = None
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
@@ -48,7 +61,10 @@ class EmbeddingGenerator:
         try:
             logger.info(f"Loading embedding model: {self.model_name}")
             self.tokenizer = AutoTokenizer.from_pretrained(self.model_name, trust_remote_code=True)
-            self.model = AutoModel.from_pretrained(self.model_name, trust_remote_code=True)
+            # Half precision halves weight memory and bandwidth on GPUs; CPUs
+            # have no fast fp16 kernels, so they keep full precision
+            dtype = torch.float16 if self.device.type == "cuda" else torch.float32
+            self.model = AutoModel.from_pretrained(self.model_name, trust_remote_code=True, torch_dtype=dtype)
             self.model.to(self.device)
             self.model.eval()
             logger.info(f"Model loaded successfully on {self.device}")
@@ -56,25 +72,45 @@ class EmbeddingGenerator:
             logger.error(f"Failed to load embedding model: {e}")
             raise
     
+    def _encode(self, texts: Union[str, List[str]]) -> np.ndarray:
+        """Run the model over texts and mean-pool the last hidden states (blocking)."""
+        # Tokenize and encode
+        inputs = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            return_tensors='pt',
+            max_length=self.max_length
+        )
+        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        
+        # Generate embeddings
+        with torch.no_grad():
+            outputs = self.model(**inputs)
+            # Use mean pooling of last hidden states
+            embeddings = outputs.last_hidden_state.mean(dim=1)
+            # Vectors are stored as float32 whatever precision the model ran in
+            return embeddings.float().cpu().numpy()
+    
+    def truncate_to_tokens(self, text: str) -> str:
+        """
+        Cut text to the part the model actually sees: its first max_length
+        tokens, special tokens included, mapped back to characters.
+        """
+        if not self.tokenizer.is_fast:
+            # Only fast tokenizers report character offsets
+            return text
+        encoding = self.tokenizer(
+            text, truncation=True, max_length=self.max_length, return_offsets_mapping=True
+        )
+        end = max((end for _, end in encoding["offset_mapping"]), default=0)
+        return text[:end] if end else text
+    
     async def generate_embedding(self, text: str) -> EmbeddingResult:
         """Generate embedding for a single text."""
         try:
-            # Tokenize and encode
-            inputs = self.tokenizer(
-                text, 
-                padding=True, 
-                truncation=True, 
-                return_tensors='pt',
-                max_length=512
-            )
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-            
-            # Generate embedding
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                # Use mean pooling of last hidden states
-                embeddings = outputs.last_hidden_state.mean(dim=1)
-                embeddings = embeddings.cpu().numpy().squeeze()
+            # The forward pass runs in a worker thread so it doesn't stall the event loop
+            embeddings = (await asyncio.to_thread(self._encode, text)).squeeze()
             
             return EmbeddingResult(
                 text=text,
@@ -88,48 +124,43 @@ class EmbeddingGenerator:
             raise
     
     async def generate_embeddings_batch(self, texts: List[str], batch_size: int = 32) -> List[EmbeddingResult]:
-        """Generate embeddings for multiple texts in batches."""
-        results = []
+        """
+        Generate embeddings for multiple texts in batches.
+        
+        Each batch is encoded in a worker thread, so LLM requests and other
+        coroutines keep making progress while the model runs. Texts are
+        batched in order of length so each batch pads to a similar size
+        instead of to its longest outlier; results come back in input order.
+        """
+        results: List[Optional[EmbeddingResult]] = [None] * len(texts)
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
         
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
+        for i in range(0, len(order), batch_size):
+            indices = order[i:i + batch_size]
+            batch = [texts[j] for j in indices]
             
             try:
-                # Tokenize batch
-                inputs = self.tokenizer(
-                    batch,
-                    padding=True,
-                    truncation=True,
-                    return_tensors='pt',
-                    max_length=512
-                )
-                inputs = {k: v.to(self.device) for k, v in inputs.items()}
-                
-                # Generate embeddings
-                with torch.no_grad():
-                    outputs = self.model(**inputs)
-                    embeddings = outputs.last_hidden_state.mean(dim=1)
-                    embeddings = embeddings.cpu().numpy()
+                embeddings = await asyncio.to_thread(self._encode, batch)
                 
                 # Create results
-                for j, text in enumerate(batch):
-                    results.append(EmbeddingResult(
-                        text=text,
+                for j, index in enumerate(indices):
+                    results[index] = EmbeddingResult(
+                        text=texts[index],
                         embedding=embeddings[j].tolist(),
                         model_name=self.model_name,
                         dimension=len(embeddings[j])
-                    ))
+                    )
                     
             except Exception as e:
                 logger.error(f"Error in batch embedding generation: {e}")
                 # Add empty results for failed batch
-                for text in batch:
-                    results.append(EmbeddingResult(
-                        text=text,
+                for index in indices:
+                    results[index] = EmbeddingResult(
+                        text=texts[index],
                         embedding=[],
                         model_name=self.model_name,
                         dimension=0
-                    ))
+                    )
         
         return results
 
@@ -139,10 +170,22 @@ class LLMSummarizer:
     Supports Anthropic Claude and other models.
     """
     
-    def __init__(self, provider: str = "anthropic", model: str = "claude-3-sonnet-20240229"):
+    def __init__(
+        self,
+        provider: str = "anthropic",
+        model: str = "claude-3-sonnet-20240229",
+        max_concurrent_requests: Optional[int] = None,
+        rpm_limit: Optional[int] = None,
+        max_retries: int = 5
+    ):
         self.provider = provider
         self.model = model
+        self.max_retries = max_retries
         self.client = None
+        # Every API call made through this summarizer shares these limits,
+        # whichever batching path issued it
+        self._request_semaphore = asyncio.Semaphore(max_concurrent_requests) if max_concurrent_requests else None
+        self._rate_limiter = AsyncLimiter(rpm_limit, 60) if rpm_limit else None
         self._initialize_client()
     
     def _initialize_client(self):
@@ -151,10 +194,65 @@ class LLMSummarizer:
             api_key = os.getenv("ANTHROPIC_API_KEY")
             if not api_key:
                 raise ValueError("ANTHROPIC_API_KEY environment variable not set")
-            self.client = AsyncAnthropic(api_key=api_key)
+            # Retries are done in create_message so they pass the rate limiter again
+            self.client = AsyncAnthropic(api_key=api_key, max_retries=0)
         else:
             raise ValueError(f"Unsupported LLM provider: {self.provider}")
     
+    async def _send_message(self, **kwargs) -> Any:
+        """Send one messages API request, honouring the concurrency and rate limits."""
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire()
+        if self._request_semaphore is None:
+            return await self.client.messages.create(**kwargs)
+        async with self._request_semaphore:
+            return await self.client.messages.create(**kwargs)
+    
+    @staticmethod
+    def _retry_delay(error: Exception, attempt: int) -> float:
+        """Seconds to wait before retrying: the server's Retry-After if given, else jittered exponential backoff."""
+        response = getattr(error, "response", None)
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            try:
+                return min(float(retry_after), MAX_RETRY_DELAY)
+            except (TypeError, ValueError):
+                pass
+        return min(2 ** attempt, MAX_RETRY_DELAY) * (0.5 + random.random() / 2)
+    
+    async def create_message(self, **kwargs) -> Any:
+        """
+        Send a messages API request, honouring the concurrency and rate limits.
+        
+        Rate-limited, overloaded and transient failures are retried up to
+        max_retries times. Each retry waits without holding a concurrency slot,
+        then goes through the rate limiter again like a fresh request.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self._send_message(**kwargs)
+            except (APIStatusError, APIConnectionError) as e:
+                status = getattr(e, "status_code", None)
+                if attempt == self.max_retries or (status is not None and status not in RETRYABLE_STATUS_CODES):
+                    raise
+                delay = self._retry_delay(e, attempt)
+                logger.warning(f"LLM request failed ({status or type(e).__name__}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+    
+    async def prewarm(self):
+        """
+        Open the HTTPS connection to the provider ahead of the first real
+        request, using a minimal one-token message. Failures are only logged.
+        """
+        try:
+            await self.create_message(
+                model=self.model,
+                max_tokens=1,
+                messages=[{"role": "user", "content": "ping"}]
+            )
+        except Exception as e:
+            logger.warning(f"LLM client prewarm failed: {e}")
+    
     def _create_summary_prompt(self, code_text: str, node_type: str, context: Optional[str] = None) -> str:
         """Create a prompt for code summarization."""
         base_prompt = f"""You are an expert code analyst. Analyze the following {node_type} and provide a concise, technical summary.
@@ -181,7 +279,7 @@ Focus on:
             if self.provider == "anthropic":
                 prompt = self._create_summary_prompt(text, node_type, context)
                 
-                message = await self.client.messages.create(
+                message = await self.create_message(
                     model=self.model,
                     max_tokens=500,
                     temperature=0.1,
@@ -216,14 +314,22 @@ Focus on:
             async with semaphore:
                 return await self.generate_summary(text, node_type, context)
         
-        # Create tasks
-        tasks = []
-        for i, (text, node_type) in enumerate(zip(texts, node_types)):
-            context = contexts[i] if contexts and i < len(contexts) else None
-            tasks.append(generate_with_semaphore(text, node_type, context))
+        requests = [
+            (text, node_type, contexts[i] if contexts and i < len(contexts) else None)
+            for i, (text, node_type) in enumerate(zip(texts, node_types))
+        ]
+        
+        # Identical requests (boilerplate accessors, repeated overloads) are
+        # sent once and their result shared
+        unique_requests = list(dict.fromkeys(requests))
         
         # Execute with limited concurrency
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        unique_results = await asyncio.gather(
+            *[generate_with_semaphore(*request) for request in unique_requests],
+            return_exceptions=True
+        )
+        result_by_request = dict(zip(unique_requests, unique_results))
+        results = [result_by_request[request] for request in requests]
         
         # Handle exceptions
         final_results = []
@@ -241,6 +347,91 @@ Focus on:
         
         return final_results
 
+class PromptBatcher(AsyncBatcher):
+    """
+    Combines several summarization requests into a single LLM message.
+    
+    Items are (text, node_type) tuples. The model is asked for a JSON array
+    with one summary per item; if the reply cannot be used, the batch falls
+    back to one request per item.
+    """
+    
+    def __init__(
+        self,
+        summarizer: LLMSummarizer,
+        max_batch_size: int = 16,
+        max_queue_time: float = 0.05,
+        max_concurrent: int = 5
+    ):
+        super().__init__(max_batch_size, max_queue_time)
+        self.summarizer = summarizer
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+    
+    def _create_batch_prompt(self, items: List[Tuple[str, str]]) -> str:
+        """Create one prompt asking for a summary of every item."""
+        prompt_parts = [
+            f"You are an expert code analyst. Summarize each of the following {len(items)} code elements.",
+            "For each one, provide a clear, concise technical summary (2-4 sentences) covering its "
+            "purpose, key behaviour and important relationships.",
+            f"Respond with only a JSON array of {len(items)} strings, where element i is the summary of item i.",
+            ""
+        ]
+        for i, (text, node_type) in enumerate(items, 1):
+            prompt_parts.append(f"### Item {i} ({node_type})")
+            prompt_parts.append(text)
+            prompt_parts.append("")
+        return "\n".join(prompt_parts)
+    
+    def _parse_summaries(self, response_text: str, expected: int) -> Optional[List[str]]:
+        """Extract the JSON array of summaries from the model's reply."""
+        start = response_text.find('[')
+        end = response_text.rfind(']')
+        if start == -1 or end <= start:
+            return None
+        try:
+            summaries = json.loads(response_text[start:end + 1])
+        except json.JSONDecodeError:
+            return None
+        if len(summaries) != expected or not all(isinstance(s, str) and s.strip() for s in summaries):
+            return None
+        return summaries
+    
+    async def process_batch(self, items: List[Tuple[str, str]]) -> List[SummaryResult]:
+        if len(items) == 1:
+            text, node_type = items[0]
+            async with self._semaphore:
+                return [await self.summarizer.generate_summary(text, node_type)]
+        
+        summaries = None
+        token_count = 0
+        async with self._semaphore:
+            try:
+                message = await self.summarizer.create_message(
+                    model=self.summarizer.model,
+                    max_tokens=min(300 * len(items), 4096),
+                    temperature=0.1,
+                    messages=[{"role": "user", "content": self._create_batch_prompt(items)}]
+                )
+                summaries = self._parse_summaries(message.content[0].text, len(items))
+                token_count = message.usage.input_tokens + message.usage.output_tokens
+            except Exception as e:
+                logger.warning(f"Batched summary request failed: {e}")
+        
+        if summaries is None:
+            logger.warning(f"Falling back to individual summary requests for {len(items)} items")
+            results = await asyncio.gather(*[self.process_batch([item]) for item in items])
+            return [result[0] for result in results]
+        
+        return [
+            SummaryResult(
+                original_text=text,
+                summary=summary,
+                model_name=self.summarizer.model,
+                token_count=token_count // len(items)
+            )
+            for (text, _), summary in zip(items, summaries)
+        ]
+
 class LLMEmbeddingIntegration:
     """
     Coordinates LLM and embedding generation for the indexing pipeline.
@@ -252,87 +443,160 @@ class LLMEmbeddingIntegration:
         neo4j_uri: str,
         neo4j_user: str,
         neo4j_password: str,
-        embedding_model: str = "jinaai/jina-embeddings-v2-base-code",
+        embedding_model: str = DEFAULT_EMBEDDING_MODEL,
         llm_provider: str = "anthropic",
-        llm_model: str = "claude-3-sonnet-20240229"
+        llm_model: str = "claude-3-sonnet-20240229",
+        driver: Optional[Driver] = None,
+        write_batch_size: int = 500,
+        max_concurrent_requests: Optional[int] = None,
+        rpm_limit: Optional[int] = None,
+        embedding_cache: Optional[EmbeddingCache] = None
     ):
-        self.neo4j_driver = GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
+        self._owns_driver = driver is None
+        # Node texts embedded on earlier runs are looked up here instead of re-encoded;
+        # the cache belongs to the caller, which closes it
+        self.embedding_cache = embedding_cache
+        # Maximum rows per UNWIND write when storing summaries/embeddings
+        self.write_batch_size = write_batch_size
+        self.neo4j_driver = driver or GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
         self.embedding_generator = EmbeddingGenerator(embedding_model)
-        self.llm_summarizer = LLMSummarizer(llm_provider, llm_model)
+        self.llm_summarizer = LLMSummarizer(
+            llm_provider, llm_model,
+            max_concurrent_requests=max_concurrent_requests,
+            rpm_limit=rpm_limit
+        )
     
     def close(self):
         """Close database connections."""
-        if self.neo4j_driver:
+        # A driver injected by the caller is shared, so the caller closes it
+        if self.neo4j_driver and self._owns_driver:
             self.neo4j_driver.close()
     
-    async def get_nodes_needing_summaries(self, batch_size: int = 100) -> List[Dict[str, Any]]:
-        """Get nodes that need summary generation."""
+    def _read_records(self, query: str, **parameters) -> List[Dict[str, Any]]:
+        """Run a read query on the synchronous driver; callers run this in a worker thread."""
+        with self.neo4j_driver.session() as session:
+            result = session.run(query, **parameters)
+            return [dict(record) for record in result]
+    
+    async def get_nodes_needing_summaries(
+        self, batch_size: int = 100, after_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get nodes that need summary generation, in id order.
+        
+        Passing the last id of the previous page as after_id continues from
+        there (keyset pagination), so nodes that failed are not fetched again.
+        """
         query = """
         MATCH (n)
         WHERE n.raw_code IS NOT NULL 
         AND (n.generated_summary IS NULL OR n.generated_summary = '')
         AND labels(n)[0] IN ['Class', 'Method', 'Function', 'Interface']
+        AND ($after_id IS NULL OR n.id > $after_id)
         RETURN n.id as id, n.name as name, n.raw_code as raw_code, 
                labels(n)[0] as node_type, n.full_name as full_name
+        ORDER BY n.id
         LIMIT $batch_size
         """
         
-        with self.neo4j_driver.session() as session:
-            result = session.run(query, batch_size=batch_size)
-            return [dict(record) for record in result]
+        return await asyncio.to_thread(self._read_records, query, batch_size=batch_size, after_id=after_id)
     
-    async def get_nodes_needing_embeddings(self, batch_size: int = 100) -> List[Dict[str, Any]]:
-        """Get nodes that need embedding generation."""
+    async def get_nodes_needing_embeddings(
+        self, batch_size: int = 100, after_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get nodes that need embedding generation, in id order, continuing after after_id."""
         query = """
         MATCH (n)
         WHERE n.generated_summary IS NOT NULL 
         AND (n.embedding IS NULL OR size(n.embedding) = 0)
         AND labels(n)[0] IN ['File', 'Class', 'Method', 'Function', 'Variable', 'Interface']
+        AND ($after_id IS NULL OR n.id > $after_id)
         RETURN n.id as id, n.name as name, n.generated_summary as summary,
-               n.raw_code as raw_code, labels(n)[0] as node_type
+               CASE WHEN trim(n.generated_summary) = '' THEN n.raw_code END as raw_code,
+               labels(n)[0] as node_type
+        ORDER BY n.id
         LIMIT $batch_size
         """
         
-        with self.neo4j_driver.session() as session:
-            result = session.run(query, batch_size=batch_size)
-            return [dict(record) for record in result]
+        return await asyncio.to_thread(self._read_records, query, batch_size=batch_size, after_id=after_id)
+    
+    async def get_nodes_by_ids_for_embedding(self, node_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get the given nodes if they still need embedding generation."""
+        query = """
+        MATCH (n)
+        WHERE n.id IN $node_ids
+        AND n.generated_summary IS NOT NULL 
+        AND (n.embedding IS NULL OR size(n.embedding) = 0)
+        AND labels(n)[0] IN ['File', 'Class', 'Method', 'Function', 'Variable', 'Interface']
+        RETURN n.id as id, n.name as name, n.generated_summary as summary,
+               CASE WHEN trim(n.generated_summary) = '' THEN n.raw_code END as raw_code,
+               labels(n)[0] as node_type
+        """
+        
+        return await asyncio.to_thread(self._read_records, query, node_ids=node_ids)
     
     async def update_node_summary(self, node_id: str, summary: str) -> bool:
         """Update a node with generated summary."""
+        return node_id in await self.update_node_summaries([{"id": node_id, "summary": summary}])
+    
+    def _write_rows(self, query: str, rows: List[Dict[str, Any]], description: str) -> Set[str]:
+        """
+        Run an UNWIND write over rows in chunks of write_batch_size.
+        Returns the IDs of the nodes that were updated. Uses the synchronous
+        driver; callers run this in a worker thread.
+        """
+        updated_ids = set()
+        for i in range(0, len(rows), self.write_batch_size):
+            chunk = rows[i:i + self.write_batch_size]
+            try:
+                with self.neo4j_driver.session() as session:
+                    result = session.run(query, rows=chunk)
+                    updated_ids.update(record["id"] for record in result)
+            except Exception as e:
+                logger.error(f"Error updating {description} for {len(chunk)} nodes: {e}")
+        return updated_ids
+    
+    async def update_node_summaries(self, rows: List[Dict[str, Any]]) -> Set[str]:
+        """
+        Update many nodes with generated summaries in batched writes.
+        Rows are {"id": ..., "summary": ...}; returns the IDs updated.
+        """
         query = """
-        MATCH (n {id: $node_id})
-        SET n.generated_summary = $summary
+        UNWIND $rows AS row
+        MATCH (n {id: row.id})
+        SET n.generated_summary = row.summary
         RETURN n.id as id
         """
-        
-        try:
-            with self.neo4j_driver.session() as session:
-                result = session.run(query, node_id=node_id, summary=summary)
-                return result.single() is not None
-        except Exception as e:
-            logger.error(f"Error updating summary for node {node_id}: {e}")
-            return False
+        return await asyncio.to_thread(self._write_rows, query, rows, "summaries")
     
-    async def update_node_embedding(self, node_id: str, embedding: List[float]) -> bool:
-        """Update a node with generated embedding."""
+    async def update_node_embeddings(self, rows: List[Dict[str, Any]]) -> Set[str]:
+        """
+        Update many nodes with generated embeddings in batched writes.
+        Rows are {"id": ..., "embedding": [...]}; returns the IDs updated.
+        
+        Embeddings are written with db.create.setNodeVectorProperty, which
+        stores them as float32 arrays (half the size of a float list
+        property) while keeping them usable by the vector indexes.
+        """
         query = """
-        MATCH (n {id: $node_id})
-        SET n.embedding = $embedding
+        UNWIND $rows AS row
+        MATCH (n {id: row.id})
+        CALL db.create.setNodeVectorProperty(n, 'embedding', row.embedding)
         RETURN n.id as id
         """
-        
-        try:
-            with self.neo4j_driver.session() as session:
-                result = session.run(query, node_id=node_id, embedding=embedding)
-                return result.single() is not None
-        except Exception as e:
-            logger.error(f"Error updating embedding for node {node_id}: {e}")
-            return False
+        return await asyncio.to_thread(self._write_rows, query, rows, "embeddings")
+    
+    async def update_node_embedding(self, node_id: str, embedding: List[float]) -> bool:
+        """Update a node with generated embedding."""
+        return node_id in await self.update_node_embeddings([{"id": node_id, "embedding": embedding}])
     
     async def process_summaries_batch(self, batch_size: int = 50, max_concurrent: int = 5) -> int:
         """Process a batch of nodes for summary generation."""
         nodes = await self.get_nodes_needing_summaries(batch_size)
-        
+        return await self.summarize_nodes(nodes, max_concurrent)
+    
+    async def summarize_nodes(self, nodes: List[Dict[str, Any]], max_concurrent: int = 5) -> int:
+        """Generate and store summaries for the given node records."""
         if not nodes:
             return 0
         
@@ -348,10 +612,11 @@ class LLMEmbeddingIntegration:
         )
         
         # Update database
-        successful_updates = 0
-        for node, summary_result in zip(nodes, summary_results):
-            if await self.update_node_summary(node['id'], summary_result.summary):
-                successful_updates += 1
+        updated_ids = await self.update_node_summaries([
+            {"id": node['id'], "summary": summary_result.summary}
+            for node, summary_result in zip(nodes, summary_results)
+        ])
+        successful_updates = len(updated_ids)
         
         logger.info(f"Updated {successful_updates}/{len(nodes)} node summaries")
         return successful_updates
@@ -359,7 +624,27 @@ class LLMEmbeddingIntegration:
     async def process_embeddings_batch(self, batch_size: int = 100) -> int:
         """Process a batch of nodes for embedding generation."""
         nodes = await self.get_nodes_needing_embeddings(batch_size)
-        
+        return await self.embed_nodes(nodes)
+    
+    async def process_embeddings_for_ids(self, node_ids: List[str]) -> int:
+        """Generate embeddings for specific, freshly summarized nodes."""
+        nodes = await self.get_nodes_by_ids_for_embedding(node_ids)
+        return await self.embed_nodes(nodes)
+    
+    async def embed_summarized_nodes(self, rows: List[Dict[str, str]]) -> int:
+        """
+        Embed freshly written summaries, given as {"id", "name", "node_type",
+        "summary"} rows, without reading the nodes back from the database.
+        """
+        nodes = [
+            {"id": row["id"], "name": row["name"], "summary": row["summary"], "raw_code": None}
+            for row in rows
+            if row["node_type"] in EMBEDDED_NODE_TYPES
+        ]
+        return await self.embed_nodes(nodes)
+    
+    async def embed_nodes(self, nodes: List[Dict[str, Any]]) -> int:
+        """Generate and store embeddings for the given node records."""
         if not nodes:
             return 0
         
@@ -371,22 +656,69 @@ class LLMEmbeddingIntegration:
             if node['summary'] and node['summary'].strip():
                 texts.append(node['summary'])
             elif node['raw_code']:
-                texts.append(node['raw_code'][:1000])  # Limit code length
+                # Keep exactly the code that fits the model's token window
+                texts.append(self.embedding_generator.truncate_to_tokens(node['raw_code']))
             else:
                 texts.append(node['name'])  # Fallback to name
         
-        # Generate embeddings
-        embedding_results = await self.embedding_generator.generate_embeddings_batch(texts)
+        # Only encode texts that weren't embedded with this model before
+        model_name = self.embedding_generator.model_name
+        embeddings = {}
+        if self.embedding_cache is not None:
+            embeddings = self.embedding_cache.get_many(model_name, texts)
+            if embeddings:
+                logger.info(f"Reusing {len(embeddings)} cached embeddings")
+        
+        missing = list(dict.fromkeys(text for text in texts if text not in embeddings))
+        if missing:
+            embedding_results = await self.embedding_generator.generate_embeddings_batch(missing)
+            computed = {
+                result.text: result.embedding
+                for result in embedding_results
+                if result.embedding
+            }
+            if self.embedding_cache is not None and computed:
+                self.embedding_cache.put_many(model_name, computed)
+            embeddings.update(computed)
         
         # Update database
-        successful_updates = 0
-        for node, embedding_result in zip(nodes, embedding_results):
-            if embedding_result.embedding and await self.update_node_embedding(node['id'], embedding_result.embedding):
-                successful_updates += 1
+        updated_ids = await self.update_node_embeddings([
+            {"id": node['id'], "embedding": embeddings[text]}
+            for node, text in zip(nodes, texts)
+            if text in embeddings
+        ])
+        successful_updates = len(updated_ids)
         
         logger.info(f"Updated {successful_updates}/{len(nodes)} node embeddings")
         return successful_updates
     
+    @staticmethod
+    async def _process_pages(
+        fetch_page: Callable[[int, Optional[str]], Awaitable[List[Dict[str, Any]]]],
+        process_page: Callable[[List[Dict[str, Any]]], Awaitable[int]],
+        batch_size: int
+    ) -> int:
+        """
+        Process keyset-paginated node records page by page, returning the
+        summed results of process_page.
+        
+        The next page is fetched while the current one is processed (the
+        fetchers run their queries in worker threads, so the prefetch does not
+        stall the event loop), and at most those two pages are held in memory
+        at any time.
+        """
+        total = 0
+        next_page = asyncio.create_task(fetch_page(batch_size, None))
+        try:
+            while page := await next_page:
+                # Each page continues after the last id of the previous one,
+                # so every pending node is visited once
+                next_page = asyncio.create_task(fetch_page(batch_size, page[-1]['id']))
+                total += await process_page(page)
+        finally:
+            next_page.cancel()
+        return total
+    
     async def run_full_enrichment(self, summary_batch_size: int = 50, embedding_batch_size: int = 100) -> Dict[str, int]:
         """Run complete summary and embedding enrichment process."""
         logger.info("Starting LLM and embedding enrichment process")
@@ -397,26 +729,21 @@ class LLMEmbeddingIntegration:
             "total_iterations": 0
         }
         
-        # Process summaries in iterations
-        while True:
-            summary_count = await self.process_summaries_batch(summary_batch_size)
-            if summary_count == 0:
-                break
-            stats["summaries_generated"] += summary_count
+        async def summarize_page(nodes: List[Dict[str, Any]]) -> int:
             stats["total_iterations"] += 1
-            
+            updated = await self.summarize_nodes(nodes)
             # Small delay to avoid rate limiting
             await asyncio.sleep(1)
+            return updated
         
-        # Process embeddings in iterations
-        while True:
-            embedding_count = await self.process_embeddings_batch(embedding_batch_size)
-            if embedding_count == 0:
-                break
-            stats["embeddings_generated"] += embedding_count
-            
-            # Small delay for processing
-            await asyncio.sleep(0.5)
+        stats["summaries_generated"] = await self._process_pages(
+            self.get_nodes_needing_summaries, summarize_page, summary_batch_size
+        )
+        
+        # Process embeddings the same way; the model is local, so no delay
+        stats["embeddings_generated"] = await self._process_pages(
+            self.get_nodes_needing_embeddings, self.embed_nodes, embedding_batch_size
+        )
         
         logger.info(f"Enrichment complete: {stats['summaries_generated']} summaries, {stats['embeddings_generated']} embeddings")
         return stats
@@ -1,5 +1,6 @@
 import asyncio
 import os
+from collections import Counter
 from pathlib import Path
 from typing import Dict, List, Optional
 import logging
@@ -12,9 +13,10 @@ from rich.panel import Panel
 import json
 
 from .file_traversal import FileTraversal, FileStatus
-from .chunker_orchestrator import ChunkerOrchestrator
+from .chunker_orchestrator import ChunkerOrchestrator, default_chunker_concurrency
+from .chunker_cache import ChunkerOutputCache
 from .graph_ingestion import GraphIngestion, IngestionStats
-from .neo4j_setup import Neo4jSetup
+from .neo4j_setup import Neo4jSetup, get_driver, close_driver
 
 # Setup logging
 logging.basicConfig(
@@ -38,27 +40,44 @@ class MainPipeline:
         neo4j_uri: str = "bolt://localhost:7687",
         neo4j_user: str = "neo4j",
         neo4j_password: str = "password",
-        max_concurrent_files: int = 5,
-        batch_size: int = 1000
+        max_concurrent_files: Optional[int] = None,
+        batch_size: int = 1000,
+        scan_workers: int = 16,
+        sniff_shebangs: bool = False,
+        use_chunk_cache: bool = True
     ):
         self.project_root = Path(project_root).resolve()
         self.neo4j_uri = neo4j_uri
         self.neo4j_user = neo4j_user
         self.neo4j_password = neo4j_password
-        self.max_concurrent_files = max_concurrent_files
+        self.max_concurrent_files = max_concurrent_files or default_chunker_concurrency()
         self.batch_size = batch_size
         
-        # Initialize components
-        self.file_traversal = FileTraversal(neo4j_uri, neo4j_user, neo4j_password)
-        self.chunker_orchestrator = ChunkerOrchestrator(str(self.project_root))
-        self.graph_ingestion = GraphIngestion(neo4j_uri, neo4j_user, neo4j_password, batch_size)
+        # Initialize components on one shared driver and connection pool
+        self.driver = get_driver(neo4j_uri, neo4j_user, neo4j_password)
+        self.file_traversal = FileTraversal(
+            neo4j_uri, neo4j_user, neo4j_password, scan_workers, sniff_shebangs, driver=self.driver
+        )
+        self.chunker_orchestrator = ChunkerOrchestrator(
+            str(self.project_root),
+            workers_per_chunker=self.max_concurrent_files,
+            output_cache=ChunkerOutputCache() if use_chunk_cache else None
+        )
+        self.graph_ingestion = GraphIngestion(
+            neo4j_uri, neo4j_user, neo4j_password, batch_size, driver=self.driver
+        )
+    
+    def close(self):
+        """Kill any chunker workers left running and close the shared Neo4j driver."""
+        self.chunker_orchestrator.kill_workers()
+        close_driver(self.driver)
         
     async def initialize_database(self) -> bool:
         """Initialize Neo4j database with schema and indexes."""
         try:
             console.print("[yellow]Initializing Neo4j database...[/yellow]")
             
-            neo4j_setup = Neo4jSetup(self.neo4j_uri, self.neo4j_user, self.neo4j_password)
+            neo4j_setup = Neo4jSetup(self.neo4j_uri, self.neo4j_user, self.neo4j_password, driver=self.driver)
             await neo4j_setup.setup_database()
             neo4j_setup.close()
             
@@ -109,11 +128,9 @@ class MainPipeline:
                 directory, str(self.project_root)
             )
             
-            # Summarize changes
-            change_summary = {}
-            for status in FileStatus:
-                count = sum(1 for fc in file_changes if fc.status == status)
-                change_summary[status.value] = count
+            # Summarize changes, counting all statuses in one pass
+            status_counts = Counter(fc.status for fc in file_changes)
+            change_summary = {status.value: status_counts[status] for status in FileStatus}
             
             table = Table(title="File Change Summary")
             table.add_column("Status", style="cyan")
@@ -159,16 +176,113 @@ class MainPipeline:
             
             task = progress.add_task("Processing files...", total=len(files_to_process))
             
-            # Process files in batches
-            chunker_outputs = await self.chunker_orchestrator.process_files_batch(
+            # Collect outputs as they finish so progress tracks real completion
+            chunker_outputs = []
+            async for output in self.chunker_orchestrator.iter_processed_files(
                 files_to_process, self.max_concurrent_files
-            )
-            
-            progress.update(task, completed=len(files_to_process))
+            ):
+                progress.advance(task)
+                if output is not None:
+                    chunker_outputs.append(output)
         
         console.print(f"[green]✓ Processed {len(chunker_outputs)} files successfully[/green]")
         return chunker_outputs
     
+    async def process_and_ingest(self, file_changes: List) -> IngestionStats:
+        """
+        Chunk files and ingest their output concurrently.
+        
+        Chunker outputs are grouped into batches of roughly batch_size nodes
+        and passed to the ingestion step through a bounded queue, so writes
+        start with the first batch and at most a few batches are held in
+        memory at once.
+        """
+        files_to_process = self.file_traversal.get_files_to_process(file_changes)
+        
+        if not files_to_process:
+            console.print("[blue]No files need processing[/blue]")
+            return IngestionStats()
+        
+        console.print(f"[yellow]Processing {len(files_to_process)} files...[/yellow]")
+        
+        queue: asyncio.Queue = asyncio.Queue(maxsize=4)
+        total_stats = IngestionStats()
+        processed_count = 0
+        
+        async def produce(progress: Progress, task) -> None:
+            nonlocal processed_count
+            batch = []
+            batch_nodes = 0
+            try:
+                async for output in self.chunker_orchestrator.iter_processed_files(
+                    files_to_process, self.max_concurrent_files
+                ):
+                    progress.advance(task)
+                    if output is None:
+                        continue
+                    processed_count += 1
+                    batch.append(output)
+                    batch_nodes += len(output.nodes)
+                    if batch_nodes >= self.batch_size:
+                        await queue.put(batch)
+                        batch = []
+                        batch_nodes = 0
+                if batch:
+                    await queue.put(batch)
+            finally:
+                await queue.put(None)
+        
+        async def consume() -> None:
+            while (batch := await queue.get()) is not None:
+                # Keep draining after a failed batch so the producer never
+                # blocks on a full queue
+                try:
+                    stats = await self.graph_ingestion.ingest_multiple_outputs(batch)
+                except Exception as e:
+                    logger.error(f"Ingestion error: {e}")
+                    total_stats.errors += 1
+                    continue
+                total_stats.nodes_created += stats.nodes_created
+                total_stats.nodes_updated += stats.nodes_updated
+                total_stats.relationships_created += stats.relationships_created
+                total_stats.relationships_updated += stats.relationships_updated
+                total_stats.files_processed += stats.files_processed
+                total_stats.errors += stats.errors
+        
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+            TimeElapsedColumn(),
+            console=console
+        ) as progress:
+            task = progress.add_task("Processing files...", total=len(files_to_process))
+            try:
+                await asyncio.gather(produce(progress, task), consume())
+            except Exception as e:
+                console.print(f"[red]Error during ingestion: {e}[/red]")
+                logger.error(f"Ingestion error: {e}")
+                total_stats.errors += 1
+        
+        console.print(f"[green]✓ Processed {processed_count} files successfully[/green]")
+        self._display_ingestion_stats(total_stats)
+        return total_stats
+    
+    def _display_ingestion_stats(self, stats: IngestionStats):
+        """Display ingestion results as a table."""
+        table = Table(title="Ingestion Results")
+        table.add_column("Metric", style="cyan")
+        table.add_column("Count", style="bold green")
+        
+        table.add_row("Nodes Created", str(stats.nodes_created))
+        table.add_row("Relationships Created", str(stats.relationships_created))
+        table.add_row("Files Processed", str(stats.files_processed))
+        if stats.errors > 0:
+            table.add_row("Errors", f"[red]{stats.errors}[/red]")
+        
+        console.print(table)
+    
     async def ingest_to_database(self, chunker_outputs: List) -> IngestionStats:
         """Ingest chunker outputs to Neo4j database."""
         if not chunker_outputs:
@@ -179,20 +293,7 @@ class MainPipeline:
         
         try:
             stats = await self.graph_ingestion.ingest_multiple_outputs(chunker_outputs)
-            
-            # Display ingestion results
-            table = Table(title="Ingestion Results")
-            table.add_column("Metric", style="cyan")
-            table.add_column("Count", style="bold green")
-            
-            table.add_row("Nodes Created", str(stats.nodes_created))
-            table.add_row("Relationships Created", str(stats.relationships_created))
-            table.add_row("Files Processed", str(stats.files_processed))
-            if stats.errors > 0:
-                table.add_row("Errors", f"[red]{stats.errors}[/red]")
-            
-            console.print(table)
-            
+            self._display_ingestion_stats(stats)
             return stats
             
         except Exception as e:
@@ -209,17 +310,16 @@ class MainPipeline:
         
         console.print(f"[yellow]Cleaning up {len(deleted_files)} deleted files...[/yellow]")
         
-        total_deleted = 0
-        for file_change in deleted_files:
-            deleted_count = await self.graph_ingestion.delete_file_subgraph(file_change.path)
-            total_deleted += deleted_count
+        total_deleted = await self.graph_ingestion.delete_file_subgraphs(
+            [file_change.path for file_change in deleted_files]
+        )
         
         console.print(f"[green]✓ Cleaned up {total_deleted} nodes from deleted files[/green]")
         return total_deleted
     
-    def get_database_summary(self) -> Dict:
+    async def get_database_summary(self) -> Dict:
         """Get current database state summary."""
-        return self.graph_ingestion.get_ingestion_summary()
+        return await self.graph_ingestion.get_ingestion_summary()
     
     def display_summary(self, summary: Dict):
         """Display database summary in a nice format."""
@@ -290,14 +390,16 @@ class MainPipeline:
             # Step 4: Clean up deleted files
             await self.cleanup_deleted_files(file_changes)
             
-            # Step 5: Process files through chunkers
-            chunker_outputs = await self.process_files(file_changes)
+            # Steps 5-6: Process files through chunkers and ingest the
+            # results into the database as they become available
+            ingestion_stats = await self.process_and_ingest(file_changes)
             
-            # Step 6: Ingest to database
-            ingestion_stats = await self.ingest_to_database(chunker_outputs)
+            # Remember when indexed files were hashed, so the next scan can
+            # skip rehashing the ones that have not been touched since
+            await asyncio.to_thread(self.file_traversal.record_file_mtimes, file_changes)
             
             # Step 7: Display final summary
-            summary = self.get_database_summary()
+            summary = await self.get_database_summary()
             self.display_summary(summary)
             
             # Final status
@@ -319,11 +421,9 @@ class MainPipeline:
             console.print(f"[red]Pipeline failed: {e}[/red]")
             logger.error(f"Pipeline error: {e}")
             return False
-        
         finally:
-            # Cleanup connections
-            self.file_traversal.close()
-            self.graph_ingestion.close()
+            # Stop the persistent chunker workers
+            await self.chunker_orchestrator.close()
 
 @app.command()
 def run(
@@ -333,7 +433,7 @@ def run(
     neo4j_user: str = typer.Option("neo4j", help="Neo4j username"),
     neo4j_password: str = typer.Option("password", help="Neo4j password"),
     init_db: bool = typer.Option(False, "--init-db", help="Initialize database schema"),
-    max_concurrent: int = typer.Option(5, help="Maximum concurrent file processing"),
+    max_concurrent: Optional[int] = typer.Option(None, help="Maximum concurrent file processing (default: 2x CPU count, or ACI_CHUNKER_CONCURRENCY)"),
     batch_size: int = typer.Option(1000, help="Database batch size")
 ):
     """Run the main indexing pipeline."""
@@ -346,7 +446,10 @@ def run(
         batch_size=batch_size
     )
     
-    success = asyncio.run(pipeline.run_full_pipeline(directory, init_db))
+    try:
+        success = asyncio.run(pipeline.run_full_pipeline(directory, init_db))
+    finally:
+        pipeline.close()
     if not success:
         raise typer.Exit(1)
 
@@ -357,17 +460,15 @@ def status(
     neo4j_password: str = typer.Option("password", help="Neo4j password")
 ):
     """Show current database status."""
-    ingestion = GraphIngestion(neo4j_uri, neo4j_user, neo4j_password)
+    # The pipeline shares its driver with the ingestion component
+    pipeline = MainPipeline(".", neo4j_uri, neo4j_user, neo4j_password)
     
     try:
-        summary = ingestion.get_ingestion_summary()
-        
-        # Create a simple pipeline instance for display method
-        pipeline = MainPipeline(".")
+        summary = asyncio.run(pipeline.get_database_summary())
         pipeline.display_summary(summary)
         
     finally:
-        ingestion.close()
+        pipeline.close()
 
 if __name__ == "__main__":
     app() 
\ No newline at end of file
@@ -5,18 +5,96 @@ Creates schema, constraints, and vector indexes for the code indexing system.
 """
 
 import os
-from neo4j import GraphDatabase
-from typing import Optional
+import asyncio
+import threading
+from neo4j import GraphDatabase, Driver, Session
+from typing import Callable, Iterable, List, Optional, Tuple, TypeVar
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Connection pool size for the shared driver. One pool serves every
+# component, so it only needs to cover the pipeline's concurrency.
+DEFAULT_MAX_POOL_SIZE = 50
+
+# The process-wide driver and the connection parameters it was opened with
+_shared_driver: Optional[Tuple[tuple, Driver]] = None
+_shared_driver_lock = threading.Lock()
+
+def get_driver(
+    uri: str,
+    username: str,
+    password: str,
+    max_connection_pool_size: int = DEFAULT_MAX_POOL_SIZE
+) -> Driver:
+    """
+    Get the process-wide Neo4j driver.
+    
+    Components that are handed this driver share its connection pool
+    instead of each opening their own. The top-level command closes it
+    with close_driver() once it is done. Asking for different connection
+    parameters closes the previous driver and opens a new one.
+    """
+    global _shared_driver
+    key = (uri, username, password, max_connection_pool_size)
+    with _shared_driver_lock:
+        if _shared_driver is not None:
+            cached_key, driver = _shared_driver
+            if cached_key == key:
+                return driver
+            logger.debug(f"Replacing the shared Neo4j driver for {cached_key[0]} with one for {uri}")
+            driver.close()
+        driver = GraphDatabase.driver(
+            uri,
+            auth=(username, password),
+            max_connection_pool_size=max_connection_pool_size
+        )
+        _shared_driver = (key, driver)
+        return driver
+
+def close_driver(driver: Driver) -> None:
+    """Close a driver obtained from get_driver(), so the next call opens a new one."""
+    global _shared_driver
+    with _shared_driver_lock:
+        if _shared_driver is not None and _shared_driver[1] is driver:
+            _shared_driver = None
+    driver.close()
+
+T = TypeVar("T")
+
+async def run_concurrent(
+    driver: Driver,
+    work: Iterable[Callable[[Session], T]],
+    concurrency: int = 5
+) -> List[T]:
+    """
+    Run independent units of session work concurrently and return their
+    results in order.
+    
+    Each unit gets a fresh session (sessions must never be shared between
+    concurrent tasks) and runs in a worker thread, since the driver is
+    synchronous. At most `concurrency` units are in flight, which keeps
+    usage within the driver's connection pool.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    def run_in_session(fn: Callable[[Session], T]) -> T:
+        with driver.session() as session:
+            return fn(session)
+    
+    async def run_one(fn: Callable[[Session], T]) -> T:
+        async with semaphore:
+            return await asyncio.to_thread(run_in_session, fn)
+    
+    return await asyncio.gather(*[run_one(fn) for fn in work])
+
 class Neo4jSetup:
     def __init__(self, uri: str = "bolt://localhost:7687", 
                  username: str = "neo4j", 
-                 password: Optional[str] = None):
+                 password: Optional[str] = None,
+                 driver: Optional[Driver] = None):
         """
         Initialize Neo4j connection for setup operations.
         
@@ -24,7 +102,13 @@ class Neo4jSetup:
             uri: Neo4j connection URI
             username: Neo4j username
             password: Neo4j password (if None, will try to get from env var NEO4J_PASSWORD)
+            driver: Existing driver to reuse; the caller stays responsible for closing it
         """
+        self._owns_driver = driver is None
+        if driver is not None:
+            self.driver = driver
+            return
+        
         if password is None:
             password = os.getenv("NEO4J_PASSWORD", "password")
         
@@ -33,7 +117,7 @@ class Neo4jSetup:
 
     def close(self):
         """Close the Neo4j driver connection."""
-        if self.driver:
+        if self.driver and self._owns_driver:
             self.driver.close()
             logger.info("Neo4j connection closed")
 
@@ -110,6 +194,18 @@ class Neo4jSetup:
             "CREATE INDEX node_name_index IF NOT EXISTS FOR (n:Method) ON (n.name)",
             "CREATE INDEX node_name_index IF NOT EXISTS FOR (n:Function) ON (n.name)",
             "CREATE INDEX node_name_index IF NOT EXISTS FOR (n:Variable) ON (n.name)",
+            # Ingestion MERGEs nodes and MATCHes relationship endpoints by
+            # label and id; without these every lookup is a label scan
+            "CREATE INDEX file_id_index IF NOT EXISTS FOR (n:File) ON (n.id)",
+            "CREATE INDEX directory_id_index IF NOT EXISTS FOR (n:Directory) ON (n.id)",
+            "CREATE INDEX class_id_index IF NOT EXISTS FOR (n:Class) ON (n.id)",
+            "CREATE INDEX interface_id_index IF NOT EXISTS FOR (n:Interface) ON (n.id)",
+            "CREATE INDEX method_id_index IF NOT EXISTS FOR (n:Method) ON (n.id)",
+            "CREATE INDEX function_id_index IF NOT EXISTS FOR (n:Function) ON (n.id)",
+            "CREATE INDEX variable_id_index IF NOT EXISTS FOR (n:Variable) ON (n.id)",
+            "CREATE INDEX parameter_id_index IF NOT EXISTS FOR (n:Parameter) ON (n.id)",
+            "CREATE INDEX import_id_index IF NOT EXISTS FOR (n:Import) ON (n.id)",
+            "CREATE INDEX export_id_index IF NOT EXISTS FOR (n:Export) ON (n.id)",
             "CREATE TEXT INDEX file_content_text_index IF NOT EXISTS FOR (f:File) ON (f.content)",
             "CREATE TEXT INDEX summary_text_index IF NOT EXISTS FOR (n) ON (n.generated_summary)"
         ]
@@ -14,6 +14,7 @@ import uvicorn
 
 # Internal imports
 from .hybrid_search import HybridSearchEngine, HybridSearchConfig, HybridSearchResult
+from .neo4j_setup import get_driver, close_driver
 from .vector_search import VectorSearchConfig
 from .graph_traversal import TraversalDirection
 
@@ -112,7 +113,10 @@ async def lifespan(app: FastAPI):
     neo4j_password = os.getenv("NEO4J_PASSWORD", "password")
     
     try:
-        search_engine = HybridSearchEngine(neo4j_uri, neo4j_user, neo4j_password)
+        search_engine = HybridSearchEngine(
+            neo4j_uri, neo4j_user, neo4j_password,
+            driver=get_driver(neo4j_uri, neo4j_user, neo4j_password)
+        )
         logger.info("Search engine initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize search engine: {e}")
@@ -122,7 +126,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     if search_engine:
-        search_engine.close()
+        close_driver(search_engine.driver)
         logger.info("Search engine closed")
 
 # Create FastAPI app
@@ -0,0 +1,272 @@
+import asyncio
+import getpass
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import stat
+import sys
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Tuple
+from .hybrid_search import HybridSearchEngine, HybridSearchConfig, HybridSearchResult
+from .vector_search import SearchResult
+from .graph_traversal import GraphContext, GraphNode
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TCP_PORT = 8765
+# Windows has no AF_UNIX support in asyncio, so the daemon listens on loopback TCP there
+USE_TCP = sys.platform == "win32"
+
+def runtime_dir() -> Path:
+    """
+    Per-user directory for daemon sockets and tokens: $XDG_RUNTIME_DIR when
+    set, else a user-named directory in the temp dir. It is created with
+    0700 permissions, and on POSIX refused unless it is a real directory
+    owned by this user that nobody else can access.
+    """
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    if base:
+        path = Path(base) / "agentic-code-indexer"
+    else:
+        path = Path(tempfile.gettempdir()) / f"agentic-code-indexer-{getpass.getuser()}"
+    path.mkdir(mode=0o700, exist_ok=True)
+
+    if os.name == "posix":
+        st = os.lstat(path)
+        if (
+            not stat.S_ISDIR(st.st_mode)
+            or st.st_uid != os.getuid()
+            or st.st_mode & 0o077
+        ):
+            raise PermissionError(f"Refusing to use insecure daemon directory: {path}")
+    return path
+
+def daemon_paths(neo4j_uri: str, neo4j_user: str) -> Tuple[Path, Path]:
+    """Socket and token file paths for the daemon serving the given database."""
+    key = hashlib.sha256(f"{neo4j_uri}\0{neo4j_user}".encode("utf-8")).hexdigest()[:16]
+    directory = runtime_dir()
+    return directory / f"search-{key}.sock", directory / f"search-{key}.token"
+
+def connection_fingerprint(neo4j_uri: str, neo4j_user: str, neo4j_password: str) -> str:
+    """Identify a set of connection parameters without sending the password."""
+    return hashlib.sha256(
+        f"{neo4j_uri}\0{neo4j_user}\0{neo4j_password}".encode("utf-8")
+    ).hexdigest()
+
+def result_to_dict(result: HybridSearchResult) -> Dict[str, Any]:
+    """Convert a hybrid search result into a JSON-serializable dict."""
+    return asdict(result)
+
+def result_from_dict(data: Dict[str, Any]) -> HybridSearchResult:
+    """Rebuild a hybrid search result from result_to_dict output."""
+    context = None
+    if data.get("context"):
+        ctx = data["context"]
+        context = GraphContext(
+            central_nodes=[SearchResult(**node) for node in ctx["central_nodes"]],
+            related_nodes=[GraphNode(**node) for node in ctx["related_nodes"]],
+            relationships=ctx["relationships"],
+            traversal_summary=ctx["traversal_summary"]
+        )
+
+    return HybridSearchResult(
+        search_result=SearchResult(**data["search_result"]),
+        match_type=data["match_type"],
+        hybrid_score=data["hybrid_score"],
+        context=context,
+        explanation=data["explanation"]
+    )
+
+async def _write_message(writer: asyncio.StreamWriter, message: Dict[str, Any]):
+    """Write one newline-delimited JSON message."""
+    writer.write(json.dumps(message, default=str).encode("utf-8") + b"\n")
+    await writer.drain()
+
+class SearchDaemon:
+    """
+    Long-running search server that keeps a HybridSearchEngine (driver,
+    embedding model and query cache) resident between CLI invocations.
+
+    Each connection carries one newline-delimited JSON request; search
+    results are streamed back one message per result, followed by a
+    {"done": true} message.
+
+    Every request must carry the token the daemon writes to its private
+    token file, and the fingerprint of the Neo4j connection parameters the
+    client was invoked with; requests for another database are refused.
+    """
+
+    def __init__(
+        self,
+        search_engine: HybridSearchEngine,
+        neo4j_uri: str,
+        neo4j_user: str,
+        neo4j_password: str,
+        port: int = DEFAULT_TCP_PORT
+    ):
+        self.search_engine = search_engine
+        self.socket_path, self.token_path = daemon_paths(neo4j_uri, neo4j_user)
+        self.connection = connection_fingerprint(neo4j_uri, neo4j_user, neo4j_password)
+        self.port = port
+        self.token = secrets.token_urlsafe(32)
+
+    @property
+    def address(self) -> str:
+        """Where clients reach this daemon."""
+        return f"127.0.0.1:{self.port}" if USE_TCP else str(self.socket_path)
+
+    async def _remove_stale_socket(self):
+        """Remove a socket left by a crashed daemon; refuse to steal a live one."""
+        try:
+            st = os.lstat(self.socket_path)
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(st.st_mode):
+            raise RuntimeError(f"Refusing to replace non-socket file: {self.socket_path}")
+
+        try:
+            _, writer = await asyncio.open_unix_connection(str(self.socket_path))
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(self.socket_path)
+            return
+        writer.close()
+        raise RuntimeError(f"A search daemon is already listening on {self.socket_path}")
+
+    def _write_token(self):
+        """Write the request token where only this user can read it."""
+        fd = os.open(self.token_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(self.token)
+
+    async def serve_forever(self):
+        """Listen for client requests until cancelled."""
+        if USE_TCP:
+            server = await asyncio.start_server(self._handle_client, "127.0.0.1", self.port)
+        else:
+            await self._remove_stale_socket()
+            server = await asyncio.start_unix_server(self._handle_client, path=str(self.socket_path))
+        self._write_token()
+        logger.info(f"Search daemon listening on {self.address}")
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for path in (self.token_path, None if USE_TCP else self.socket_path):
+                if path is None:
+                    continue
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve a single request on a client connection."""
+        try:
+            line = await reader.readline()
+            if not line:
+                return
+
+            request = json.loads(line)
+            cmd = request.get("cmd")
+
+            if not hmac.compare_digest(str(request.get("token", "")), self.token):
+                await _write_message(writer, {"error": "Invalid or missing daemon token"})
+                return
+            if request.get("connection") != self.connection:
+                await _write_message(writer, {"error": "Search daemon serves a different Neo4j connection"})
+                return
+
+            if cmd == "ping":
+                await _write_message(writer, {"ok": True})
+            elif cmd == "search":
+                config = HybridSearchConfig(**request.get("opts", {}))
+                async for result in self.search_engine.search_iter(request["query"], config):
+                    await _write_message(writer, {"result": result_to_dict(result)})
+                await _write_message(writer, {"done": True})
+            elif cmd == "explain":
+                explanation = await self.search_engine.explain_search(request["query"])
+                await _write_message(writer, {"explanation": explanation})
+            else:
+                await _write_message(writer, {"error": f"Unknown command: {cmd}"})
+
+        except Exception as e:
+            logger.error(f"Error serving daemon request: {e}")
+            try:
+                await _write_message(writer, {"error": str(e)})
+            except ConnectionError:
+                pass
+        finally:
+            writer.close()
+
+class SearchDaemonClient:
+    """Client side of the search daemon protocol."""
+
+    def __init__(
+        self,
+        neo4j_uri: str,
+        neo4j_user: str,
+        neo4j_password: str,
+        port: int = DEFAULT_TCP_PORT
+    ):
+        self.socket_path, self.token_path = daemon_paths(neo4j_uri, neo4j_user)
+        self.connection = connection_fingerprint(neo4j_uri, neo4j_user, neo4j_password)
+        self.port = port
+
+    async def _connect(self):
+        if USE_TCP:
+            return await asyncio.open_connection("127.0.0.1", self.port)
+        return await asyncio.open_unix_connection(str(self.socket_path))
+
+    async def is_available(self) -> bool:
+        """Check whether a daemon for this client's database accepts its requests."""
+        try:
+            async for message in self._request({"cmd": "ping"}):
+                return bool(message.get("ok"))
+        except (OSError, RuntimeError) as e:
+            logger.debug(f"Search daemon not usable: {e}")
+        return False
+
+    async def _request(self, request: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        # Raises OSError when no daemon has written a token for this database
+        token = self.token_path.read_text().strip()
+        reader, writer = await self._connect()
+        try:
+            await _write_message(writer, {**request, "token": token, "connection": self.connection})
+            while line := await reader.readline():
+                message = json.loads(line)
+                if "error" in message:
+                    raise RuntimeError(f"Search daemon error: {message['error']}")
+                yield message
+        finally:
+            writer.close()
+
+    async def search_iter(
+        self,
+        query: str,
+        config: HybridSearchConfig = None
+    ) -> AsyncIterator[HybridSearchResult]:
+        """Run a search on the daemon, yielding results as they arrive."""
+        if config is None:
+            config = HybridSearchConfig()
+
+        request = {"cmd": "search", "query": query, "opts": asdict(config)}
+        async for message in self._request(request):
+            if message.get("done"):
+                return
+            yield result_from_dict(message["result"])
+
+    async def explain_search(self, query: str) -> Dict[str, Any]:
+        """Explain a query on the daemon."""
+        messages = self._request({"cmd": "explain", "query": query})
+        try:
+            async for message in messages:
+                return message["explanation"]
+        finally:
+            await messages.aclose()
+        raise RuntimeError("Search daemon closed the connection without a response")
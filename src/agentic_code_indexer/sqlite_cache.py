@@ -0,0 +1,137 @@
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "agentic-code-indexer"
+DEFAULT_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+DEFAULT_CACHE_MAX_AGE_DAYS = 30
+# Long-lived processes (the search daemon) also evict after this many writes
+EVICT_EVERY_WRITES = 1000
+
+class SQLiteCache:
+    """
+    Key/blob table in a SQLite file with least-recently-used eviction.
+
+    Every entry records when it was last read or written. Entries unused for
+    longer than max_age_days are dropped, and the least recently used ones
+    go next while the stored values exceed max_bytes. Eviction runs when the
+    cache is opened and closed and every EVICT_EVERY_WRITES writes; reads
+    only note the access time in memory until then, so a cache hit never
+    costs a write.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        table: str,
+        max_bytes: Optional[int] = DEFAULT_CACHE_MAX_BYTES,
+        max_age_days: Optional[float] = DEFAULT_CACHE_MAX_AGE_DAYS
+    ):
+        self.path = Path(path)
+        self.table = table
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self._accessed: Dict[str, float] = {}
+        self._writes_since_evict = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        columns = {row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+        if columns and columns != {"key", "value", "last_access"}:
+            # Written by an older version without access tracking; the
+            # entries are only a cache, so start over
+            self.conn.execute(f"DROP TABLE {table}")
+        self.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            f"(key TEXT PRIMARY KEY, value BLOB NOT NULL, last_access REAL NOT NULL DEFAULT 0)"
+        )
+        self.conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_last_access ON {table} (last_access)")
+        self.conn.commit()
+        self.evict()
+
+    def close(self):
+        """Record access times, evict stale entries and close the cache database."""
+        self.evict()
+        self.conn.close()
+
+    def get_value(self, key: str) -> Optional[bytes]:
+        """Return the stored value for a key, or None on a miss."""
+        row = self.conn.execute(f"SELECT value FROM {self.table} WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self._accessed[key] = time.time()
+        return row[0]
+
+    def get_values(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        """Return the stored values for whichever of the keys are present."""
+        found = {}
+        key_list = list(keys)
+        # Stay well below SQLite's bound-parameter limit
+        for i in range(0, len(key_list), 500):
+            chunk = key_list[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT key, value FROM {self.table} WHERE key IN ({','.join('?' * len(chunk))})",
+                chunk
+            ).fetchall()
+            found.update(rows)
+        now = time.time()
+        for key in found:
+            self._accessed[key] = now
+        return found
+
+    def put_values(self, items: Dict[str, bytes]):
+        """Store several values in one transaction, replacing any previous entries."""
+        now = time.time()
+        try:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, last_access) VALUES (?, ?, ?)",
+                [(key, value, now) for key, value in items.items()]
+            )
+            self.conn.commit()
+        except sqlite3.Error as e:
+            # A failed cache write only costs a recomputation next time
+            logger.warning(f"Could not write {self.path.name} cache entries: {e}")
+            return
+        self._writes_since_evict += len(items)
+        if self._writes_since_evict >= EVICT_EVERY_WRITES:
+            self.evict()
+
+    def evict(self):
+        """Write pending access times, then drop expired and least recently used entries."""
+        accessed, self._accessed = self._accessed, {}
+        self._writes_since_evict = 0
+        try:
+            if accessed:
+                self.conn.executemany(
+                    f"UPDATE {self.table} SET last_access = MAX(last_access, ?) WHERE key = ?",
+                    [(when, key) for key, when in accessed.items()]
+                )
+            if self.max_age_days is not None:
+                self.conn.execute(
+                    f"DELETE FROM {self.table} WHERE last_access < ?",
+                    (time.time() - self.max_age_days * 86400,)
+                )
+            if self.max_bytes is not None:
+                # Keep the most recently used entries whose sizes add up to
+                # at most max_bytes
+                self.conn.execute(
+                    f"DELETE FROM {self.table} WHERE key IN ("
+                    f"SELECT key FROM (SELECT key, SUM(length(value)) OVER "
+                    f"(ORDER BY last_access DESC, key ROWS UNBOUNDED PRECEDING) AS kept "
+                    f"FROM {self.table}) WHERE kept > ?)",
+                    (self.max_bytes,)
+                )
+            self.conn.commit()
+        except sqlite3.Error as e:
+            # Another process may hold the database; eviction can wait for the next run
+            logger.warning(f"Could not evict {self.path.name} cache entries: {e}")
+
+    def clear(self):
+        """Delete every entry and give the space back to the filesystem."""
+        self._accessed.clear()
+        self.conn.execute(f"DELETE FROM {self.table}")
+        self.conn.commit()
+        self.conn.execute("VACUUM")
@@ -1,10 +1,11 @@
 import asyncio
-from typing import List, Dict, Optional, Set, Tuple
+from typing import AsyncIterator, List, Dict, Optional, Set, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import logging
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, Driver, Session
 from collections import defaultdict
+from .neo4j_setup import run_concurrent
 
 logger = logging.getLogger(__name__)
 
@@ -44,8 +45,15 @@ class HierarchicalSummarizationOrchestrator:
     Processes nodes in topological order considering containment relationships.
     """
     
-    def __init__(self, neo4j_uri: str, neo4j_user: str, neo4j_password: str):
-        self.driver = GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
+    def __init__(
+        self,
+        neo4j_uri: str,
+        neo4j_user: str,
+        neo4j_password: str,
+        driver: Optional[Driver] = None
+    ):
+        self._owns_driver = driver is None
+        self.driver = driver or GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
         
         # Define processing order by level
         self.level_order = [
@@ -73,7 +81,8 @@ class HierarchicalSummarizationOrchestrator:
     
     def close(self):
         """Close Neo4j driver connection."""
-        if self.driver:
+        # A driver injected by the caller is shared, so the caller closes it
+        if self.driver and self._owns_driver:
             self.driver.close()
     
     def _get_nodes_by_level(self, level: SummarizationLevel) -> List[SummarizationNode]:
@@ -104,7 +113,7 @@ class HierarchicalSummarizationOrchestrator:
         
         return nodes
     
-    def _get_children_summaries(self, node_id: str) -> List[str]:
+    def _get_children_summaries(self, session: Session, node_id: str) -> List[str]:
         """Get summaries of all children nodes for context."""
         query = """
         MATCH (parent {id: $node_id})-[:CONTAINS|:DEFINES|:DECLARES]->(child)
@@ -115,14 +124,13 @@ class HierarchicalSummarizationOrchestrator:
         """
         
         summaries = []
-        with self.driver.session() as session:
-            result = session.run(query, node_id=node_id)
-            for record in result:
-                summaries.append(f"{record['name']}: {record['summary']}")
+        result = session.run(query, node_id=node_id)
+        for record in result:
+            summaries.append(f"{record['name']}: {record['summary']}")
         
         return summaries
     
-    def _get_related_summaries(self, node_id: str) -> List[str]:
+    def _get_related_summaries(self, session: Session, node_id: str) -> List[str]:
         """Get summaries of related nodes (same level dependencies)."""
         query = """
         MATCH (n {id: $node_id})-[:CALLS|:USES|:REFERENCES]->(related)
@@ -133,34 +141,33 @@ class HierarchicalSummarizationOrchestrator:
         """
         
         summaries = []
-        with self.driver.session() as session:
-            result = session.run(query, node_id=node_id)
-            for record in result:
-                summaries.append(f"{record['name']}: {record['summary']}")
+        result = session.run(query, node_id=node_id)
+        for record in result:
+            summaries.append(f"{record['name']}: {record['summary']}")
         
         return summaries
     
-    def _mark_node_processing(self, node_id: str):
+    def _mark_node_processing(self, session: Session, node_id: str):
         """Mark a node as being processed to avoid duplicate work."""
         query = """
         MATCH (n {id: $node_id})
         SET n.summary_status = 'PROCESSING'
         """
         
-        with self.driver.session() as session:
-            session.run(query, node_id=node_id)
+        session.run(query, node_id=node_id).consume()
     
-    def _mark_node_completed(self, node_id: str):
-        """Mark a node as completed processing."""
+    def _mark_nodes_completed(self, node_ids: List[str]):
+        """Mark nodes as completed processing in a single UNWIND write."""
         query = """
-        MATCH (n {id: $node_id})
+        UNWIND $node_ids AS node_id
+        MATCH (n {id: node_id})
         SET n.summary_status = 'COMPLETED'
         """
         
         with self.driver.session() as session:
-            session.run(query, node_id=node_id)
+            session.run(query, node_ids=node_ids).consume()
     
-    def _check_dependencies_ready(self, node_id: str) -> bool:
+    def _check_dependencies_ready(self, session: Session, node_id: str) -> bool:
         """Check if all child nodes have been summarized."""
         query = """
         MATCH (parent {id: $node_id})-[:CONTAINS|:DEFINES|:DECLARES]->(child)
@@ -169,21 +176,29 @@ class HierarchicalSummarizationOrchestrator:
         RETURN count(child) as unsummarized_count
         """
         
-        with self.driver.session() as session:
-            result = session.run(query, node_id=node_id)
-            record = result.single()
-            return record["unsummarized_count"] == 0 if record else True
+        result = session.run(query, node_id=node_id)
+        record = result.single()
+        return record["unsummarized_count"] == 0 if record else True
     
-    def _enrich_node_with_context(self, node: SummarizationNode) -> SummarizationNode:
+    def _enrich_node_with_context(self, session: Session, node: SummarizationNode) -> SummarizationNode:
         """Enrich a node with context from its children and dependencies."""
         # Get children summaries for hierarchical context
-        node.children_summaries = self._get_children_summaries(node.id)
+        node.children_summaries = self._get_children_summaries(session, node.id)
         
         # Get related summaries for additional context
-        node.dependencies = self._get_related_summaries(node.id)
+        node.dependencies = self._get_related_summaries(session, node.id)
         
         return node
     
+    def _prepare_node(self, session: Session, node: SummarizationNode) -> Optional[SummarizationNode]:
+        """Claim and enrich a node if its dependencies are satisfied, else return None."""
+        if not self._check_dependencies_ready(session, node.id):
+            return None
+        # Mark as processing to avoid concurrent processing
+        self._mark_node_processing(session, node.id)
+        # Enrich with context
+        return self._enrich_node_with_context(session, node)
+    
     def _create_hierarchical_prompt(self, node: SummarizationNode) -> str:
         """Create a context-aware prompt for hierarchical summarization."""
         prompt_parts = [
@@ -225,24 +240,48 @@ class HierarchicalSummarizationOrchestrator:
     
     async def get_nodes_ready_for_processing(self, level: SummarizationLevel, batch_size: int = 50) -> List[SummarizationNode]:
         """Get nodes at a level that are ready for processing (dependencies satisfied)."""
-        nodes = self._get_nodes_by_level(level)
+        # The driver is synchronous; keep its round trips off the event loop
+        # so embedding of earlier batches carries on meanwhile
+        nodes = await asyncio.to_thread(self._get_nodes_by_level, level)
         ready_nodes = []
-        
-        for node in nodes:
-            if self._check_dependencies_ready(node.id):
-                # Mark as processing to avoid concurrent processing
-                self._mark_node_processing(node.id)
-                # Enrich with context
-                enriched_node = self._enrich_node_with_context(node)
-                ready_nodes.append(enriched_node)
-                
-                if len(ready_nodes) >= batch_size:
-                    break
+        position = 0
+        
+        # Each node needs several independent round trips, so prepare nodes
+        # concurrently, only taking as many candidates as slots remain so
+        # no more than batch_size nodes get claimed
+        while len(ready_nodes) < batch_size and position < len(nodes):
+            candidates = nodes[position:position + batch_size - len(ready_nodes)]
+            position += len(candidates)
+            
+            prepared = await run_concurrent(
+                self.driver,
+                [lambda session, node=node: self._prepare_node(session, node) for node in candidates]
+            )
+            ready_nodes.extend(node for node in prepared if node is not None)
         
         return ready_nodes
     
-    async def process_level(self, level: SummarizationLevel, llm_integration, batch_size: int = 20) -> int:
+    async def process_level(
+        self, level: SummarizationLevel, llm_integration, batch_size: int = 20, prompt_batcher=None
+    ) -> int:
         """Process all nodes at a specific level."""
+        total_processed = 0
+        async for rows in self.iter_level_batches(level, llm_integration, batch_size, prompt_batcher):
+            total_processed += len(rows)
+        return total_processed
+    
+    async def iter_level_batches(
+        self, level: SummarizationLevel, llm_integration, batch_size: int = 20, prompt_batcher=None
+    ) -> AsyncIterator[List[Dict[str, str]]]:
+        """
+        Process all nodes at a specific level, yielding {"id", "name",
+        "node_type", "summary"} rows for the nodes summarized in each batch
+        as soon as the batch is written, so consumers can embed the
+        summaries without reading them back.
+        
+        With a PromptBatcher, the nodes' prompts are coalesced into multi-item
+        LLM requests instead of one request per node.
+        """
         logger.info(f"Processing summarization level: {level.name}")
         
         total_processed = 0
@@ -269,51 +308,83 @@ class HierarchicalSummarizationOrchestrator:
             
             # Generate summaries using LLM integration
             try:
-                summary_results = await llm_integration.llm_summarizer.generate_summaries_batch(
-                    texts, node_types, contexts, max_concurrent=5
-                )
+                if prompt_batcher is not None:
+                    # Nodes with identical prompts share one summary
+                    items = list(zip(texts, node_types))
+                    unique_items = list(dict.fromkeys(items))
+                    unique_results = await asyncio.gather(*[
+                        prompt_batcher.process(item) for item in unique_items
+                    ])
+                    summary_by_item = dict(zip(unique_items, unique_results))
+                    summary_results = [summary_by_item[item] for item in items]
+                else:
+                    summary_results = await llm_integration.llm_summarizer.generate_summaries_batch(
+                        texts, node_types, contexts, max_concurrent=5
+                    )
+                
+                # Update nodes with summaries in one batched write
+                updated_ids = await llm_integration.update_node_summaries([
+                    {"id": node.id, "summary": summary_result.summary}
+                    for node, summary_result in zip(ready_nodes, summary_results)
+                ])
+                summarized_rows = [
+                    {"id": node.id, "name": node.name, "node_type": node.node_type, "summary": summary_result.summary}
+                    for node, summary_result in zip(ready_nodes, summary_results)
+                    if node.id in updated_ids
+                ]
                 
-                # Update nodes with summaries
-                successful_updates = 0
-                for node, summary_result in zip(ready_nodes, summary_results):
-                    if await llm_integration.update_node_summary(node.id, summary_result.summary):
-                        self._mark_node_completed(node.id)
-                        successful_updates += 1
-                    else:
-                        # Reset processing status on failure
-                        self._mark_node_completed(node.id)
+                # Clear the processing claim whether or not the write succeeded
+                await asyncio.to_thread(self._mark_nodes_completed, [node.id for node in ready_nodes])
                 
+                successful_updates = len(summarized_rows)
                 total_processed += successful_updates
                 logger.info(f"Successfully processed {successful_updates}/{len(ready_nodes)} nodes")
                 
             except Exception as e:
                 logger.error(f"Error processing level {level.name}: {e}")
                 # Reset processing status for failed nodes
-                for node in ready_nodes:
-                    self._mark_node_completed(node.id)
+                await asyncio.to_thread(self._mark_nodes_completed, [node.id for node in ready_nodes])
                 break
+            
+            if summarized_rows:
+                yield summarized_rows
         
         logger.info(f"Completed level {level.name}: {total_processed} nodes processed")
-        return total_processed
     
-    async def run_hierarchical_summarization(self, llm_integration, batch_size: int = 20) -> Dict[str, int]:
+    async def stream_hierarchical_summarization(
+        self, llm_integration, batch_size: int = 20, prompt_batcher=None
+    ) -> AsyncIterator[Tuple[SummarizationLevel, List[Dict[str, str]]]]:
         """
-        Run complete hierarchical summarization in bottom-up order.
-        Processes each level only when its dependencies are satisfied.
+        Run complete hierarchical summarization in bottom-up order, yielding
+        (level, rows) for every batch of nodes that gets summarized so
+        callers can start downstream work while later batches are running.
+        Rows are as yielded by iter_level_batches.
         """
         logger.info("Starting hierarchical summarization process")
         
-        stats = {}
-        total_processed = 0
-        
         # Process each level in order
         for level in self.level_order:
-            processed_count = await self.process_level(level, llm_integration, batch_size)
-            stats[level.name.lower()] = processed_count
-            total_processed += processed_count
+            async for rows in self.iter_level_batches(level, llm_integration, batch_size, prompt_batcher):
+                yield level, rows
             
             # Small delay between levels
             await asyncio.sleep(1)
+    
+    async def run_hierarchical_summarization(
+        self, llm_integration, batch_size: int = 20, prompt_batcher=None
+    ) -> Dict[str, int]:
+        """
+        Run complete hierarchical summarization in bottom-up order.
+        Processes each level only when its dependencies are satisfied.
+        """
+        stats = {level.name.lower(): 0 for level in self.level_order}
+        total_processed = 0
+        
+        async for level, rows in self.stream_hierarchical_summarization(
+            llm_integration, batch_size, prompt_batcher
+        ):
+            stats[level.name.lower()] += len(rows)
+            total_processed += len(rows)
         
         stats["total_processed"] = total_processed
         logger.info(f"Hierarchical summarization complete: {total_processed} total nodes processed")
@@ -349,7 +420,7 @@ class HierarchicalSummarizationOrchestrator:
         
         return progress
     
-    def reset_processing_status(self):
+    async def reset_processing_status(self):
         """Reset all processing status markers (useful for recovery)."""
         query = """
         MATCH (n)
@@ -357,9 +428,13 @@ class HierarchicalSummarizationOrchestrator:
         REMOVE n.summary_status
         """
         
-        with self.driver.session() as session:
-            result = session.run(query)
-            logger.info("Reset processing status for all nodes")
+        def run_reset():
+            with self.driver.session() as session:
+                session.run(query).consume()
+        
+        # Keep the blocking round trip off the event loop
+        await asyncio.to_thread(run_reset)
+        logger.info("Reset processing status for all nodes")
 
 # Example usage
 async def main():
@@ -376,7 +451,7 @@ async def main():
         print("Summarization progress:", progress)
         
         # Reset any stuck processing status
-        orchestrator.reset_processing_status()
+        await orchestrator.reset_processing_status()
         
     finally:
         orchestrator.close()
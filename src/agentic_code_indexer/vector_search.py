@@ -1,10 +1,10 @@
 import asyncio
-from typing import List, Dict, Any, Optional, Tuple
+import heapq
+from typing import List, Dict, Any, Optional, Set, Tuple
 from dataclasses import dataclass
 import logging
-import numpy as np
-from neo4j import GraphDatabase
-from .llm_integration import EmbeddingGenerator
+from neo4j import GraphDatabase, Driver
+from .embedding_cache import DEFAULT_EMBEDDING_MODEL, EmbeddingCache
 
 logger = logging.getLogger(__name__)
 
@@ -36,9 +36,24 @@ class VectorSearchEngine:
     and embedding similarity calculations.
     """
     
-    def __init__(self, neo4j_uri: str, neo4j_user: str, neo4j_password: str):
-        self.driver = GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
-        self.embedding_generator = EmbeddingGenerator()
+    def __init__(
+        self,
+        neo4j_uri: str,
+        neo4j_user: str,
+        neo4j_password: str,
+        driver: Optional[Driver] = None,
+        query_cache: Optional[EmbeddingCache] = None,
+        embedding_model: str = DEFAULT_EMBEDDING_MODEL
+    ):
+        self._owns_driver = driver is None
+        self.driver = driver or GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
+        self.embedding_model = embedding_model
+        # Query embeddings are looked up here before the model is consulted
+        self.query_cache = query_cache
+        self._embedding_generator = None
+        # Vector indexes seen to exist; indexes are never dropped while serving,
+        # so only misses go back to the server
+        self._existing_indexes: Set[str] = set()
         
         # Available vector indexes by node type
         self.vector_indexes = {
@@ -50,9 +65,19 @@ class VectorSearchEngine:
             "Variable": "variable_embedding_index"
         }
     
+    @property
+    def embedding_generator(self):
+        """Embedding model, loaded on first use so cached queries never load it."""
+        if self._embedding_generator is None:
+            # torch/transformers are only imported once a query actually needs embedding
+            from .llm_integration import EmbeddingGenerator
+            self._embedding_generator = EmbeddingGenerator(self.embedding_model)
+        return self._embedding_generator
+    
     def close(self):
         """Close database connection."""
-        if self.driver:
+        # A driver injected by the caller is shared, so the caller closes it
+        if self.driver and self._owns_driver:
             self.driver.close()
     
     async def search_by_text(
@@ -79,29 +104,56 @@ class VectorSearchEngine:
             node_types = list(self.vector_indexes.keys())
         
         # Generate embedding for the query
-        query_embedding_result = await self.embedding_generator.generate_embedding(query_text)
-        query_embedding = query_embedding_result.embedding
+        query_embedding = await self._embed_query(query_text)
         
         if not query_embedding:
             logger.error(f"Failed to generate embedding for query: {query_text}")
             return []
         
         # Search across specified node types
-        all_results = []
-        
         for node_type in node_types:
             if node_type not in self.vector_indexes:
                 logger.warning(f"No vector index available for node type: {node_type}")
-                continue
-                
-            results = await self._search_node_type(
-                node_type, query_embedding, query_text, config
-            )
-            all_results.extend(results)
         
-        # Sort by similarity score and apply global limit
-        all_results.sort(key=lambda x: x.similarity_score, reverse=True)
-        return all_results[:config.max_results]
+        all_results = await self._search_node_types(
+            [node_type for node_type in node_types if node_type in self.vector_indexes],
+            query_embedding, query_text, config
+        )
+        
+        # Select the global top results by similarity score without sorting them all
+        return heapq.nlargest(config.max_results, all_results, key=lambda x: x.similarity_score)
+    
+    async def _search_node_types(
+        self,
+        node_types: List[str],
+        query_embedding: List[float],
+        query_text: str,
+        config: VectorSearchConfig
+    ) -> List[SearchResult]:
+        """
+        Query the vector index of every node type concurrently, rather than
+        one index round trip after another, and concatenate the results.
+        """
+        per_type = await asyncio.gather(*[
+            self._search_node_type(node_type, query_embedding, query_text, config)
+            for node_type in node_types
+        ])
+        return [result for results in per_type for result in results]
+    
+    async def _embed_query(self, query_text: str) -> List[float]:
+        """Embed a query, going through the query cache when one is set."""
+        if self.query_cache is not None:
+            cached = self.query_cache.get(self.embedding_model, query_text)
+            if cached is not None:
+                logger.debug(f"Query embedding cache hit: {query_text}")
+                return cached
+        
+        query_embedding_result = await self.embedding_generator.generate_embedding(query_text)
+        query_embedding = query_embedding_result.embedding
+        
+        if query_embedding and self.query_cache is not None:
+            self.query_cache.put(self.embedding_model, query_text, query_embedding)
+        return query_embedding
     
     async def _search_node_type(
         self, 
@@ -129,7 +181,7 @@ class VectorSearchEngine:
             node.full_name as full_name,
             labels(node)[0] as node_type,
             node.generated_summary as summary,
-            node.raw_code as raw_code,
+            CASE WHEN $include_raw_code THEN node.raw_code END as raw_code,
             node.start_line as start_line,
             node.end_line as end_line,
             score as similarity_score
@@ -137,70 +189,96 @@ class VectorSearchEngine:
         LIMIT $limit
         """
         
-        results = []
-        
-        with self.driver.session() as session:
-            try:
-                result = session.run(
+        def run_query():
+            with self.driver.session() as session:
+                return list(session.run(
                     query,
                     index_name=index_name,
                     k=config.max_results,
                     query_embedding=query_embedding,
                     min_threshold=config.min_similarity_threshold,
-                    limit=config.max_results
+                    limit=config.max_results,
+                    # Source bodies are the bulk of each row; only ship them when asked
+                    include_raw_code=config.include_raw_code
+                ))
+        
+        results = []
+        
+        try:
+            # The driver is synchronous; a worker thread lets the other
+            # node types' queries run at the same time
+            records = await asyncio.to_thread(run_query)
+            
+            # Query-side normalization is done once, not per result
+            query_lower = query_text.lower()
+            query_terms = [word for word in query_lower.split() if len(word) > 3]
+            
+            for record in records:
+                # Apply exact match boosting
+                similarity_score = record["similarity_score"]
+                if config.boost_exact_matches and self._is_exact_match(
+                    query_lower, query_terms, record["name"], record["summary"]
+                ):
+                    similarity_score *= config.boost_factor
+                
+                # Create location info if available
+                location = None
+                if record["start_line"] and record["end_line"]:
+                    location = {
+                        "start_line": record["start_line"],
+                        "end_line": record["end_line"]
+                    }
+                
+                search_result = SearchResult(
+                    node_id=record["id"],
+                    name=record["name"],
+                    full_name=record["full_name"],
+                    node_type=record["node_type"],
+                    summary=record["summary"] or "",
+                    raw_code=record["raw_code"],
+                    similarity_score=similarity_score,
+                    location=location,
+                    metadata={"original_score": record["similarity_score"]}
                 )
                 
-                for record in result:
-                    # Apply exact match boosting
-                    similarity_score = record["similarity_score"]
-                    if config.boost_exact_matches and self._is_exact_match(
-                        query_text, record["name"], record["summary"]
-                    ):
-                        similarity_score *= config.boost_factor
-                    
-                    # Create location info if available
-                    location = None
-                    if record["start_line"] and record["end_line"]:
-                        location = {
-                            "start_line": record["start_line"],
-                            "end_line": record["end_line"]
-                        }
-                    
-                    search_result = SearchResult(
-                        node_id=record["id"],
-                        name=record["name"],
-                        full_name=record["full_name"],
-                        node_type=record["node_type"],
-                        summary=record["summary"] or "",
-                        raw_code=record["raw_code"] if config.include_raw_code else None,
-                        similarity_score=similarity_score,
-                        location=location,
-                        metadata={"original_score": record["similarity_score"]}
-                    )
-                    
-                    results.append(search_result)
-                    
-            except Exception as e:
-                logger.error(f"Error searching {node_type} with vector index: {e}")
+                results.append(search_result)
+                
+        except Exception as e:
+            logger.error(f"Error searching {node_type} with vector index: {e}")
         
         return results
     
     async def _index_exists(self, index_name: str) -> bool:
-        """Check if a vector index exists."""
-        query = "SHOW INDEXES YIELD name WHERE name = $index_name RETURN count(*) as count"
+        """
+        Check if a vector index exists.
         
-        with self.driver.session() as session:
-            try:
-                result = session.run(query, index_name=index_name)
-                record = result.single()
-                return record["count"] > 0 if record else False
-            except Exception as e:
-                logger.error(f"Error checking index existence: {e}")
-                return False
+        A miss refreshes the names of all vector indexes in one query, so
+        after the first search no further index lookups are made.
+        """
+        if index_name in self._existing_indexes:
+            return True
+        
+        query = "SHOW INDEXES YIELD name, type WHERE type = 'VECTOR' RETURN collect(name) as names"
+        
+        def run_query():
+            with self.driver.session() as session:
+                return session.run(query).single()
+        
+        try:
+            record = await asyncio.to_thread(run_query)
+            if record:
+                self._existing_indexes.update(record["names"])
+            return index_name in self._existing_indexes
+        except Exception as e:
+            logger.error(f"Error checking index existence: {e}")
+            return False
     
-    def _is_exact_match(self, query: str, name: str, summary: str) -> bool:
-        """Check if query contains exact matches with node name or key terms."""
-        query_lower = query.lower()
+    def _is_exact_match(self, query_lower: str, query_terms: List[str], name: str, summary: str) -> bool:
+        """
+        Check if the lowercased query contains exact matches with node name,
+        or any of its key terms (words longer than three characters) appear
+        in the summary.
+        """
         name_lower = name.lower()
         
         # Exact name match
@@ -208,13 +286,10 @@ class VectorSearchEngine:
             return True
         
         # Check for exact matches in summary
-        if summary:
+        if summary and query_terms:
             summary_lower = summary.lower()
             # Look for query terms in summary
-            query_words = query_lower.split()
-            for word in query_words:
-                if len(word) > 3 and word in summary_lower:
-                    return True
+            return any(word in summary_lower for word in query_terms)
         
         return False
     
@@ -292,20 +367,13 @@ class VectorSearchEngine:
         if node_types is None:
             node_types = list(self.vector_indexes.keys())
         
-        all_results = []
-        
-        for node_type in node_types:
-            if node_type not in self.vector_indexes:
-                continue
-                
-            results = await self._search_node_type(
-                node_type, embedding, "", config
-            )
-            all_results.extend(results)
+        all_results = await self._search_node_types(
+            [node_type for node_type in node_types if node_type in self.vector_indexes],
+            embedding, "", config
+        )
         
-        # Sort and limit globally
-        all_results.sort(key=lambda x: x.similarity_score, reverse=True)
-        return all_results[:config.max_results]
+        # Top results globally, best first
+        return heapq.nlargest(config.max_results, all_results, key=lambda x: x.similarity_score)
     
     async def get_node_details(self, node_id: str) -> Optional[SearchResult]:
         """Get detailed information about a specific node."""
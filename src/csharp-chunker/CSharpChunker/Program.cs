@@ -1,22 +1,33 @@
 using System;
 using System.IO;
+using System.Text;
 using System.Threading.Tasks;
 using CommandLine;
 using Newtonsoft.Json;
+using Newtonsoft.Json.Linq;
 using CSharpChunker.Models;
 
 namespace CSharpChunker
 {
     public class Options
     {
-        [Value(0, MetaName = "input", HelpText = "Input file or directory to process", Required = true)]
+        [Value(0, MetaName = "input", HelpText = "Input file or directory to process")]
         public string Input { get; set; }
 
-        [Option('o', "output", HelpText = "Output JSON file path", Default = "csharp_chunker_output.json")]
+        [Option('o', "output", HelpText = "Output JSON file path, or - for stdout", Default = "csharp_chunker_output.json")]
         public string Output { get; set; }
 
         [Option("project-root", HelpText = "Project root directory", Default = ".")]
         public string ProjectRoot { get; set; }
+
+        [Option("manifest", HelpText = "File listing input paths one per line; output is NDJSON with one result per path")]
+        public string Manifest { get; set; }
+
+        [Option("serve", HelpText = "Run as a persistent worker serving framed requests on stdin/stdout")]
+        public bool Serve { get; set; }
+
+        [Option("ndjson", HelpText = "Write output as NDJSON records (a header line, then one line per node and relationship)")]
+        public bool Ndjson { get; set; }
     }
 
     class Program
@@ -32,11 +43,36 @@ namespace CSharpChunker
 
         static async Task<int> RunChunker(Options options)
         {
+            var outputToStdout = options.Output == "-";
+            var stdout = Console.OpenStandardOutput();
+            if (outputToStdout)
+            {
+                // stdout carries the JSON output; diagnostics go to stderr
+                Console.SetOut(Console.Error);
+            }
+
             try
             {
-                var inputPath = Path.GetFullPath(options.Input);
                 var projectRoot = Path.GetFullPath(options.ProjectRoot);
 
+                if (options.Serve)
+                {
+                    return await RunServer(projectRoot);
+                }
+
+                if (!string.IsNullOrEmpty(options.Manifest))
+                {
+                    return await RunManifest(options, projectRoot, stdout);
+                }
+
+                if (string.IsNullOrEmpty(options.Input))
+                {
+                    Console.WriteLine("An input path is required unless --manifest or --serve is given");
+                    return 1;
+                }
+
+                var inputPath = Path.GetFullPath(options.Input);
+
                 if (!File.Exists(inputPath) && !Directory.Exists(inputPath))
                 {
                     Console.WriteLine($"Input path does not exist: {inputPath}");
@@ -65,13 +101,34 @@ namespace CSharpChunker
                     return 1;
                 }
 
-                // Serialize output to JSON
-                var json = JsonConvert.SerializeObject(output, Formatting.Indented, new JsonSerializerSettings
+                var serializerSettings = new JsonSerializerSettings
                 {
                     NullValueHandling = NullValueHandling.Ignore
-                });
+                };
 
-                await File.WriteAllTextAsync(options.Output, json);
+                if (options.Ndjson)
+                {
+                    using (var stream = outputToStdout ? stdout : File.Create(options.Output))
+                    {
+                        await WriteRecords(stream, output, serializerSettings);
+                    }
+                }
+                else
+                {
+                    // Serialize output to JSON
+                    var json = JsonConvert.SerializeObject(output, Formatting.Indented, serializerSettings);
+
+                    if (outputToStdout)
+                    {
+                        var bytes = System.Text.Encoding.UTF8.GetBytes(json);
+                        await stdout.WriteAsync(bytes);
+                        await stdout.FlushAsync();
+                    }
+                    else
+                    {
+                        await File.WriteAllTextAsync(options.Output, json);
+                    }
+                }
 
                 Console.WriteLine($"C# chunker completed. Output written to: {options.Output}");
                 Console.WriteLine($"Processed {output.ProcessedFiles.Count} files, extracted {output.Nodes.Count} nodes, {output.Relationships.Count} relationships");
@@ -85,5 +142,132 @@ namespace CSharpChunker
                 return 1;
             }
         }
+
+        // Serves chunking requests over stdin/stdout until stdin is closed. Every message
+        // is a JSON header line carrying the body length ("len"), followed by that many
+        // bytes of body. Requests have a JSON body with the request "id" and the file
+        // "path"; each response header echoes the id and its body is the file's
+        // ChunkerOutput JSON, or empty with an "error" in the header on failure.
+        static async Task<int> RunServer(string projectRoot)
+        {
+            var input = new BufferedStream(Console.OpenStandardInput());
+            var output = Console.OpenStandardOutput();
+            // stdout carries protocol frames only; diagnostics go to stderr
+            Console.SetOut(Console.Error);
+
+            var settings = new JsonSerializerSettings
+            {
+                NullValueHandling = NullValueHandling.Ignore
+            };
+
+            string header;
+            while ((header = ReadHeaderLine(input)) != null)
+            {
+                var body = new byte[JObject.Parse(header)["len"].Value<int>()];
+                input.ReadExactly(body);
+                var request = JObject.Parse(Encoding.UTF8.GetString(body));
+                var id = request["id"];
+
+                JObject responseHeader;
+                byte[] responseBody;
+                try
+                {
+                    var chunker = new CSharpCodeChunker(projectRoot);
+                    var result = await chunker.ProcessSingleFileAsync(Path.GetFullPath(request["path"].Value<string>()));
+                    responseBody = Encoding.UTF8.GetBytes(JsonConvert.SerializeObject(result, Formatting.None, settings));
+                    responseHeader = new JObject { ["id"] = id, ["len"] = responseBody.Length };
+                }
+                catch (Exception ex)
+                {
+                    responseBody = Array.Empty<byte>();
+                    responseHeader = new JObject { ["id"] = id, ["len"] = 0, ["error"] = ex.Message };
+                }
+
+                var headerBytes = Encoding.UTF8.GetBytes(responseHeader.ToString(Formatting.None) + "\n");
+                await output.WriteAsync(headerBytes);
+                await output.WriteAsync(responseBody);
+                await output.FlushAsync();
+            }
+
+            return 0;
+        }
+
+        // Reads one '\n'-terminated UTF-8 line, or returns null at end of stream.
+        static string ReadHeaderLine(Stream input)
+        {
+            var bytes = new MemoryStream();
+            int b;
+            while ((b = input.ReadByte()) != -1)
+            {
+                if (b == '\n')
+                {
+                    return Encoding.UTF8.GetString(bytes.ToArray());
+                }
+                bytes.WriteByte((byte)b);
+            }
+            return bytes.Length > 0 ? Encoding.UTF8.GetString(bytes.ToArray()) : null;
+        }
+
+        /// <summary>
+        /// Write output as NDJSON records: a header line carrying everything but the
+        /// nodes and relationships, then one line per node and per relationship, so
+        /// the reader can consume them as they arrive.
+        /// </summary>
+        static async Task WriteRecords(Stream stream, ChunkerOutput output, JsonSerializerSettings settings)
+        {
+            using (var writer = new StreamWriter(stream, new UTF8Encoding(false), 65536, leaveOpen: true))
+            {
+                var header = new
+                {
+                    type = "header",
+                    language = output.Language,
+                    version = output.Version,
+                    processed_files = output.ProcessedFiles,
+                    metadata = output.Metadata
+                };
+                await writer.WriteLineAsync(JsonConvert.SerializeObject(header, Formatting.None, settings));
+                foreach (var node in output.Nodes)
+                {
+                    await writer.WriteLineAsync(JsonConvert.SerializeObject(new { type = "node", data = node }, Formatting.None, settings));
+                }
+                foreach (var relationship in output.Relationships)
+                {
+                    await writer.WriteLineAsync(JsonConvert.SerializeObject(new { type = "rel", data = relationship }, Formatting.None, settings));
+                }
+            }
+        }
+
+        // Processes every file listed in the manifest (one path per line), writing one
+        // ChunkerOutput per input line as NDJSON. Each file gets a fresh chunker so its
+        // output matches a single-file run.
+        static async Task<int> RunManifest(Options options, string projectRoot, Stream stdout)
+        {
+            var filePaths = await File.ReadAllLinesAsync(options.Manifest);
+            var settings = new JsonSerializerSettings
+            {
+                NullValueHandling = NullValueHandling.Ignore
+            };
+
+            var processed = 0;
+            using (var writer = options.Output == "-" ? new StreamWriter(stdout) : new StreamWriter(options.Output))
+            {
+                foreach (var line in filePaths)
+                {
+                    var filePath = line.Trim();
+                    if (filePath.Length == 0)
+                    {
+                        continue;
+                    }
+
+                    var chunker = new CSharpCodeChunker(projectRoot);
+                    var output = await chunker.ProcessSingleFileAsync(Path.GetFullPath(filePath));
+                    await writer.WriteLineAsync(JsonConvert.SerializeObject(output, Formatting.None, settings));
+                    processed++;
+                }
+            }
+
+            Console.WriteLine($"C# chunker processed {processed} manifest entries. Output written to: {options.Output}");
+            return 0;
+        }
     }
 } 
\ No newline at end of file
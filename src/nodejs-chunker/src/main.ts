@@ -754,8 +754,6 @@ class NodeJSChunker {
 
     public async processFile(filePath: string): Promise<void> {
         try {
-            console.log(`Processing file: ${filePath}`);
-            
             const content = fs.readFileSync(filePath, 'utf8');
             const ext = path.extname(filePath).toLowerCase();
             
@@ -773,25 +771,15 @@ class NodeJSChunker {
     }
 
     public async processDirectory(dirPath: string): Promise<void> {
-        const patterns = [
-            '**/*.js',
-            '**/*.jsx', 
-            '**/*.ts',
-            '**/*.tsx',
-            '**/*.mjs',
-            '**/*.cjs'
-        ];
-
-        for (const pattern of patterns) {
-            const files = await glob(pattern, { 
-                cwd: dirPath,
-                absolute: true,
-                ignore: ['**/node_modules/**', '**/dist/**', '**/build/**', '**/*.d.ts']
-            });
+        // One brace pattern walks the tree once instead of once per extension
+        const files = await glob('**/*.{js,jsx,ts,tsx,mjs,cjs}', {
+            cwd: dirPath,
+            absolute: true,
+            ignore: ['**/node_modules/**', '**/dist/**', '**/build/**', '**/*.d.ts']
+        });
 
-            for (const file of files) {
-                await this.processFile(file);
-            }
+        for (const file of files) {
+            await this.processFile(file);
         }
     }
 
@@ -811,6 +799,118 @@ class NodeJSChunker {
     }
 }
 
+/**
+ * Write chunker output to a file, or to stdout when the path is "-".
+ */
+function writeOutput(outputPath: string, data: string): void {
+    if (outputPath === '-') {
+        process.stdout.write(data);
+    } else {
+        fs.writeFileSync(outputPath, data);
+    }
+}
+
+/**
+ * Serialize output as NDJSON records: a header line carrying everything but
+ * the nodes and relationships, then one line per node and per relationship,
+ * so the reader can consume them as they arrive.
+ */
+function toRecords(output: ChunkerOutput): string {
+    const { nodes, relationships, ...header } = output;
+    const lines = [JSON.stringify({ type: 'header', ...header })];
+    for (const node of nodes) {
+        lines.push(JSON.stringify({ type: 'node', data: node }));
+    }
+    for (const relationship of relationships) {
+        lines.push(JSON.stringify({ type: 'rel', data: relationship }));
+    }
+    return lines.map(line => line + '\n').join('');
+}
+
+/**
+ * Process every file listed in a manifest (one path per line), writing one
+ * ChunkerOutput per input line to the output as NDJSON. Each file gets a
+ * fresh chunker so its output matches a single-file run.
+ */
+async function processManifest(manifestPath: string, outputPath: string, projectRoot: string): Promise<void> {
+    const filePaths = fs.readFileSync(manifestPath, 'utf8')
+        .split(/\r?\n/)
+        .map(line => line.trim())
+        .filter(line => line.length > 0);
+
+    // Write each result as soon as it is ready instead of collecting them all
+    const fd = outputPath === '-' ? null : fs.openSync(outputPath, 'w');
+    try {
+        for (const filePath of filePaths) {
+            const chunker = new NodeJSChunker(projectRoot);
+            await chunker.processFile(path.resolve(filePath));
+            const line = JSON.stringify(chunker.getOutput()) + '\n';
+            if (fd === null) {
+                process.stdout.write(line);
+            } else {
+                fs.writeSync(fd, line);
+            }
+        }
+    } finally {
+        if (fd !== null) {
+            fs.closeSync(fd);
+        }
+    }
+}
+
+/**
+ * Serve chunking requests over stdin/stdout until stdin is closed.
+ *
+ * Every message is a JSON header line carrying the body length ("len"),
+ * followed by that many bytes of body. Requests have a JSON body with the
+ * request "id" and the file "path"; each response header echoes the id and
+ * its body is the file's ChunkerOutput JSON, or empty with an "error" in the
+ * header if the file could not be processed.
+ */
+async function serve(projectRoot: string): Promise<void> {
+    // stdout carries protocol frames only
+    console.log = console.error;
+
+    let buffer = Buffer.alloc(0);
+    let pending: Promise<void> = Promise.resolve();
+
+    const handleRequest = async (request: { id: number; path: string }): Promise<void> => {
+        let header: Record<string, unknown>;
+        let body = Buffer.alloc(0);
+        try {
+            const chunker = new NodeJSChunker(projectRoot);
+            await chunker.processFile(path.resolve(request.path));
+            body = Buffer.from(JSON.stringify(chunker.getOutput()), 'utf8');
+            header = { id: request.id, len: body.length };
+        } catch (error) {
+            header = { id: request.id, len: 0, error: String(error) };
+        }
+        process.stdout.write(JSON.stringify(header) + '\n');
+        process.stdout.write(body);
+    };
+
+    process.stdin.on('data', (chunk: Buffer) => {
+        buffer = Buffer.concat([buffer, chunk]);
+        for (;;) {
+            const newline = buffer.indexOf(0x0a);
+            if (newline < 0) {
+                break;
+            }
+            const { len } = JSON.parse(buffer.subarray(0, newline).toString('utf8'));
+            if (buffer.length < newline + 1 + len) {
+                break;
+            }
+            const request = JSON.parse(buffer.subarray(newline + 1, newline + 1 + len).toString('utf8'));
+            buffer = buffer.subarray(newline + 1 + len);
+            // Requests are answered one at a time, in arrival order
+            pending = pending.then(() => handleRequest(request));
+        }
+    });
+
+    await new Promise<void>(resolve => process.stdin.on('end', () => resolve()));
+    await pending;
+}
+
 async function main() {
     const program = new Command();
     
@@ -820,12 +920,30 @@ async function main() {
         .version('1.0.0');
 
     program
-        .argument('<input>', 'Input file or directory to process')
-        .option('-o, --output <file>', 'Output JSON file', 'nodejs_chunker_output.json')
+        .argument('[input]', 'Input file or directory to process')
+        .option('-o, --output <file>', 'Output JSON file, or - for stdout', 'nodejs_chunker_output.json')
         .option('--project-root <dir>', 'Project root directory', '.')
+        .option('--manifest <file>', 'File listing input paths one per line; output is NDJSON with one result per path')
+        .option('--serve', 'Run as a persistent worker serving framed requests on stdin/stdout')
+        .option('--ndjson', 'Write output as NDJSON records (a header line, then one line per node and relationship)')
         .action(async (input, options) => {
-            const inputPath = path.resolve(input);
             const projectRoot = path.resolve(options.projectRoot);
+
+            if (options.serve) {
+                await serve(projectRoot);
+                return;
+            }
+
+            if (options.manifest) {
+                await processManifest(options.manifest, options.output, projectRoot);
+                return;
+            }
+
+            if (!input) {
+                console.error('An input path is required unless --manifest or --serve is given');
+                process.exit(1);
+            }
+            const inputPath = path.resolve(input);
             
             if (!fs.existsSync(inputPath)) {
                 console.error(`Input path does not exist: ${inputPath}`);
@@ -846,9 +964,9 @@ async function main() {
 
             const output = chunker.getOutput();
             
-            fs.writeFileSync(options.output, JSON.stringify(output, null, 2));
+            writeOutput(options.output, options.ndjson ? toRecords(output) : JSON.stringify(output, null, 2));
             
-            console.log(`NodeJS chunker completed. Output written to: ${options.output}`);
+            console.error(`NodeJS chunker completed. Output written to: ${options.output}`);
         });
 
     await program.parseAsync();
@@ -10,8 +10,10 @@ import sys
 import json
 import hashlib
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, Tuple
 import logging
 
 import libcst as cst
@@ -24,6 +26,7 @@ sys.path.append(str(Path(__file__).parent.parent / "agentic_code_indexer"))
 from common_data_format import (
     ChunkerOutput, FileNode, ClassNode, FunctionNode, MethodNode, 
     VariableNode, ParameterNode, ImportNode, Relationship,
+    HeaderRecord, NodeRecord, RelationshipRecord,
     NodeType, RelationshipType, SourceLocation
 )
 
@@ -355,7 +358,7 @@ class PythonASTVisitor(cst.CSTVisitor):
 def process_file(chunker: PythonChunker, file_path: Path) -> None:
     """Process a single Python file."""
     try:
-        logger.info(f"Processing file: {file_path}")
+        logger.debug(f"Processing file: {file_path}")
         
         with open(file_path, 'r', encoding='utf-8') as f:
             source_code = f.read()
@@ -379,13 +382,170 @@ def process_file(chunker: PythonChunker, file_path: Path) -> None:
         logger.error(f"Error processing file {file_path}: {e}")
 
 
+def chunk_file(project_root: str, file_path: Path) -> Tuple[List[Any], List[Relationship], List[str], int]:
+    """
+    Process a single file with a fresh chunker, for use in a worker process.
+    Returns the file's nodes, relationships, processed files and node count.
+    """
+    chunker = PythonChunker(project_root)
+    process_file(chunker, file_path)
+    return chunker.nodes, chunker.relationships, chunker.processed_files, chunker.node_counter
+
+
+def merge_file_result(
+    chunker: PythonChunker,
+    nodes: List[Any],
+    relationships: List[Relationship],
+    processed_files: List[str],
+    node_count: int
+) -> None:
+    """
+    Merge one worker's results into the chunker. Node IDs are renumbered past
+    the chunker's counter so they come out the same as a sequential run.
+    """
+    offset = chunker.node_counter
+    if offset:
+        id_map = {}
+        for node in nodes:
+            prefix, _, number = node.id.rpartition('_')
+            new_id = f"{prefix}_{int(number) + offset}"
+            id_map[node.id] = new_id
+            node.id = new_id
+        for rel in relationships:
+            rel.source_id = id_map.get(rel.source_id, rel.source_id)
+            rel.target_id = id_map.get(rel.target_id, rel.target_id)
+    
+    chunker.nodes.extend(nodes)
+    chunker.relationships.extend(relationships)
+    chunker.processed_files.extend(processed_files)
+    chunker.node_counter += node_count
+
+
+def build_output(chunker: PythonChunker) -> ChunkerOutput:
+    """Package everything the chunker has collected as a ChunkerOutput."""
+    return ChunkerOutput(
+        language="python",
+        processed_files=chunker.processed_files,
+        nodes=chunker.nodes,
+        relationships=chunker.relationships,
+        metadata={
+            "total_files": len(chunker.processed_files),
+            "total_nodes": len(chunker.nodes),
+            "total_relationships": len(chunker.relationships)
+        }
+    )
+
+
+def write_records(output: ChunkerOutput, out) -> None:
+    """
+    Write output as NDJSON records: a header line carrying everything but the
+    nodes and relationships, then one line per node and per relationship.
+    """
+    header = HeaderRecord(
+        language=output.language,
+        version=output.version,
+        processed_files=output.processed_files,
+        metadata=output.metadata
+    )
+    out.write(header.model_dump_json())
+    out.write("\n")
+    for node in output.nodes:
+        out.write(NodeRecord(data=node).model_dump_json())
+        out.write("\n")
+    for relationship in output.relationships:
+        out.write(RelationshipRecord(data=relationship).model_dump_json())
+        out.write("\n")
+
+
+def open_output(output_path: str):
+    """Open the output destination for writing; "-" means stdout."""
+    if output_path == "-":
+        return open(sys.stdout.fileno(), 'w', encoding='utf-8', closefd=False)
+    return open(output_path, 'w', encoding='utf-8')
+
+
+def process_manifest(project_root: Path, manifest_path: Path, output_path: str) -> int:
+    """
+    Process every file listed in a manifest (one path per line), writing one
+    JSON-encoded ChunkerOutput per input line to the output as NDJSON.
+    Each file gets a fresh chunker so its output matches a single-file run.
+    """
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        file_paths = [line.strip() for line in f if line.strip()]
+    
+    with open_output(output_path) as out:
+        for file_path in file_paths:
+            chunker = PythonChunker(project_root)
+            process_file(chunker, Path(file_path))
+            out.write(build_output(chunker).model_dump_json())
+            out.write("\n")
+    
+    logger.info(f"Python chunker processed {len(file_paths)} manifest entries. Output written to: {output_path}")
+    return 0
+
+
+def serve(project_root: Path) -> int:
+    """
+    Serve chunking requests over stdin/stdout until stdin is closed.
+    
+    Every message is a JSON header line carrying the body length ("len"),
+    followed by that many bytes of body. Requests have a JSON body with the
+    request "id" and the file "path"; each response header echoes the id and
+    its body is the file's ChunkerOutput JSON, or empty with an "error" in
+    the header if the file could not be processed. Logging stays on stderr.
+    """
+    stdin = sys.stdin.buffer
+    stdout = sys.stdout.buffer
+    
+    while True:
+        header = stdin.readline()
+        if not header:
+            break
+        request = json.loads(stdin.read(json.loads(header)["len"]))
+        
+        try:
+            chunker = PythonChunker(project_root)
+            process_file(chunker, Path(request["path"]))
+            body = build_output(chunker).model_dump_json().encode('utf-8')
+            response = {"id": request["id"], "len": len(body)}
+        except Exception as e:
+            body = b""
+            response = {"id": request["id"], "len": 0, "error": str(e)}
+        
+        stdout.write(json.dumps(response).encode('utf-8') + b"\n" + body)
+        stdout.flush()
+    
+    return 0
+
+
+def has_python_shebang(file_path: Path) -> bool:
+    """Check whether a file starts with a Python interpreter line (#!...python)."""
+    try:
+        with open(file_path, 'rb') as f:
+            first_line = f.readline(64)
+    except OSError:
+        return False
+    return first_line.startswith(b'#!') and b'python' in first_line
+
+
+# Directories that never hold project sources; the walk doesn't descend into them
+IGNORED_DIRECTORIES = frozenset({
+    '__pycache__', '.git', '.svn', '.hg', 'node_modules', '.venv', 'venv',
+    '.tox', '.mypy_cache', '.pytest_cache', 'build', 'dist'
+})
+
+
 def find_python_files(directory: Path) -> List[Path]:
     """Find all Python files in a directory recursively."""
     python_files = []
     
-    for file_path in directory.rglob("*.py"):
-        if file_path.is_file():
-            python_files.append(file_path)
+    # os.walk prunes ignored directories up front, where rglob would list
+    # every file under e.g. a virtualenv before filtering
+    for dir_path, dir_names, file_names in os.walk(directory):
+        dir_names[:] = [name for name in dir_names if name not in IGNORED_DIRECTORIES]
+        for name in file_names:
+            if name.endswith(".py"):
+                python_files.append(Path(dir_path) / name)
     
     return python_files
 
@@ -393,12 +553,27 @@ def find_python_files(directory: Path) -> List[Path]:
 def main():
     """Main entry point for the Python chunker."""
     parser = argparse.ArgumentParser(description="Python Code Chunker for Agentic Code Indexer")
-    parser.add_argument("input_path", help="Path to Python file or directory to process")
-    parser.add_argument("-o", "--output", help="Output JSON file path", default="python_chunker_output.json")
+    parser.add_argument("input_path", nargs="?", help="Path to Python file or directory to process")
+    parser.add_argument("-o", "--output", help="Output JSON file path, or - for stdout", default="python_chunker_output.json")
     parser.add_argument("--project-root", help="Project root directory", default=".")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes for directory input (1 disables multiprocessing)")
+    parser.add_argument("--manifest",
+                        help="File listing input paths one per line; output is NDJSON with one result per path")
+    parser.add_argument("--serve", action="store_true",
+                        help="Run as a persistent worker serving framed requests on stdin/stdout")
+    parser.add_argument("--ndjson", action="store_true",
+                        help="Write output as NDJSON records (a header line, then one line per node and relationship)")
     
     args = parser.parse_args()
     
+    if args.serve:
+        return serve(Path(args.project_root))
+    if args.manifest:
+        return process_manifest(Path(args.project_root), Path(args.manifest), args.output)
+    if not args.input_path:
+        parser.error("input_path is required unless --manifest or --serve is given")
+    
     input_path = Path(args.input_path)
     project_root = Path(args.project_root)
     
@@ -411,7 +586,7 @@ def main():
     
     # Process files
     if input_path.is_file():
-        if input_path.suffix == '.py':
+        if input_path.suffix == '.py' or (not input_path.suffix and has_python_shebang(input_path)):
             process_file(chunker, input_path)
         else:
             logger.error(f"Input file is not a Python file: {input_path}")
@@ -420,28 +595,31 @@ def main():
         python_files = find_python_files(input_path)
         logger.info(f"Found {len(python_files)} Python files")
         
-        for file_path in python_files:
-            process_file(chunker, file_path)
+        if args.workers > 1 and len(python_files) > 1:
+            # Parsing is CPU bound, so spread files over processes to get
+            # past the GIL; results come back in order and are merged here.
+            with ProcessPoolExecutor(max_workers=args.workers) as executor:
+                results = executor.map(
+                    chunk_file, repeat(str(project_root)), python_files, chunksize=32
+                )
+                for result in results:
+                    merge_file_result(chunker, *result)
+        else:
+            for file_path in python_files:
+                process_file(chunker, file_path)
     else:
         logger.error(f"Input path is neither a file nor directory: {input_path}")
         return 1
     
     # Create output
-    output = ChunkerOutput(
-        language="python",
-        processed_files=chunker.processed_files,
-        nodes=chunker.nodes,
-        relationships=chunker.relationships,
-        metadata={
-            "total_files": len(chunker.processed_files),
-            "total_nodes": len(chunker.nodes),
-            "total_relationships": len(chunker.relationships)
-        }
-    )
+    output = build_output(chunker)
     
     # Write output
-    with open(args.output, 'w', encoding='utf-8') as f:
-        f.write(output.model_dump_json(indent=2))
+    with open_output(args.output) as f:
+        if args.ndjson:
+            write_records(output, f)
+        else:
+            f.write(output.model_dump_json(indent=2))
     
     logger.info(f"Python chunker completed. Output written to: {args.output}")
     logger.info(f"Processed {len(chunker.processed_files)} files, extracted {len(chunker.nodes)} nodes, {len(chunker.relationships)} relationships")